@@ -9,7 +9,19 @@ import asyncio
 import traceback
 
 from core.postgres_db import PostgresDatabase
+from core.sqlite_db import SQLiteDatabase
 from core.name_mapper import NameMapper
+from core.cache import GenerationCache
+from core.workers import WorkerPool, AsyncStorage
+from core.display_editor import DisplayEditor
+from core.console_log import ConsoleLogSink
+from core.single_flight import SingleFlight
+from core.refresh_schedule import AdaptiveRefreshScheduler
+from core.config import (
+    BACKUP_FULL_INTERVAL_DAYS, CURRENT_DISPLAY_MAX_WAIT_MINUTES, STORAGE_WORKER_THREADS,
+    REFRESH_FRESHNESS_SECONDS, REFRESH_MIN_INTERVAL_MINUTES, REFRESH_MAX_INTERVAL_MINUTES,
+    REFRESH_INITIAL_INTERVAL_MINUTES, REFRESH_BURST_INTERVAL_MINUTES
+)
 
 # Load environment variables
 load_dotenv()
@@ -19,18 +31,31 @@ intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix=".", intents=intents)
 
-# Initialize database
+# Initialize database (SQLITE_DB_PATH selects the local SQLite backend)
 try:
-    db = PostgresDatabase(name_mapper=NameMapper())
+    if os.getenv("SQLITE_DB_PATH"):
+        db = SQLiteDatabase(name_mapper=NameMapper())
+    else:
+        db = PostgresDatabase(name_mapper=NameMapper())
 except Exception as e:
-    print(f"❌ Failed to initialize PostgreSQL database: {e}")
-    print("Please ensure DATABASE_URL is set in your environment variables")
+    print(f"❌ Failed to initialize database: {e}")
+    print("Please ensure DATABASE_URL (or SQLITE_DB_PATH) is set in your environment variables")
     exit(1)
 
+# Blocking storage/formatting calls and scraping run on worker threads, never on the event loop
+storage_pool = WorkerPool("storage", max_workers=STORAGE_WORKER_THREADS)
+scrape_pool = WorkerPool("scraper", max_workers=1)
+adb = AsyncStorage(db, storage_pool)
+
 # Store message IDs for editing
 schedule_messages = {}  # Format: {channel_id: message_id}
 current_war_messages = {}  # Format: {channel_id: message_id}
 
+# Rendered display embeds, keyed by (view, date) at the current data generation
+render_cache = GenerationCache(max_size=16)
+# Edits display messages concurrently, skipping unchanged and coalescing queued edits
+display_editor = DisplayEditor()
+
 # Channel IDs
 DAILY_SCHEDULE_CHANNEL_ID = None
 CONSOLE_CHANNEL_ID = None  # Admin console for errors and monitoring
@@ -39,14 +64,32 @@ SHIFT_ALERT_CHANNEL_ID = None
 # Manual date override (None = automatic mode)
 MANUAL_SCHEDULE_DATE = None
 
+# Only one refresh runs at a time; concurrent requests share its result
+refresh_flight = SingleFlight(freshness_seconds=REFRESH_FRESHNESS_SECONDS)
+
+# Interval between automatic refreshes, adapted to how often schedules change
+refresh_scheduler = AdaptiveRefreshScheduler(
+    min_interval=timedelta(minutes=REFRESH_MIN_INTERVAL_MINUTES),
+    max_interval=timedelta(minutes=REFRESH_MAX_INTERVAL_MINUTES),
+    initial_interval=timedelta(minutes=REFRESH_INITIAL_INTERVAL_MINUTES),
+    burst_interval=timedelta(minutes=REFRESH_BURST_INTERVAL_MINUTES)
+)
+# Set when the refresh schedule changes (a refresh finished or a burst started)
+refresh_schedule_changed = asyncio.Event()
+
 # Track last refresh time for monitoring
 last_refresh_time = None
 last_refresh_success = True
 
 
+# Console channel logging is buffered and sent in batches (errors flush immediately)
+console_log = ConsoleLogSink(lambda: bot.get_channel(CONSOLE_CHANNEL_ID) if CONSOLE_CHANNEL_ID else None)
+
+
 async def log_to_console(message: str, level: str = "info"):
     """
     Log messages to console channel for admin visibility.
+    Returns immediately; the entry is sent with the next batch.
 
     Args:
         message: Message to log
@@ -55,28 +98,26 @@ async def log_to_console(message: str, level: str = "info"):
     if not CONSOLE_CHANNEL_ID:
         return
 
-    channel = bot.get_channel(CONSOLE_CHANNEL_ID)
-    if not channel:
-        return
+    console_log.log(message, level)
 
-    # Add emoji based on level
-    emoji_map = {
-        "info": "ℹ️",
-        "warning": "⚠️",
-        "error": "❌",
-        "success": "✅"
-    }
-    emoji = emoji_map.get(level, "📝")
 
-    # Format timestamp
-    pst = pytz.timezone('America/Los_Angeles')
-    now = datetime.now(pst)
-    timestamp = now.strftime("%I:%M:%S %p")
+def report_slow_query(entry: dict):
+    """Forward a slow storage call to the console channel (parameters are already redacted)"""
+    status = " (failed)" if entry['failed'] else ""
+    rows = f", {entry['rows']} rows" if entry['rows'] is not None else ""
+    message = (
+        f"Slow query: `{entry['method']}({entry['params']})` took "
+        f"{entry['duration_ms']:.0f} ms{rows}{status}"
+    )
+    print(message)
+    # Before on_ready bot.loop is a placeholder, not the running loop
+    if not bot.is_ready():
+        return
+    # Storage calls may run off the event loop thread
+    asyncio.run_coroutine_threadsafe(log_to_console(message, "warning"), bot.loop)
 
-    try:
-        await channel.send(f"{emoji} **[{timestamp}]** {message}")
-    except Exception as e:
-        print(f"Failed to log to console: {e}")
+
+db.query_metrics.on_slow = report_slow_query
 
 
 def has_lead_scribe_or_admin():
@@ -103,22 +144,29 @@ async def on_ready():
     print(f"Bot logged in as {bot.user}")
     print(f"Connected to {len(bot.guilds)} server(s)")
 
+    console_log.start()
+
     # Check database connection
     try:
-        count = db.get_record_count()
-        print(f"✅ PostgreSQL connected: {count} records in database")
+        count = await adb.get_record_count()
+        print(f"✅ Database connected: {count} records in database")
     except Exception as e:
-        print(f"❌ PostgreSQL connection error: {e}")
+        print(f"❌ Database connection error: {e}")
         await log_to_console(f"Database connection error on startup: {e}", "error")
 
     # Start background tasks
     if not auto_update_current.is_running():
         auto_update_current.start()
-        print("Started current shifts auto-update (every 10 minutes)")
+        print("Started current shifts auto-update (at shift starts/ends)")
 
     if not auto_refresh_schedule.is_running():
         auto_refresh_schedule.start()
-        print("Started schedule auto-refresh (every 2 hours)")
+        print("Started schedule auto-refresh (adaptive interval)")
+
+    # LISTEN/NOTIFY is Postgres-only; without it displays update after each refresh
+    if isinstance(db, PostgresDatabase) and not listen_for_shift_updates.is_running():
+        listen_for_shift_updates.start()
+        print("Started shift update listener (LISTEN shift_updates)")
 
     if not daily_backup.is_running():
         daily_backup.start()
@@ -129,23 +177,43 @@ async def on_ready():
         print("Started health check task (every 6 hours)")
 
     # Auto-refresh on startup if database is empty
-    if db.is_empty():
+    if await adb.is_empty():
         print("🔄 Database empty - running automatic refresh...")
         await log_to_console("Database empty on startup - running automatic refresh...", "warning")
         await perform_refresh_with_retry()
 
 
-async def perform_refresh_with_retry(max_retries: int = 3, status_message=None) -> bool:
+async def perform_refresh_with_retry(max_retries: int = 3, status_message=None,
+                                     post_alerts: bool = True) -> bool:
     """
-    Perform database refresh with retry logic and console logging.
+    Refresh the database from ShiftGen, one refresh at a time.
+
+    If a refresh is already running this waits for it and returns its result;
+    if one succeeded within the last REFRESH_FRESHNESS_SECONDS its result is
+    returned without scraping again.
 
     Args:
         max_retries: Maximum number of retry attempts
         status_message: Optional Discord message to update with progress
+        post_alerts: Post shift change alerts for this refresh. When False the
+            alert cursor is still advanced so the changes are never posted later.
 
     Returns:
         True if successful, False otherwise
     """
+    if status_message:
+        if refresh_flight.in_flight:
+            await status_message.edit(content="⏳ A refresh is already running - waiting for its result...")
+        elif refresh_flight.fresh_result_age() is not None:
+            await status_message.edit(content="✅ Data was refreshed moments ago - using that refresh.")
+
+    return await refresh_flight.run(
+        lambda: _refresh_with_retry(max_retries, status_message, post_alerts)
+    )
+
+
+async def _refresh_with_retry(max_retries: int, status_message, post_alerts: bool) -> bool:
+    """Perform database refresh with retry logic and console logging (see perform_refresh_with_retry)"""
     global last_refresh_time, last_refresh_success
 
     from core.main import fetch_all_sites_schedules
@@ -161,7 +229,7 @@ async def perform_refresh_with_retry(max_retries: int = 3, status_message=None)
             scraper = ShiftGenScraper()
 
             # Attempt login
-            if not scraper.login():
+            if not await scrape_pool.run(scraper.login):
                 error_msg = f"Login failed on attempt {attempt + 1}"
                 await log_to_console(error_msg, "error")
 
@@ -177,7 +245,7 @@ async def perform_refresh_with_retry(max_retries: int = 3, status_message=None)
             await log_to_console("Login successful - fetching schedules...", "info")
 
             # Fetch all data
-            all_data = fetch_all_sites_schedules(scraper)
+            all_data = await scrape_pool.run(fetch_all_sites_schedules, scraper)
 
             if not all_data:
                 error_msg = "No data fetched from ShiftGen"
@@ -189,25 +257,29 @@ async def perform_refresh_with_retry(max_retries: int = 3, status_message=None)
                     last_refresh_success = False
                     return False
 
-            # Detect changes before updating
-            changes = db.compare_schedules(all_data)
-
-            # Update database
-            valid_count, invalid_count, invalid_records = db.update_data(all_data)
-
-            # Automatically clean up any duplicates that might have been created
-            duplicate_count = db.get_duplicate_count()
-            if duplicate_count > 0:
-                deleted_count = db.remove_duplicate_shifts()
-                await log_to_console(f"Auto-cleanup: Removed {deleted_count} duplicate entries", "info")
+            # Update database (changes are appended to the shift change log)
+            valid_count, invalid_count, invalid_records = await adb.update_data(all_data)
 
             last_refresh_time = datetime.now(pytz.timezone('America/Los_Angeles'))
             last_refresh_success = True
 
+            # Adapt the automatic refresh interval to what this refresh changed. Without
+            # alerts (after a reset) every slot is logged as added, which says nothing
+            # about how often schedules change.
+            change_counts = await adb.get_last_change_counts()
+            change_count = sum(change_counts.values())
+            if post_alerts:
+                refresh_scheduler.record_refresh(change_counts, last_refresh_time)
+            else:
+                refresh_scheduler.mark_refreshed(last_refresh_time)
+            refresh_schedule_changed.set()
+
             # Log results
             success_msg = f"Refresh complete: {valid_count} valid records"
             if invalid_count > 0:
                 success_msg += f", {invalid_count} invalid records skipped"
+            interval_minutes = refresh_scheduler.current_interval(last_refresh_time).total_seconds() / 60
+            success_msg += f" • {change_count} changes • next auto-refresh in {interval_minutes:.0f} min"
             await log_to_console(success_msg, "success")
 
             # Log validation errors if any
@@ -218,12 +290,11 @@ async def perform_refresh_with_retry(max_retries: int = 3, status_message=None)
                         "warning"
                     )
 
+            # Shift times may have changed; let the current shifts scheduler recompute
+            shift_data_changed.set()
+
             # Post shift change alerts
-            if changes and SHIFT_ALERT_CHANNEL_ID:
-                await post_shift_alerts(changes)
-                # Mark changes as alerted to prevent duplicates
-                db.mark_changes_as_alerted(changes)
-                await log_to_console(f"Posted {len(changes)} shift change alerts", "info")
+            await post_pending_shift_alerts(post=post_alerts)
 
             return True
 
@@ -252,8 +323,9 @@ async def today(ctx):
     now = datetime.now(pst)
     today_date = now.strftime("%Y-%m-%d")
 
-    # Check if database is empty
-    if db.is_empty():
+    # Check if database is empty (stats are maintained at refresh, no table scan)
+    stats = await adb.get_shift_stats()
+    if stats['record_count'] == 0:
         embed = discord.Embed(
             title="⚠️ Database Not Loaded",
             description=(
@@ -271,7 +343,7 @@ async def today(ctx):
         return
 
     # Check date range
-    min_date, max_date = db.get_date_range()
+    min_date, max_date = stats['min_date'], stats['max_date']
     if min_date and max_date:
         today_obj = datetime.strptime(today_date, "%Y-%m-%d")
         min_obj = datetime.strptime(min_date, "%Y-%m-%d")
@@ -285,7 +357,7 @@ async def today(ctx):
             )
             return
 
-    embed = db.format_daily_schedule_combined(today_date)
+    embed = await adb.format_daily_schedule_combined(today_date)
     await ctx.send(embed=embed)
 
 
@@ -297,7 +369,7 @@ async def tomorrow(ctx):
     pst = pytz.timezone('America/Los_Angeles')
     now = datetime.now(pst)
     tomorrow_date = (now + timedelta(days=1)).strftime("%Y-%m-%d")
-    embed = db.format_daily_schedule_combined(tomorrow_date)
+    embed = await adb.format_daily_schedule_combined(tomorrow_date)
     await ctx.send(embed=embed)
 
 
@@ -305,7 +377,7 @@ async def tomorrow(ctx):
 @commands.cooldown(1, 10, commands.BucketType.user)
 async def current(ctx):
     """Show who's currently working (one-time, non-updating)"""
-    embed = db.format_current_schedule()
+    embed = await adb.format_current_schedule()
     await ctx.send(embed=embed)
 
 
@@ -326,7 +398,7 @@ async def schedule(ctx, date_str: str = None):
     try:
         date_obj = datetime.strptime(date_str, "%m-%d-%Y")
         db_date = date_obj.strftime("%Y-%m-%d")
-        embed = db.format_daily_schedule_combined(db_date)
+        embed = await adb.format_daily_schedule_combined(db_date)
         await ctx.send(embed=embed)
     except ValueError:
         msg = await ctx.send("Invalid date format. Please use MM-DD-YYYY.\nExample: `.schedule 10-15-2025`")
@@ -334,6 +406,81 @@ async def schedule(ctx, date_str: str = None):
         await msg.delete()
 
 
+# Reactions used to flip between pages of a multi-day schedule
+PAGE_PREVIOUS = "◀️"
+PAGE_NEXT = "▶️"
+
+
+@bot.command(name="week")
+@commands.cooldown(1, 10, commands.BucketType.user)
+async def week(ctx, date_str: str = None, days: int = 7):
+    """Show a multi-day schedule, one page per day (default: the 7 days from today)"""
+    # `.week 3` means 3 days from today, not a date
+    if date_str and date_str.isdigit():
+        days = int(date_str)
+        date_str = None
+
+    if days < 1 or days > 14:
+        await ctx.send("Please choose between 1 and 14 days.\nExample: `.week 10-15-2025 7`")
+        return
+
+    try:
+        if date_str:
+            start_obj = datetime.strptime(date_str, "%m-%d-%Y")
+        else:
+            start_obj = datetime.now(pytz.timezone('America/Los_Angeles')).replace(tzinfo=None)
+    except ValueError:
+        msg = await ctx.send("Invalid date format. Please use MM-DD-YYYY.\nExample: `.week 10-15-2025`")
+        await asyncio.sleep(10)
+        await msg.delete()
+        return
+
+    start_date = start_obj.strftime("%Y-%m-%d")
+    end_date = (start_obj + timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+    # Pages are rendered once per data generation from a single range read
+    render_cache.set_generation((await adb.get_cache_stats())['generation'])
+    pages = render_cache.get(("range", start_date, end_date))
+    if pages is None:
+        pages = await adb.format_schedule_range(start_date, end_date)
+        render_cache.put(("range", start_date, end_date), pages)
+
+    page = 0
+    msg = await ctx.send(embed=pages[page])
+    if len(pages) == 1:
+        return
+
+    await msg.add_reaction(PAGE_PREVIOUS)
+    await msg.add_reaction(PAGE_NEXT)
+
+    def check(reaction, user):
+        return (
+            user == ctx.author
+            and str(reaction.emoji) in [PAGE_PREVIOUS, PAGE_NEXT]
+            and reaction.message.id == msg.id
+        )
+
+    while True:
+        try:
+            reaction, user = await bot.wait_for('reaction_add', timeout=120.0, check=check)
+        except asyncio.TimeoutError:
+            try:
+                await msg.clear_reactions()
+            except discord.HTTPException:
+                pass
+            return
+
+        step = 1 if str(reaction.emoji) == PAGE_NEXT else -1
+        page = (page + step) % len(pages)
+        await msg.edit(embed=pages[page])
+
+        # Remove the reaction so the same arrow can be pressed again
+        try:
+            await msg.remove_reaction(reaction.emoji, user)
+        except discord.HTTPException:
+            pass
+
+
 @bot.command(name="setconsole")
 @has_lead_scribe_or_admin()
 async def setconsole(ctx):
@@ -412,7 +559,7 @@ async def refresh(ctx):
     success = await perform_refresh_with_retry(max_retries=3, status_message=msg)
 
     if success:
-        count = db.get_record_count()
+        count = await adb.get_record_count()
         await msg.edit(content=f"✅ Database refreshed successfully! Total records: {count}")
     else:
         await msg.edit(content="❌ Failed to refresh database after 3 attempts. Check console channel for details.")
@@ -421,6 +568,35 @@ async def refresh(ctx):
     await msg.delete()
 
 
+@bot.command(name="refreshburst")
+@has_lead_scribe_or_admin()
+async def refreshburst(ctx, minutes: int = 60):
+    """Refresh every few minutes for a while (e.g. while schedules are being published); 0 stops a burst"""
+    try:
+        await ctx.message.delete()
+    except:
+        pass
+
+    now = datetime.now(pytz.timezone('America/Los_Angeles'))
+    if minutes <= 0:
+        refresh_scheduler.stop_burst()
+        content = "⏹️ Refresh burst stopped - back to the adaptive interval."
+        await log_to_console(f"Refresh burst stopped by {ctx.author.name}", "info")
+    else:
+        minutes = min(minutes, 24 * 60)
+        refresh_scheduler.start_burst(timedelta(minutes=minutes), now)
+        content = (
+            f"⚡ Refreshing every {REFRESH_BURST_INTERVAL_MINUTES} minutes for the next {minutes} minutes "
+            f"(until {(now + timedelta(minutes=minutes)).strftime('%I:%M %p')})."
+        )
+        await log_to_console(f"Refresh burst for {minutes} min started by {ctx.author.name}", "info")
+    refresh_schedule_changed.set()
+
+    msg = await ctx.send(content)
+    await asyncio.sleep(10)
+    await msg.delete()
+
+
 @bot.command(name="postschedule")
 @has_lead_scribe_or_admin()
 async def postschedule(ctx):
@@ -430,7 +606,7 @@ async def postschedule(ctx):
     except:
         pass
 
-    if db.is_empty():
+    if await adb.is_empty():
         error_msg = await ctx.send(
             "❌ **Database is empty!** Please run `.refresh` first to load schedule data."
         )
@@ -445,7 +621,7 @@ async def postschedule(ctx):
         relevant_date = get_relevant_schedule_date()
 
         # Verify there's data for this date
-        shifts_for_date = db.get_shifts_for_date(relevant_date)
+        shifts_for_date = await adb.get_shifts_for_date(relevant_date)
         if not shifts_for_date:
             date_obj = datetime.strptime(relevant_date, "%Y-%m-%d")
             error_msg = await ctx.send(
@@ -456,12 +632,13 @@ async def postschedule(ctx):
             await error_msg.delete()
             return
 
-        embed = db.format_daily_schedule_combined(relevant_date)
+        embed = await render_display("schedule", relevant_date)
 
         msg = await ctx.send(embed=embed)
         schedule_messages[ctx.channel.id] = msg.id
+        display_editor.remember(msg.id, embed)
 
-        confirmation = await ctx.send("✅ Schedule posted! Updates occur every 2 hours.")
+        confirmation = await ctx.send("✅ Schedule posted! It updates whenever the schedule is refreshed.")
         await log_to_console(f"Daily schedule posted in #{ctx.channel.name}", "success")
         await asyncio.sleep(5)
         await confirmation.delete()
@@ -485,7 +662,7 @@ async def postcurrent(ctx):
     except:
         pass
 
-    if db.is_empty():
+    if await adb.is_empty():
         error_msg = await ctx.send(
             "❌ **Database is empty!** Please run `.refresh` first to load schedule data."
         )
@@ -494,11 +671,12 @@ async def postcurrent(ctx):
         return
 
     try:
-        embed = db.format_current_schedule()
+        embed = await render_display("current")
         msg = await ctx.send(embed=embed)
         current_war_messages[ctx.channel.id] = msg.id
+        display_editor.remember(msg.id, embed)
 
-        confirmation = await ctx.send("✅ Current shifts posted! Updates every 10 minutes.")
+        confirmation = await ctx.send("✅ Current shifts posted! Updates whenever a shift starts or ends.")
         await log_to_console(f"Current shifts display posted in #{ctx.channel.name}", "success")
         await asyncio.sleep(5)
         await confirmation.delete()
@@ -542,15 +720,17 @@ async def setup(ctx):
         # Step 3: Post schedule
         await status_msg.edit(content="🔄 Posting schedules...")
         relevant_date = get_relevant_schedule_date()
-        embed = db.format_daily_schedule_combined(relevant_date)
+        embed = await render_display("schedule", relevant_date)
 
         schedule_msg = await ctx.send(embed=embed)
         schedule_messages[ctx.channel.id] = schedule_msg.id
+        display_editor.remember(schedule_msg.id, embed)
 
         # Step 4: Post current shifts
-        current_embed = db.format_current_schedule()
+        current_embed = await render_display("current")
         current_msg = await ctx.send(embed=current_embed)
         current_war_messages[ctx.channel.id] = current_msg.id
+        display_editor.remember(current_msg.id, current_embed)
 
         await status_msg.edit(content="✅ Setup complete! Both schedules posted and will auto-update.")
         await log_to_console("Setup completed successfully", "success")
@@ -614,9 +794,8 @@ async def setscheduledate(ctx, date_str: str = None):
                 if channel:
                     try:
                         message_id = schedule_messages[DAILY_SCHEDULE_CHANNEL_ID]
-                        message = await channel.fetch_message(message_id)
-                        embed = db.format_daily_schedule_combined(MANUAL_SCHEDULE_DATE)
-                        await message.edit(embed=embed)
+                        embed = await render_display("schedule", MANUAL_SCHEDULE_DATE)
+                        await display_editor.edit(channel, message_id, embed)
                     except:
                         pass
         except ValueError:
@@ -645,27 +824,37 @@ async def updatenow(ctx):
         if channel:
             try:
                 message_id = schedule_messages[DAILY_SCHEDULE_CHANNEL_ID]
-                message = await channel.fetch_message(message_id)
                 relevant_date = get_relevant_schedule_date()
-                embed = db.format_daily_schedule_combined(relevant_date)
+                embed = await render_display("schedule", relevant_date)
 
-                await message.edit(embed=embed)
+                edited = await display_editor.edit(channel, message_id, embed)
                 date_obj = datetime.strptime(relevant_date, "%Y-%m-%d")
-                updated.append(f"✅ Schedule updated (showing {date_obj.strftime('%A %m/%d')})")
+                if edited:
+                    updated.append(f"✅ Schedule updated (showing {date_obj.strftime('%A %m/%d')})")
+                else:
+                    updated.append(f"✅ Schedule already up to date (showing {date_obj.strftime('%A %m/%d')})")
             except Exception as e:
                 updated.append(f"❌ Schedule update failed: {str(e)}")
 
-    # Update current shifts
-    for channel_id, message_id in list(current_war_messages.items()):
-        channel = bot.get_channel(channel_id)
-        if channel:
-            try:
-                message = await channel.fetch_message(message_id)
-                embed = db.format_current_schedule()
-                await message.edit(embed=embed)
-                updated.append("✅ Current shifts updated")
-            except Exception as e:
-                updated.append(f"❌ Current shifts update failed: {str(e)}")
+    # Update current shifts (all displays concurrently)
+    async def update_current(channel, message_id):
+        try:
+            embed = await render_display("current")
+            if await display_editor.edit(channel, message_id, embed):
+                return "✅ Current shifts updated"
+            return "✅ Current shifts already up to date"
+        except Exception as e:
+            return f"❌ Current shifts update failed: {str(e)}"
+
+    current_targets = [
+        (bot.get_channel(channel_id), message_id)
+        for channel_id, message_id in list(current_war_messages.items())
+    ]
+    updated += await asyncio.gather(*(
+        update_current(channel, message_id)
+        for channel, message_id in current_targets
+        if channel
+    ))
 
     if not updated:
         response = await ctx.send("⚠️ No active auto-updating messages found.")
@@ -677,6 +866,28 @@ async def updatenow(ctx):
     await response.delete()
 
 
+async def post_pending_shift_alerts(post: bool = True):
+    """
+    Post shift changes logged since the last alert, then advance the alert cursor.
+
+    Args:
+        post: When False, skip posting and only move the cursor past pending changes
+    """
+    try:
+        changes, last_seq = await adb.get_unalerted_changes()
+
+        if changes and post and SHIFT_ALERT_CHANNEL_ID:
+            await post_shift_alerts(changes)
+            await log_to_console(f"Posted {len(changes)} shift change alerts", "info")
+        elif changes and not post:
+            await log_to_console(f"Skipped {len(changes)} shift change alerts", "info")
+
+        await adb.advance_alert_cursor(last_seq)
+    except Exception as e:
+        # The cursor was not advanced, so these alerts are retried after the next refresh
+        await log_to_console(f"Failed to post shift change alerts: {e}", "warning")
+
+
 async def post_shift_alerts(changes):
     """Post shift change alerts to the designated channel"""
     if not SHIFT_ALERT_CHANNEL_ID:
@@ -751,28 +962,42 @@ async def post_shift_alerts(changes):
             await channel.send(embed=embed)
 
 
-@tasks.loop(hours=2)
-async def auto_refresh_schedule():
-    """Auto-refresh schedule every 2 hours"""
-    await log_to_console("Starting scheduled refresh...", "info")
-    success = await perform_refresh_with_retry(max_retries=3)
+async def render_display(view: str, target_date: str = None) -> discord.Embed:
+    """
+    Render a display embed, reusing an earlier render of the same view, date and data generation.
+
+    Args:
+        view: "schedule" (combined daily schedule) or "current" (who's working now)
+        target_date: Date in YYYY-MM-DD format for the schedule view
+    """
+    render_cache.set_generation((await adb.get_cache_stats())['generation'])
+
+    if view == "current":
+        # Who is on shift depends on the time, so current renders are shared within a minute
+        target_date = datetime.now(pytz.timezone('America/Los_Angeles')).strftime("%Y-%m-%d %H:%M")
+
+    key = (view, target_date)
+    embed = render_cache.get(key)
+    if embed is None:
+        if view == "current":
+            embed = await adb.format_current_schedule()
+        else:
+            embed = await adb.format_daily_schedule_combined(target_date)
+        render_cache.put(key, embed)
+    return embed
 
-    if not success:
-        await log_to_console("Scheduled refresh failed after all retries", "error")
-        return
 
-    # Update schedule message with smart date selection
+async def update_schedule_display():
+    """Edit the posted daily schedule message with smart date selection"""
     if DAILY_SCHEDULE_CHANNEL_ID and DAILY_SCHEDULE_CHANNEL_ID in schedule_messages:
         channel = bot.get_channel(DAILY_SCHEDULE_CHANNEL_ID)
         if channel:
             try:
                 message_id = schedule_messages[DAILY_SCHEDULE_CHANNEL_ID]
-                message = await channel.fetch_message(message_id)
-
                 relevant_date = get_relevant_schedule_date()
-                embed = db.format_daily_schedule_combined(relevant_date)
+                embed = await render_display("schedule", relevant_date)
 
-                await message.edit(embed=embed)
+                await display_editor.edit(channel, message_id, embed)
             except discord.NotFound:
                 await log_to_console("Schedule message not found (may have been deleted)", "warning")
                 del schedule_messages[DAILY_SCHEDULE_CHANNEL_ID]
@@ -780,21 +1005,204 @@ async def auto_refresh_schedule():
                 await log_to_console(f"Error updating schedule message: {e}", "error")
 
 
-@tasks.loop(minutes=10)
-async def auto_update_current():
-    """Auto-update current shifts display every 10 minutes"""
-    for channel_id, message_id in list(current_war_messages.items()):
+async def update_current_displays():
+    """Edit every posted current shifts message (concurrently; all share one render)"""
+    if not current_war_messages:
+        return
+
+    try:
+        embed = await render_display("current")
+    except Exception as e:
+        await log_to_console(f"Error rendering current shifts: {e}", "error")
+        return
+
+    async def update(channel_id, message_id):
         channel = bot.get_channel(channel_id)
-        if channel:
-            try:
-                message = await channel.fetch_message(message_id)
-                embed = db.format_current_schedule()
-                await message.edit(embed=embed)
-            except discord.NotFound:
-                await log_to_console(f"Current shifts message not found in channel {channel_id}", "warning")
+        if not channel:
+            return
+        try:
+            await display_editor.edit(channel, message_id, embed)
+        except discord.NotFound:
+            await log_to_console(f"Current shifts message not found in channel {channel_id}", "warning")
+            if current_war_messages.get(channel_id) == message_id:
                 del current_war_messages[channel_id]
-            except Exception as e:
-                await log_to_console(f"Error updating current shifts: {e}", "error")
+        except Exception as e:
+            await log_to_console(f"Error updating current shifts: {e}", "error")
+
+    await asyncio.gather(*(
+        update(channel_id, message_id)
+        for channel_id, message_id in list(current_war_messages.items())
+    ))
+
+
+async def refresh_displays_for_dates(dates):
+    """
+    Update only the displays showing one of the given dates.
+
+    Args:
+        dates: Set of YYYY-MM-DD dates, or None if every date may have changed
+    """
+    if dates is None or get_relevant_schedule_date() in dates:
+        await update_schedule_display()
+
+    # Current displays include overnight shifts that started yesterday
+    pst = pytz.timezone('America/Los_Angeles')
+    now = datetime.now(pst)
+    current_dates = {now.strftime("%Y-%m-%d"), (now - timedelta(days=1)).strftime("%Y-%m-%d")}
+    if dates is None or current_dates & dates:
+        shift_data_changed.set()
+
+
+# Set when shift data changes so auto_update_current recomputes its next wake-up
+shift_data_changed = asyncio.Event()
+
+# Postgres LISTEN connection for shift_updates notifications
+change_listener = None
+change_notifications = asyncio.Queue()
+
+
+def _on_change_listener_readable():
+    """Event loop callback: drain notifications from the LISTEN connection"""
+    try:
+        change_listener.poll()
+    except Exception as e:
+        print(f"Change listener connection lost: {e}")
+        stop_change_listener()
+        # Wake the consumer so it reconnects
+        change_notifications.put_nowait(None)
+        return
+
+    while change_listener.notifies:
+        notify = change_listener.notifies.pop(0)
+        change_notifications.put_nowait((notify.pid, notify.payload))
+
+
+async def start_change_listener():
+    """Open the LISTEN connection and register it with the event loop"""
+    global change_listener
+    change_listener = await adb.create_change_listener()
+    asyncio.get_running_loop().add_reader(change_listener.fileno(), _on_change_listener_readable)
+
+
+def stop_change_listener():
+    """Unregister and close the LISTEN connection"""
+    global change_listener
+    if change_listener is None:
+        return
+    try:
+        asyncio.get_running_loop().remove_reader(change_listener.fileno())
+        change_listener.close()
+    except Exception:
+        pass
+    change_listener = None
+
+
+@tasks.loop()
+async def listen_for_shift_updates():
+    """Refresh affected displays as soon as shift data changes (from any process)"""
+    if change_listener is None:
+        try:
+            await start_change_listener()
+        except Exception as e:
+            await log_to_console(f"Could not start change listener: {e}", "warning")
+            await asyncio.sleep(60)
+            return
+
+    notification = await change_notifications.get()
+    batch = [notification]
+    # Coalesce notifications that arrived together
+    while not change_notifications.empty():
+        batch.append(change_notifications.get_nowait())
+
+    try:
+        all_dates = False
+        changed_dates = set()
+        for item in batch:
+            if item is None:
+                continue
+            pid, payload = item
+            dates = await adb.handle_change_notification(pid, payload)
+            if dates is None:
+                all_dates = True
+            else:
+                changed_dates |= dates
+
+        if all_dates or changed_dates:
+            await refresh_displays_for_dates(None if all_dates else changed_dates)
+    except Exception as e:
+        await log_to_console(f"Error handling shift update notification: {e}", "error")
+
+
+@tasks.loop()
+async def auto_refresh_schedule():
+    """
+    Auto-refresh the schedule when the adaptive interval since the last
+    refresh (from any source) has passed.
+    """
+    pst = pytz.timezone('America/Los_Angeles')
+    refresh_schedule_changed.clear()
+
+    now = datetime.now(pst)
+    delay = (refresh_scheduler.next_refresh_at(now) - now).total_seconds()
+    if delay > 0:
+        try:
+            # A refresh or burst changes the due time; recompute it
+            await asyncio.wait_for(refresh_schedule_changed.wait(), timeout=delay)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+    interval_minutes = refresh_scheduler.current_interval(datetime.now(pst)).total_seconds() / 60
+    await log_to_console(f"Starting scheduled refresh (interval {interval_minutes:.0f} min)...", "info")
+    success = await perform_refresh_with_retry(max_retries=3)
+
+    if not success:
+        refresh_scheduler.record_failure(datetime.now(pst))
+        await log_to_console("Scheduled refresh failed after all retries", "error")
+        return
+
+    # Data changes are pushed by listen_for_shift_updates, but the schedule display
+    # also moves to tomorrow at 8 PM; unchanged renders are skipped by the editor
+    await update_schedule_display()
+
+
+@tasks.loop()
+async def auto_update_current():
+    """
+    Update current shifts displays when the on-duty set can change: at the next
+    scribe shift start/end, at midnight (new date), or when shift data changes.
+    Also moves the daily schedule display on when its relevant date changes
+    (8 PM switches to tomorrow).
+    """
+    pst = pytz.timezone('America/Los_Angeles')
+    # Clear before reading shifts so a change made while computing still wakes us
+    shift_data_changed.clear()
+    schedule_date = get_relevant_schedule_date()
+
+    now = datetime.now(pst)
+    local_now = now.replace(tzinfo=None)
+    tomorrow = (local_now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    wake_at = min(pst.localize(tomorrow), now + timedelta(minutes=CURRENT_DISPLAY_MAX_WAIT_MINUTES))
+    switch_at = local_now.replace(hour=20, minute=0, second=0, microsecond=0)
+    if local_now < switch_at:
+        wake_at = min(wake_at, pst.localize(switch_at))
+    try:
+        next_boundary = await adb.get_next_shift_boundary(now)
+        if next_boundary is not None:
+            wake_at = min(wake_at, next_boundary)
+    except Exception as e:
+        await log_to_console(f"Could not compute next shift boundary: {e}", "warning")
+
+    # Wake a second late so the shift starting/ending at the boundary is already counted
+    timeout = (wake_at - datetime.now(pst)).total_seconds() + 1
+    try:
+        await asyncio.wait_for(shift_data_changed.wait(), timeout=max(timeout, 0))
+    except asyncio.TimeoutError:
+        pass
+
+    if get_relevant_schedule_date() != schedule_date:
+        await update_schedule_display()
+    await update_current_displays()
 
 
 @tasks.loop(hours=24)
@@ -808,41 +1216,54 @@ async def daily_backup():
         return
 
     try:
-        # Cleanup old alerted changes (keep 30 days)
-        db.cleanup_old_alerted_changes(days_to_keep=30)
-
-        # Get all shifts as CSV
-        shifts = db.get_all_shifts()
-        if not shifts:
-            await log_to_console("Daily backup skipped: Database is empty", "warning")
-            return
+        # Cleanup old alerted shift change log entries (keep 30 days)
+        await adb.cleanup_old_changes(days_to_keep=30)
+
+        # Archive shift partitions that fell out of the retention window
+        archived_count = await adb.archive_old_partitions()
+        if archived_count:
+            await log_to_console(f"Archived {archived_count} old shift partition(s)", "info")
+
+        # Full snapshot every BACKUP_FULL_INTERVAL_DAYS, daily deltas in between.
+        # Streamed as gzip-compressed CSV into a temporary file.
+        import tempfile
+
+        full = await adb.needs_full_backup(BACKUP_FULL_INTERVAL_DAYS)
+        kind = "full" if full else "delta"
+
+        with tempfile.TemporaryFile() as backup_file:
+            count = await adb.write_backup(backup_file, full=full)
+            if not count:
+                if full:
+                    await log_to_console("Daily backup skipped: Database is empty", "warning")
+                else:
+                    await log_to_console("Daily backup skipped: No changes since last backup", "info")
+                return
 
-        # Create CSV content
-        import csv
-        import io
+            backup_file.seek(0)
+            file = discord.File(
+                backup_file,
+                filename=f"schedule_backup_{datetime.now().strftime('%Y%m%d')}_{kind}.csv.gz"
+            )
 
-        output = io.StringIO()
-        fieldnames = ['date', 'label', 'time', 'person', 'role', 'site']
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(shifts)
+            min_date, max_date = await adb.get_date_range()
 
-        # Convert to bytes
-        csv_bytes = output.getvalue().encode('utf-8')
-        file = discord.File(io.BytesIO(csv_bytes), filename=f"schedule_backup_{datetime.now().strftime('%Y%m%d')}.csv")
+            embed = discord.Embed(
+                title=f"📦 Daily Database Backup ({kind.title()})",
+                description=(
+                    f"**{'Records' if full else 'Changed Rows'}:** {count}\n"
+                    f"**Date Range:** {min_date} to {max_date}"
+                ),
+                color=0x3498db,
+                timestamp=datetime.utcnow()
+            )
 
-        count = len(shifts)
-        min_date, max_date = db.get_date_range()
+            await channel.send(embed=embed, file=file)
 
-        embed = discord.Embed(
-            title="📦 Daily Database Backup",
-            description=f"**Records:** {count}\n**Date Range:** {min_date} to {max_date}",
-            color=0x3498db,
-            timestamp=datetime.utcnow()
-        )
+        # Only advance the delta base once the upload succeeded
+        await adb.commit_backup(full)
 
-        await channel.send(embed=embed, file=file)
-        await log_to_console(f"Daily backup completed: {count} records", "success")
+        await log_to_console(f"Daily {kind} backup completed: {count} rows", "success")
 
     except Exception as e:
         await log_to_console(f"Daily backup failed: {e}", "error")
@@ -859,10 +1280,11 @@ async def health_check():
         return
 
     try:
-        # Gather health metrics
-        record_count = db.get_record_count()
-        min_date, max_date = db.get_date_range()
-        last_refresh = db.get_last_refresh_time()
+        # Gather health metrics (one stats read)
+        stats = await adb.get_shift_stats()
+        record_count = stats['record_count']
+        min_date, max_date = stats['min_date'], stats['max_date']
+        last_refresh = stats['last_refresh']
 
         # Build health report
         embed = discord.Embed(
@@ -878,14 +1300,96 @@ async def health_check():
         if min_date and max_date:
             embed.add_field(name="Date Range", value=f"{min_date} to {max_date}", inline=False)
 
+        if stats['role_counts']:
+            embed.add_field(
+                name="Shifts by Role",
+                value="\n".join(f"{role}: {count}" for role, count in sorted(stats['role_counts'].items())),
+                inline=True
+            )
+        if stats['site_counts']:
+            embed.add_field(
+                name="Shifts by Site",
+                value="\n".join(f"{site}: {count}" for site, count in sorted(stats['site_counts'].items()))[:1024],
+                inline=True
+            )
+
         embed.add_field(
             name="Last Refresh Status",
             value="✅ Success" if last_refresh_success else "❌ Failed",
             inline=True
         )
+        schedule_stats = refresh_scheduler.get_stats(datetime.now(pytz.timezone('America/Los_Angeles')))
+        burst = (
+            f" • burst until {schedule_stats['burst_until'].strftime('%I:%M %p')}"
+            if schedule_stats['burst_until'] else ""
+        )
+        embed.add_field(
+            name="Refresh Schedule",
+            value=(
+                f"Every {schedule_stats['interval_minutes']:.0f} min{burst} • next "
+                f"{schedule_stats['next_refresh_at'].strftime('%I:%M %p')}\n"
+                f"Recent changes: {schedule_stats['recent_changes'] or 'none'} "
+                f"(upcoming week: {schedule_stats['recent_upcoming_changes'] or 'none'})"
+            ),
+            inline=False
+        )
+
+        flight_stats = refresh_flight.get_stats()
+        embed.add_field(
+            name="Refresh Requests",
+            value=(
+                f"{flight_stats['started']} run • {flight_stats['joined']} joined in flight • "
+                f"{flight_stats['served_fresh']} reused"
+            ),
+            inline=True
+        )
 
         embed.add_field(name="Active Schedule Displays", value=str(len(schedule_messages)), inline=True)
         embed.add_field(name="Active Current Displays", value=str(len(current_war_messages)), inline=True)
+        edit_stats = display_editor.get_stats()
+        embed.add_field(
+            name="Display Edits",
+            value=f"{edit_stats['sent']} sent • {edit_stats['skipped']} skipped • {edit_stats['coalesced']} coalesced",
+            inline=True
+        )
+        log_stats = console_log.get_stats()
+        embed.add_field(
+            name="Console Log",
+            value=(
+                f"{log_stats['logged']} entries in {log_stats['batches_sent']} batches • "
+                f"{log_stats['aggregated']} repeats • {log_stats['dropped']} dropped"
+            ),
+            inline=True
+        )
+
+        cache_stats = await adb.get_cache_stats()
+        embed.add_field(
+            name="Shift Cache",
+            value=(
+                f"{cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%}) • gen {cache_stats['generation']}"
+            ),
+            inline=False
+        )
+
+        query_stats = await adb.get_query_stats()
+        if query_stats:
+            # Slowest total time first; keep within the embed field limit
+            latency_lines = [
+                f"`{s['method']}` n={s['count']} • p50 {s['p50']:.1f} / p95 {s['p95']:.1f} / "
+                f"p99 {s['p99']:.1f} ms"
+                for s in query_stats[:8]
+            ]
+            embed.add_field(name="Query Latency", value="\n".join(latency_lines)[:1024], inline=False)
+
+        # Blocking work runs on these pools; a low gateway latency shows the loop isn't starved
+        pool_lines = [
+            f"`{p['name']}` queued {p['queued']} (max {p['max_queued']}) • running {p['running']} • "
+            f"wait p99 {p['wait_p99']:.1f} ms • run p50 {p['run_p50']:.1f} / p99 {p['run_p99']:.1f} ms"
+            for p in (storage_pool.get_stats(), scrape_pool.get_stats())
+        ]
+        pool_lines.append(f"Gateway latency: {bot.latency * 1000:.0f} ms")
+        embed.add_field(name="Worker Pools", value="\n".join(pool_lines), inline=False)
 
         await channel.send(embed=embed)
 
@@ -903,6 +1407,11 @@ async def before_auto_refresh_schedule():
     await bot.wait_until_ready()
 
 
+@listen_for_shift_updates.before_loop
+async def before_listen_for_shift_updates():
+    await bot.wait_until_ready()
+
+
 @daily_backup.before_loop
 async def before_daily_backup():
     await bot.wait_until_ready()
@@ -927,6 +1436,7 @@ async def commands_list(ctx):
 `.tomorrow` - Show tomorrow's schedule
 `.current` - Show who's working right now
 `.schedule MM-DD-YYYY` - Show schedule for specific date
+`.week [MM-DD-YYYY] [days]` - Show several days, one page per day (◀️ ▶️ to flip; `.week 3` for the next 3 days)
 `.commands` - Show this help message
     """
     msg = await ctx.send(help_text)
@@ -948,7 +1458,7 @@ async def cleanduplicates(ctx):
 
     try:
         # First, check how many duplicates exist
-        duplicate_count = db.get_duplicate_count()
+        duplicate_count = await adb.get_duplicate_count()
 
         if duplicate_count == 0:
             await msg.edit(content="✅ No duplicate entries found! Database is clean.")
@@ -957,7 +1467,7 @@ async def cleanduplicates(ctx):
             await msg.edit(content=f"🔄 Found {duplicate_count} duplicate entries. Removing...")
 
             # Remove duplicates
-            deleted_count = db.remove_duplicate_shifts()
+            deleted_count = await adb.remove_duplicate_shifts()
 
             await msg.edit(
                 content=f"✅ Database cleanup complete!\n"
@@ -1032,14 +1542,22 @@ async def resetdb(ctx):
     await warning_msg.edit(content="🗑️ Clearing database...")
     await log_to_console(f"Database reset initiated by {ctx.author.name}", "warning")
 
-    try:
+    deleted_count = 0
+
+    async def clear_and_refresh():
+        nonlocal deleted_count
         # Clear all shifts
-        deleted_count = db.clear_all_shifts()
+        deleted_count = await adb.clear_all_shifts()
         await warning_msg.edit(content=f"✅ Cleared {deleted_count} shift entries.\n🔄 Fetching fresh data from ShiftGen...")
         await log_to_console(f"Cleared {deleted_count} shifts from database", "info")
 
-        # Trigger a refresh to repopulate
-        success = await perform_refresh_with_retry(status_message=warning_msg)
+        # Repopulate (every slot is logged as added, so don't alert)
+        return await _refresh_with_retry(3, warning_msg, post_alerts=False)
+
+    try:
+        # Runs as the single in-flight refresh: waits for any running refresh first,
+        # and refreshes requested meanwhile wait for (and reuse) this one
+        success = await refresh_flight.run(clear_and_refresh, force=True)
 
         if success:
             await warning_msg.edit(
@@ -1085,6 +1603,7 @@ async def devcommands(ctx):
 `.postcurrent` - Post auto-updating current shifts
 `.updatenow` - Force update all displays
 `.refresh` - Manually refresh database
+`.refreshburst [minutes]` - Refresh every few minutes for a while (0 stops)
 `.cleanduplicates` - Remove duplicate shift entries
 `.resetdb` - Clear database and repopulate with fresh data (ADMIN ONLY)
 `.setscheduledate MM-DD-YYYY` - Lock schedule to specific date
@@ -0,0 +1,56 @@
+"""
+Restore the shifts table from a full backup plus daily delta backups
+"""
+import argparse
+import gzip
+from contextlib import ExitStack
+from pathlib import Path
+from typing import List
+
+from .postgres_db import PostgresDatabase
+
+
+def open_backup(path: Path):
+    """Open a backup file for reading, transparently decompressing .gz files"""
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def restore_from_files(db: PostgresDatabase, full_path: Path, delta_paths: List[Path]) -> int:
+    """
+    Restore shifts from a full snapshot file and delta files.
+
+    Args:
+        db: Connected PostgresDatabase
+        full_path: Path to a schedule_backup_*_full.csv(.gz) file
+        delta_paths: Paths to schedule_backup_*_delta.csv(.gz) files
+
+    Returns:
+        Number of shifts after the restore
+    """
+    # Backup filenames embed YYYYMMDD, so name order is chronological
+    delta_paths = sorted(delta_paths, key=lambda p: p.name)
+
+    with ExitStack() as stack:
+        full_file = stack.enter_context(open_backup(full_path))
+        delta_files = [stack.enter_context(open_backup(p)) for p in delta_paths]
+        return db.restore_backup(full_file, delta_files)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild the shifts table from a full backup plus daily deltas"
+    )
+    parser.add_argument("full", type=Path, help="Full snapshot backup file")
+    parser.add_argument("deltas", type=Path, nargs="*",
+                        help="Delta backup files up to the day to restore to")
+    args = parser.parse_args()
+
+    db = PostgresDatabase()
+    count = restore_from_files(db, args.full, args.deltas)
+    print(f"✅ Restored {count} shifts from {args.full.name} + {len(args.deltas)} delta(s)")
+
+
+if __name__ == "__main__":
+    main()
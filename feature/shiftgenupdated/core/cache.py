@@ -0,0 +1,66 @@
+"""
+In-process caches for schedule data
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class GenerationCache:
+    """
+    Small LRU cache whose entries are tied to a data generation.
+
+    Keys are stored together with the generation they were loaded at, so bumping
+    the generation after a refresh makes every older entry unreachable without
+    having to know which keys changed.
+    """
+
+    def __init__(self, max_size: int = 64):
+        """
+        Args:
+            max_size: Maximum number of entries kept before evicting the least recently used
+        """
+        self.max_size = max_size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key at the current generation, or None"""
+        cache_key = (key, self.generation)
+        if cache_key in self._entries:
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return self._entries[cache_key]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value for key at the current generation"""
+        cache_key = (key, self.generation)
+        self._entries[cache_key] = value
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def set_generation(self, generation: int) -> None:
+        """Move to a new data generation, dropping entries from older generations"""
+        if generation != self.generation:
+            self.generation = generation
+            self._entries.clear()
+
+    def invalidate(self) -> None:
+        """Drop all entries without changing the generation"""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counters for monitoring"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total) if total else 0.0,
+            'size': len(self._entries),
+            'generation': self.generation
+        }
@@ -15,4 +15,53 @@ NAME_LEGEND_FILE = "name_legend.json"
 
 # Timing settings (seconds)
 SITE_CHANGE_DELAY = 2
-PAGE_LOAD_DELAY = 1
\ No newline at end of file
+PAGE_LOAD_DELAY = 1
+
+# Database retention: months of past shifts kept in the live (partitioned) table
+SHIFT_RETENTION_MONTHS = 3
+
+# Backups: days between full snapshots (daily deltas in between)
+BACKUP_FULL_INTERVAL_DAYS = 7
+
+# Storage calls slower than this (milliseconds) are reported to the console channel
+SLOW_QUERY_THRESHOLD_MS = 500
+
+# Current shifts displays update at each shift start/end; this caps the wait between updates (minutes)
+CURRENT_DISPLAY_MAX_WAIT_MINUTES = 60
+
+# Schedule display layout, in display order. Each scribe label belongs to exactly one zone;
+# short_name is used in the current shifts view. Compiled once by core/layout.py.
+ZONE_HEADER_TEMPLATE = "(っ ᐛ )っ **{name}**"
+ZONE_LAYOUT = [
+    {"name": "Zone 1", "short_name": "Zone 1", "emoji": "🎄", "color_emoji": "🟦", "labels": ["B", "F", "X"]},
+    {"name": "Zone 2", "short_name": "Zone 2", "emoji": "☃️", "color_emoji": "🟥", "labels": ["A", "E", "I"]},
+    {"name": "Zones 3/4", "short_name": "Zone 3/4", "emoji": "🍷", "color_emoji": "🟨", "labels": ["C", "G"]},
+    {"name": "Zones 5/6 (Fast Track)", "short_name": "Fast Track", "emoji": "🎅", "color_emoji": "🟪", "labels": ["D", "H"]},
+    {"name": "PA (Fast Track)", "short_name": "Fast Track", "emoji": "🍫", "color_emoji": "🟩", "labels": ["PA"]},
+    {"name": "Overflow", "short_name": "Overflow", "emoji": "🟫", "color_emoji": "🟫", "labels": ["PIT"]},
+]
+
+# Daily schedule embed colors, Monday first
+WEEKDAY_COLORS = [
+    0x3498db,  # Monday - Blue
+    0x9b59b6,  # Tuesday - Purple
+    0xe91e63,  # Wednesday - Pink
+    0xf39c12,  # Thursday - Orange
+    0x2ecc71,  # Friday - Green
+    0x1abc9c,  # Saturday - Teal
+    0xe74c3c,  # Sunday - Red
+]
+
+# Worker threads for blocking storage calls. Each backend holds a single connection,
+# so more than one thread would interleave transactions on it.
+STORAGE_WORKER_THREADS = 1
+
+# A refresh requested within this many seconds of a successful one reuses its result
+REFRESH_FRESHNESS_SECONDS = 120
+
+# Automatic refresh interval bounds (minutes); the interval adapts to how often schedules change
+REFRESH_MIN_INTERVAL_MINUTES = 20
+REFRESH_MAX_INTERVAL_MINUTES = 240
+REFRESH_INITIAL_INTERVAL_MINUTES = 120
+# Interval used by .refreshburst
+REFRESH_BURST_INTERVAL_MINUTES = 10
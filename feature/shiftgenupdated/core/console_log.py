@@ -0,0 +1,173 @@
+"""
+Buffered log sink for the Discord console channel
+"""
+import asyncio
+import io
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import discord
+import pytz
+
+
+LEVEL_EMOJI = {
+    "info": "ℹ️",
+    "warning": "⚠️",
+    "error": "❌",
+    "success": "✅"
+}
+
+LEVEL_COLORS = {
+    "info": 0x3498db,
+    "success": 0x2ecc71,
+    "warning": 0xf39c12,
+    "error": 0xe74c3c
+}
+
+# Higher is more severe; unknown levels count as info
+LEVEL_SEVERITY = {"info": 0, "success": 0, "warning": 1, "error": 2}
+
+# Discord embed description limit; longer batches are sent as a file
+EMBED_TEXT_LIMIT = 4096
+
+
+class ConsoleLogSink:
+    """
+    Collects console log entries and sends them in batches.
+
+    log() only appends to an in-memory buffer, so logging never waits on
+    Discord. A background task flushes the buffer every flush_interval seconds
+    as one embed (or a text file when it's too long for an embed). Entries at
+    or above immediate_level wake the task for an immediate flush. Repeats of
+    the same message are counted instead of sent again, and when the buffer is
+    full the oldest least severe entry is dropped.
+    """
+
+    def __init__(self, get_channel: Callable,
+                 flush_interval: float = 5.0, max_entries: int = 200,
+                 immediate_level: str = "error"):
+        """
+        Args:
+            get_channel: Returns the console channel, or None if none is set
+            flush_interval: Seconds between batched flushes
+            max_entries: Maximum distinct entries buffered between flushes
+            immediate_level: Entries at or above this level are flushed right away
+        """
+        self.get_channel = get_channel
+        self.flush_interval = flush_interval
+        self.max_entries = max_entries
+        self.immediate_severity = LEVEL_SEVERITY.get(immediate_level, 2)
+
+        self._entries: Dict[tuple, Dict] = {}  # (level, message) -> entry, in arrival order
+        self._flush_now = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self._dropped_since_flush = 0
+
+        self.logged = 0
+        self.aggregated = 0
+        self.dropped = 0
+        self.batches_sent = 0
+
+    def log(self, message: str, level: str = "info") -> None:
+        """Buffer an entry for the next flush (never blocks)"""
+        self.logged += 1
+        now = datetime.now(pytz.timezone('America/Los_Angeles'))
+        key = (level, message)
+
+        entry = self._entries.get(key)
+        if entry:
+            entry['count'] += 1
+            entry['last_at'] = now
+            self.aggregated += 1
+        else:
+            if len(self._entries) >= self.max_entries:
+                self._drop_one()
+            self._entries[key] = {'level': level, 'message': message, 'count': 1, 'first_at': now, 'last_at': now}
+
+        if LEVEL_SEVERITY.get(level, 0) >= self.immediate_severity:
+            self._flush_now.set()
+
+    def _drop_one(self) -> None:
+        """Drop the oldest of the least severe buffered entries"""
+        victim = min(self._entries, key=lambda k: LEVEL_SEVERITY.get(k[0], 0))
+        count = self._entries.pop(victim)['count']
+        self._dropped_since_flush += count
+        self.dropped += count
+
+    def start(self) -> None:
+        """Start the background flush task (no-op if already running)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Send everything buffered so far as one message"""
+        if not self._entries:
+            return
+
+        entries = list(self._entries.values())
+        dropped = self._dropped_since_flush
+        self._entries.clear()
+        self._dropped_since_flush = 0
+
+        channel = self.get_channel()
+        if not channel:
+            return
+
+        lines = [self._format_entry(entry) for entry in entries]
+        if dropped:
+            lines.append(f"📝 {dropped} lower-priority log entries dropped")
+        text = "\n".join(lines)
+
+        worst = max(entries, key=lambda e: LEVEL_SEVERITY.get(e['level'], 0))['level']
+        embed = discord.Embed(color=LEVEL_COLORS.get(worst, LEVEL_COLORS["info"]))
+
+        try:
+            if len(text) <= EMBED_TEXT_LIMIT:
+                embed.description = text
+                await channel.send(embed=embed)
+            else:
+                embed.description = self._summarize(entries, dropped)
+                timestamp = entries[0]['first_at'].strftime('%Y%m%d_%H%M%S')
+                log_file = discord.File(io.BytesIO(text.encode()), filename=f"console_log_{timestamp}.txt")
+                await channel.send(embed=embed, file=log_file)
+            self.batches_sent += 1
+        except Exception as e:
+            print(f"Failed to log to console: {e}")
+
+    def _format_entry(self, entry: Dict) -> str:
+        emoji = LEVEL_EMOJI.get(entry['level'], "📝")
+        timestamp = entry['first_at'].strftime("%I:%M:%S %p")
+        repeats = ""
+        if entry['count'] > 1:
+            repeats = f" (×{entry['count']}, last {entry['last_at'].strftime('%I:%M:%S %p')})"
+        return f"{emoji} **[{timestamp}]** {entry['message']}{repeats}"
+
+    def _summarize(self, entries: List[Dict], dropped: int) -> str:
+        """Short embed text for batches sent as a file"""
+        counts = {}
+        for entry in entries:
+            counts[entry['level']] = counts.get(entry['level'], 0) + entry['count']
+        parts = [f"{LEVEL_EMOJI.get(level, '📝')} {count} {level}" for level, count in counts.items()]
+        if dropped:
+            parts.append(f"📝 {dropped} dropped")
+        return "Console log batch (full log attached): " + " • ".join(parts)
+
+    def get_stats(self) -> Dict:
+        """Return logging counters for monitoring"""
+        return {
+            'logged': self.logged,
+            'aggregated': self.aggregated,
+            'dropped': self.dropped,
+            'buffered': len(self._entries),
+            'batches_sent': self.batches_sent
+        }
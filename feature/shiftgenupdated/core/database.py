@@ -6,6 +6,7 @@ from typing import List, Dict
 import pytz
 
 from .name_mapper import NameMapper
+from .pairing import ProviderIndex, pair_scribe_shifts
 
 
 class ConsolidatedDatabase:
@@ -138,59 +139,35 @@ class ConsolidatedDatabase:
             return embed
         
         schedule_lines = []
-        processed_indices = set()
-        
-        for i, shift in enumerate(shifts):
-            if shift['role'] == 'Scribe' and i not in processed_indices:
-                physician = None
-                mlp = None
-                is_pa_shift = shift['label'] == 'PA'
-                
-                # Match up shifts
-                for j, other in enumerate(shifts):
-                    match_date = other['date'] == shift['date']
-                    
-                    if is_pa_shift and other['role'] == 'MLP':
-                        match_time = self._times_overlap_or_close(shift['time'], other['time'])
-                        if match_date and match_time:
-                            mlp = other['person']
-                    else:
-                        match_time = other['time'] == shift['time']
-                        match_label = other['label'] == shift['label']
-                        
-                        if match_date and match_time and match_label:
-                            if other['role'] == 'Physician':
-                                physician = other['person']
-                
-                # Format time nicely
-                time_parts = shift['time'].split('-')
-                if len(time_parts) == 2:
-                    start, end = time_parts[0], time_parts[1]
-                    if len(start) == 4:
-                        start = f"{start[:2]}:{start[2:]}"
-                    elif len(start) == 3:
-                        start = f"0{start[0]}:{start[1:]}"
-                    if len(end) == 4:
-                        end = f"{end[:2]}:{end[2:]}"
-                    elif len(end) == 3:
-                        end = f"0{end[0]}:{end[1:]}"
-                    time_display = f"{start}-{end}"
-                else:
-                    time_display = shift['time']
-                
-                # Build field value
-                if mlp:
-                    value = f"**{shift['person']}** with {mlp}"
-                elif physician:
-                    value = f"**{shift['person']}** with {physician}"
-                else:
-                    value = f"**{shift['person']}**"
-                
-                # Get start hour for categorization
-                start_hour = int(shift['time'].split('-')[0][:2]) if len(shift['time'].split('-')[0]) == 4 else int(shift['time'].split('-')[0][0])
-                
-                schedule_lines.append((shift['time'], shift['label'], time_display, value, start_hour))
-                processed_indices.add(i)
+        for shift, physician, mlp in pair_scribe_shifts(shifts):
+            # Format time nicely
+            time_parts = shift['time'].split('-')
+            if len(time_parts) == 2:
+                start, end = time_parts[0], time_parts[1]
+                if len(start) == 4:
+                    start = f"{start[:2]}:{start[2:]}"
+                elif len(start) == 3:
+                    start = f"0{start[0]}:{start[1:]}"
+                if len(end) == 4:
+                    end = f"{end[:2]}:{end[2:]}"
+                elif len(end) == 3:
+                    end = f"0{end[0]}:{end[1:]}"
+                time_display = f"{start}-{end}"
+            else:
+                time_display = shift['time']
+            
+            # Build field value
+            if mlp:
+                value = f"**{shift['person']}** with {mlp}"
+            elif physician:
+                value = f"**{shift['person']}** with {physician}"
+            else:
+                value = f"**{shift['person']}**"
+            
+            # Get start hour for categorization
+            start_hour = int(shift['time'].split('-')[0][:2]) if len(shift['time'].split('-')[0]) == 4 else int(shift['time'].split('-')[0][0])
+            
+            schedule_lines.append((shift['time'], shift['label'], time_display, value, start_hour))
         
         # Sort by time
         schedule_lines.sort(key=lambda x: x[0])
@@ -313,59 +290,35 @@ class ConsolidatedDatabase:
             return [embed]
         
         schedule_lines = []
-        processed_indices = set()
-        
-        for i, shift in enumerate(shifts):
-            if shift['role'] == 'Scribe' and i not in processed_indices:
-                physician = None
-                mlp = None
-                is_pa_shift = shift['label'] == 'PA'
-                
-                # Match up shifts
-                for j, other in enumerate(shifts):
-                    match_date = other['date'] == shift['date']
-                    
-                    if is_pa_shift and other['role'] == 'MLP':
-                        match_time = self._times_overlap_or_close(shift['time'], other['time'])
-                        if match_date and match_time:
-                            mlp = other['person']
-                    else:
-                        match_time = other['time'] == shift['time']
-                        match_label = other['label'] == shift['label']
-                        
-                        if match_date and match_time and match_label:
-                            if other['role'] == 'Physician':
-                                physician = other['person']
-                
-                # Format time nicely
-                time_parts = shift['time'].split('-')
-                if len(time_parts) == 2:
-                    start, end = time_parts[0], time_parts[1]
-                    if len(start) == 4:
-                        start = f"{start[:2]}:{start[2:]}"
-                    elif len(start) == 3:
-                        start = f"0{start[0]}:{start[1:]}"
-                    if len(end) == 4:
-                        end = f"{end[:2]}:{end[2:]}"
-                    elif len(end) == 3:
-                        end = f"0{end[0]}:{end[1:]}"
-                    time_display = f"{start}-{end}"
-                else:
-                    time_display = shift['time']
-                
-                # Build field value
-                if mlp:
-                    value = f"**{shift['person']}** with {mlp}"
-                elif physician:
-                    value = f"**{shift['person']}** with {physician}"
-                else:
-                    value = f"**{shift['person']}**"
-                
-                # Get start hour for categorization
-                start_hour = int(shift['time'].split('-')[0][:2]) if len(shift['time'].split('-')[0]) == 4 else int(shift['time'].split('-')[0][0])
-                
-                schedule_lines.append((shift['time'], shift['label'], time_display, value, start_hour))
-                processed_indices.add(i)
+        for shift, physician, mlp in pair_scribe_shifts(shifts):
+            # Format time nicely
+            time_parts = shift['time'].split('-')
+            if len(time_parts) == 2:
+                start, end = time_parts[0], time_parts[1]
+                if len(start) == 4:
+                    start = f"{start[:2]}:{start[2:]}"
+                elif len(start) == 3:
+                    start = f"0{start[0]}:{start[1:]}"
+                if len(end) == 4:
+                    end = f"{end[:2]}:{end[2:]}"
+                elif len(end) == 3:
+                    end = f"0{end[0]}:{end[1:]}"
+                time_display = f"{start}-{end}"
+            else:
+                time_display = shift['time']
+            
+            # Build field value
+            if mlp:
+                value = f"**{shift['person']}** with {mlp}"
+            elif physician:
+                value = f"**{shift['person']}** with {physician}"
+            else:
+                value = f"**{shift['person']}**"
+            
+            # Get start hour for categorization
+            start_hour = int(shift['time'].split('-')[0][:2]) if len(shift['time'].split('-')[0]) == 4 else int(shift['time'].split('-')[0][0])
+            
+            schedule_lines.append((shift['time'], shift['label'], time_display, value, start_hour))
         
         # Sort by time
         schedule_lines.sort(key=lambda x: x[0])
@@ -485,6 +438,7 @@ class ConsolidatedDatabase:
         
         current_shifts = []
         processed_indices = set()
+        providers = ProviderIndex(shifts)
         
         for i, shift in enumerate(shifts):
             if shift['role'] == 'Scribe' and i not in processed_indices:
@@ -525,20 +479,7 @@ class ConsolidatedDatabase:
                 # Check if current time is within shift
                 if start_minutes <= check_minutes < end_minutes:
                     # Find matching physician/MLP
-                    physician = None
-                    mlp = None
-                    is_pa_shift = shift['label'] == 'PA'
-                    
-                    for j, other in enumerate(shifts):
-                        if other['date'] == shift['date']:
-                            if is_pa_shift and other['role'] == 'MLP':
-                                match_time = self._times_overlap_or_close(shift['time'], other['time'])
-                                if match_time:
-                                    mlp = other['person']
-                            else:
-                                if other['time'] == shift['time'] and other['label'] == shift['label']:
-                                    if other['role'] == 'Physician':
-                                        physician = other['person']
+                    physician, mlp = providers.find_providers(shift)
                     
                     # Format time display
                     if len(start_time) == 4:
@@ -583,43 +524,6 @@ class ConsolidatedDatabase:
         
         return embed
     
-    def _times_overlap_or_close(self, time1: str, time2: str, tolerance_minutes: int = 60) -> bool:
-        """
-        Check if two shift times overlap or start within tolerance of each other.
-        For PA matching: scribe 1000-1830 should match MLP 1000-2000
-        
-        Args:
-            time1: First time string (format: HHMM-HHMM)
-            time2: Second time string (format: HHMM-HHMM)
-            tolerance_minutes: Minutes of tolerance for start time matching
-            
-        Returns:
-            True if times are close enough to match
-        """
-        try:
-            # Parse times (format: HHMM-HHMM)
-            start1, end1 = time1.split('-')
-            start2, end2 = time2.split('-')
-            
-            # Convert to minutes for comparison
-            def to_minutes(time_str):
-                # Handle both 3 and 4 digit times
-                if len(time_str) == 3:
-                    h = int(time_str[0])
-                    m = int(time_str[1:])
-                else:
-                    h = int(time_str[:2])
-                    m = int(time_str[2:])
-                return h * 60 + m
-            
-            s1 = to_minutes(start1)
-            s2 = to_minutes(start2)
-            
-            # Check if start times are within tolerance
-            return abs(s1 - s2) <= tolerance_minutes
-        except:
-            return False
-        
     def compare_schedules(self, new_data: List[Dict]) -> List[Dict]:
         """
         Compare new schedule data with current data to find changes.
@@ -3,13 +3,151 @@ Discord embed formatting utilities for schedule displays
 """
 import discord
 import pytz
-from datetime import datetime
-from typing import List, Dict
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+from .config import WEEKDAY_COLORS
+from .layout import ZONES, LABEL_ZONES, LAYOUT_FINGERPRINT, DATE_FORMAT, TIMESTAMP_FORMAT, zone_indicator
+from .pairing import ProviderIndex, pair_scribe_shifts
+
+
+# Bump when the structure of build_daily_schedule_document() changes so stored
+# documents are rebuilt on the next refresh (zone layout edits are picked up
+# automatically through the layout fingerprint)
+SCHEDULE_DOCUMENT_VERSION = f"1.{LAYOUT_FINGERPRINT}"
 
 
 class DiscordFormatter:
     """Mixin class providing Discord embed formatting for schedule data"""
 
+    def build_daily_schedule_document(self, target_date: str, shifts: List[Dict]) -> Dict:
+        """
+        Build the denormalized schedule document for a single date.
+
+        Pairs each scribe shift with its physician/MLP and groups the slots by zone,
+        sorted by time. The result is plain JSON so it can be stored and re-rendered
+        without touching the raw shift rows again.
+
+        Args:
+            target_date: Date in YYYY-MM-DD format
+            shifts: All shifts (every role) for target_date
+
+        Returns:
+            Document dictionary with 'date', 'shift_count', 'total_shifts' and 'zones'
+        """
+        return self.build_schedule_documents([target_date], shifts)[target_date]
+
+    def build_schedule_documents(self, dates: List[str], shifts: List[Dict]) -> Dict[str, Dict]:
+        """
+        Build schedule documents for several dates with a single pairing pass.
+
+        Args:
+            dates: Dates in YYYY-MM-DD format; dates without shifts get an empty document
+            shifts: All shifts (every role) for those dates
+
+        Returns:
+            Dictionary of date -> document (see build_daily_schedule_document)
+        """
+        shift_counts = {date: 0 for date in dates}
+        zone_shifts = {date: {zone['name']: [] for zone in ZONES} for date in dates}
+        total_shifts = {date: 0 for date in dates}
+
+        for shift in shifts:
+            if shift['date'] in shift_counts:
+                shift_counts[shift['date']] += 1
+
+        for shift, physician, mlp in pair_scribe_shifts(shifts):
+            # Add to appropriate zone group
+            zone = LABEL_ZONES.get(shift['label'])
+            if zone is None or shift['date'] not in zone_shifts:
+                continue
+            zone_shifts[shift['date']][zone['name']].append({
+                'label': shift['label'],
+                'time': shift['time'],
+                'time_display': self._format_time_range(shift['time']),
+                'scribe_name': shift['person'],
+                'physician': physician,
+                'mlp': mlp
+            })
+            total_shifts[shift['date']] += 1
+
+        documents = {}
+        for date in dates:
+            zones = []
+            for zone in ZONES:
+                slots = zone_shifts[date][zone['name']]
+                if slots:
+                    # Sort shifts by time within each zone
+                    slots.sort(key=lambda x: x['time'])
+                    zones.append({
+                        'name': zone['name'],
+                        'emoji': zone['emoji'],
+                        'color_emoji': zone['color_emoji'],
+                        'header': zone['header'],
+                        'shifts': slots
+                    })
+
+            documents[date] = {
+                'date': date,
+                'shift_count': shift_counts[date],
+                'total_shifts': total_shifts[date],
+                'zones': zones
+            }
+        return documents
+
+    def get_daily_schedule_document(self, target_date: str) -> Dict:
+        """
+        Get the schedule document for a date.
+        Storage backends with materialized documents override this.
+
+        Args:
+            target_date: Date in YYYY-MM-DD format
+
+        Returns:
+            Document dictionary (see build_daily_schedule_document)
+        """
+        return self.build_daily_schedule_document(target_date, self.get_shifts_for_date(target_date))
+
+    def get_shifts_for_range(self, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Get all shifts between two dates (inclusive).
+        Storage backends override this with a single range query.
+
+        Args:
+            start_date: First date in YYYY-MM-DD format
+            end_date: Last date in YYYY-MM-DD format
+
+        Returns:
+            List of shift dictionaries ordered by date, label, time and role
+        """
+        shifts = []
+        for date in self._date_range(start_date, end_date):
+            shifts.extend(self.get_shifts_for_date(date))
+        return shifts
+
+    def get_schedule_documents_for_range(self, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Get schedule documents for every date between two dates (inclusive),
+        from one range read and one pairing pass.
+        Storage backends with materialized documents override this.
+
+        Args:
+            start_date: First date in YYYY-MM-DD format
+            end_date: Last date in YYYY-MM-DD format
+
+        Returns:
+            List of documents in date order (see build_daily_schedule_document)
+        """
+        dates = self._date_range(start_date, end_date)
+        documents = self.build_schedule_documents(dates, self.get_shifts_for_range(start_date, end_date))
+        return [documents[date] for date in dates]
+
+    def _date_range(self, start_date: str, end_date: str) -> List[str]:
+        """List the YYYY-MM-DD dates from start_date to end_date (inclusive)"""
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        days = (datetime.strptime(end_date, "%Y-%m-%d") - start).days
+        return [(start + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(days + 1)]
+
     def format_daily_schedule_combined(self, target_date: str) -> discord.Embed:
         """
         Format the schedule as a single combined embed grouped by zones.
@@ -20,227 +158,71 @@ class DiscordFormatter:
         Returns:
             Single discord.Embed object with shifts grouped by zone
         """
-        shifts = self.get_shifts_for_date(target_date)
-        date_obj = datetime.strptime(target_date, "%Y-%m-%d")
+        return self._format_combined_document(self.get_daily_schedule_document(target_date))
 
-        # Format title
-        import platform
-        if platform.system() == 'Windows':
-            title = f"Showing: {date_obj.strftime('%A')} • {date_obj.strftime('%#m/%#d/%Y')}"
-        else:
-            title = f"Showing: {date_obj.strftime('%A')} • {date_obj.strftime('%-m/%-d/%Y')}"
+    def format_schedule_range(self, start_date: str, end_date: str) -> List[discord.Embed]:
+        """
+        Format a multi-day schedule as pages, one combined embed per day.
 
-        # Create embed with color based on day of week
-        colors = {
-            0: 0x3498db,  # Monday - Blue
-            1: 0x9b59b6,  # Tuesday - Purple
-            2: 0xe91e63,  # Wednesday - Pink
-            3: 0xf39c12,  # Thursday - Orange
-            4: 0x2ecc71,  # Friday - Green
-            5: 0x1abc9c,  # Saturday - Teal
-            6: 0xe74c3c,  # Sunday - Red
-        }
-
-        # Zone groupings - maps labels to zone info
-        # Using colored square emojis to represent zone colors
-        zone_groups = {
-            'Zone 1': {
-                'emoji': '🎄',
-                'color_emoji': '🟦',  # Blue square
-                'header': '(っ ᐛ )っ **Zone 1**',
-                'labels': ['B', 'F', 'X'],
-                'shifts': []
-            },
-            'Zone 2': {
-                'emoji': '☃️',
-                'color_emoji': '🟥',  # Red square
-                'header': '(っ ᐛ )っ **Zone 2**',
-                'labels': ['A', 'E', 'I'],
-                'shifts': []
-            },
-            'Zones 3/4': {
-                'emoji': '🍷',
-                'color_emoji': '🟨',  # Yellow square
-                'header': '(っ ᐛ )っ **Zones 3/4**',
-                'labels': ['C', 'G'],
-                'shifts': []
-            },
-            'Zones 5/6 (Fast Track)': {
-                'emoji': '🎅',
-                'color_emoji': '🟪',  # Purple square
-                'header': '(っ ᐛ )っ **Zones 5/6 (Fast Track)**',
-                'labels': ['D', 'H'],
-                'shifts': []
-            },
-            'PA (Fast Track)': {
-                'emoji': '🍫',
-                'color_emoji': '🟩',  # Green square
-                'header': '(っ ᐛ )っ **PA (Fast Track)**',
-                'labels': ['PA'],
-                'shifts': []
-            },
-            'Overflow': {
-                'emoji': '🟫',
-                'color_emoji': '🟫',  # Brown square
-                'header': '(っ ᐛ )っ **Overflow**',
-                'labels': ['PIT'],
-                'shifts': []
-            }
-        }
+        All pages are rendered up front from a single range read, so flipping
+        between pages never touches storage.
 
+        Args:
+            start_date: First date in YYYY-MM-DD format
+            end_date: Last date in YYYY-MM-DD format
+
+        Returns:
+            List of discord.Embed pages in date order
+        """
+        documents = self.get_schedule_documents_for_range(start_date, end_date)
+        return [
+            self._format_combined_document(document, page=f"Page {page_number}/{len(documents)}")
+            for page_number, document in enumerate(documents, start=1)
+        ]
+
+    def _format_combined_document(self, document: Dict, page: str = None) -> discord.Embed:
+        """
+        Render one schedule document as the combined (zone-grouped) embed.
+
+        Args:
+            document: Schedule document (see build_daily_schedule_document)
+            page: Optional page indicator shown at the start of the footer
+        """
+        date_obj = datetime.strptime(document['date'], "%Y-%m-%d")
+
+        # Create embed with color based on day of week
         embed = discord.Embed(
-            title=title,
-            color=colors[date_obj.weekday()],
+            title=f"Showing: {date_obj.strftime('%A')} • {date_obj.strftime(DATE_FORMAT)}",
+            color=WEEKDAY_COLORS[date_obj.weekday()],
         )
 
-        if not shifts:
+        if not document['shift_count']:
             embed.description = "No shifts scheduled for this date"
+            if page:
+                embed.set_footer(text=page)
             return embed
 
-        # Process shifts
-        processed_indices = set()
-        total_shifts = 0
-
-        for i, shift in enumerate(shifts):
-            if shift['role'] == 'Scribe' and i not in processed_indices:
-                physician = None
-                mlp = None
-                is_pa_shift = shift['label'] == 'PA'
-
-                # Match up shifts
-                for j, other in enumerate(shifts):
-                    match_date = other['date'] == shift['date']
-
-                    if is_pa_shift and other['role'] == 'MLP':
-                        match_time = self._times_overlap_or_close(shift['time'], other['time'])
-                        if match_date and match_time:
-                            mlp = other['person']
-                    else:
-                        match_time = other['time'] == shift['time']
-                        match_label = other['label'] == shift['label']
-
-                        if match_date and match_time and match_label:
-                            if other['role'] == 'Physician':
-                                physician = other['person']
-
-                # Format time nicely
-                time_parts = shift['time'].split('-')
-                if len(time_parts) == 2:
-                    start, end = time_parts[0], time_parts[1]
-                    if len(start) == 4:
-                        start = f"{start[:2]}:{start[2:]}"
-                    elif len(start) == 3:
-                        start = f"0{start[0]}:{start[1:]}"
-                    if len(end) == 4:
-                        end = f"{end[:2]}:{end[2:]}"
-                    elif len(end) == 3:
-                        end = f"0{end[0]}:{end[1:]}"
-                    time_display = f"{start}-{end}"
-                else:
-                    time_display = shift['time']
-
-                # Build person string
-                if mlp:
-                    person_str = f"**{shift['person']}** with {mlp}"
-                elif physician:
-                    person_str = f"**{shift['person']}** with {physician}"
-                else:
-                    person_str = f"**{shift['person']}**"
+        # Add zones to embed (only zones with shifts)
+        for zone in document['zones']:
+            shift_lines = self._build_zone_lines(zone['shifts'], label_sep="  ", indent="     ")
 
-                # Add to appropriate zone group
-                label = shift['label']
-                for zone_name, zone_info in zone_groups.items():
-                    if label in zone_info['labels']:
-                        zone_info['shifts'].append({
-                            'label': label,
-                            'time': shift['time'],
-                            'time_display': time_display,
-                            'person': person_str,
-                            'scribe_name': shift['person']  # Store scribe name separately for grouping
-                        })
-                        total_shifts += 1
-                        break
-
-                processed_indices.add(i)
+            # Combine all shifts with newlines and add blank line at the end for spacing
+            zone_value = "\n".join(shift_lines) + "\n\u200b"  # \u200b is a zero-width space for spacing
 
-        # Add zones to embed (only zones with shifts)
-        zones_added = 0
-        for zone_name, zone_info in zone_groups.items():
-            if zone_info['shifts']:
-                # Sort shifts by time within each zone
-                zone_info['shifts'].sort(key=lambda x: x['time'])
-
-                # Build all shifts for this zone into a single field value
-                # Group consecutive shifts by the same scribe in the same label
-                shift_lines = []
-                i = 0
-                while i < len(zone_info['shifts']):
-                    shift_data = zone_info['shifts'][i]
-                    current_label = shift_data['label']
-                    current_scribe = shift_data['scribe_name']
-                    current_person = shift_data['person']
-
-                    # Collect all consecutive shifts with same label and scribe
-                    consecutive_times = [shift_data['time_display']]
-                    providers = [current_person]  # Track different providers for split shifts
-                    j = i + 1
-                    while j < len(zone_info['shifts']):
-                        next_shift = zone_info['shifts'][j]
-                        if next_shift['label'] == current_label and next_shift['scribe_name'] == current_scribe:
-                            consecutive_times.append(next_shift['time_display'])
-                            providers.append(next_shift['person'])
-                            j += 1
-                        else:
-                            break
-
-                    # Format the shift line
-                    if len(consecutive_times) == 1:
-                        # Single shift
-                        shift_line = f"{current_label}  {consecutive_times[0]} • {current_person}"
-                    else:
-                        # Multiple shifts - check if same provider or different
-                        # Get unique providers (person strings)
-                        unique_providers = list(dict.fromkeys(providers))
-                        if len(unique_providers) == 1:
-                            # Same provider for all shifts - just show times
-                            times_str = ", ".join(consecutive_times)
-                            shift_line = f"{current_label}  {times_str} • {current_person}"
-                        else:
-                            # Different providers - show each time with provider
-                            for k, (time_display, provider) in enumerate(zip(consecutive_times, providers)):
-                                if k == 0:
-                                    shift_line = f"{current_label}  {time_display} • {provider}"
-                                    shift_lines.append(shift_line)
-                                else:
-                                    # Indent continuation shifts slightly
-                                    shift_line = f"     {time_display} • {provider}"
-                                    shift_lines.append(shift_line)
-                            i = j
-                            continue
-
-                    shift_lines.append(shift_line)
-                    i = j
-
-                # Combine all shifts with newlines and add blank line at the end for spacing
-                zone_value = "\n".join(shift_lines) + "\n\u200b"  # \u200b is a zero-width space for spacing
-
-                # Create field name with color indicator emoji and decorative emoji
-                field_name = f"{zone_info['color_emoji']} {zone_info['header']} {zone_info['emoji']}"
-
-                # Add zone as a single field
-                embed.add_field(
-                    name=field_name,
-                    value=zone_value,
-                    inline=False
-                )
+            # Create field name with color indicator emoji and decorative emoji
+            field_name = f"{zone['color_emoji']} {zone['header']} {zone['emoji']}"
 
-                zones_added += 1
+            # Add zone as a single field
+            embed.add_field(
+                name=field_name,
+                value=zone_value,
+                inline=False
+            )
 
         # Add footer with shift count and timestamp
-        pst = pytz.timezone('America/Los_Angeles')
-        now = datetime.now(pst)
-        timestamp_str = now.strftime("%-m/%-d at %-I:%M %p")
-        embed.set_footer(text=f"Total Shifts: {total_shifts} • Last Updated: {timestamp_str}")
+        timestamp_str = self._format_last_updated()
+        footer = f"Total Shifts: {document['total_shifts']} • Last Updated: {timestamp_str}"
+        embed.set_footer(text=f"{page} • {footer}" if page else footer)
 
         return embed
 
@@ -254,66 +236,14 @@ class DiscordFormatter:
         Returns:
             List of discord.Embed objects (one header + one per zone with shifts)
         """
-        shifts = self.get_shifts_for_date(target_date)
+        document = self.get_daily_schedule_document(target_date)
         date_obj = datetime.strptime(target_date, "%Y-%m-%d")
 
-        # Format date string
-        import platform
-        if platform.system() == 'Windows':
-            date_display = f"{date_obj.strftime('%A')} • {date_obj.strftime('%#m/%#d/%Y')}"
-        else:
-            date_display = f"{date_obj.strftime('%A')} • {date_obj.strftime('%-m/%-d/%Y')}"
-
-        # Zone groupings with new names and emojis
-        # Using colored square emojis to represent zone colors
-        zone_groups = {
-            'Zone 1': {
-                'emoji': '🎄',
-                'color_emoji': '🟦',  # Blue square
-                'header': '(っ ᐛ )っ **Zone 1**',
-                'labels': ['B', 'F', 'X'],
-                'shifts': []
-            },
-            'Zone 2': {
-                'emoji': '☃️',
-                'color_emoji': '🟥',  # Red square
-                'header': '(っ ᐛ )っ **Zone 2**',
-                'labels': ['A', 'E', 'I'],
-                'shifts': []
-            },
-            'Zones 3/4': {
-                'emoji': '🍷',
-                'color_emoji': '🟨',  # Yellow square
-                'header': '(っ ᐛ )っ **Zones 3/4**',
-                'labels': ['C', 'G'],
-                'shifts': []
-            },
-            'Zones 5/6 (Fast Track)': {
-                'emoji': '🎅',
-                'color_emoji': '🟪',  # Purple square
-                'header': '(っ ᐛ )っ **Zones 5/6 (Fast Track)**',
-                'labels': ['D', 'H'],
-                'shifts': []
-            },
-            'PA (Fast Track)': {
-                'emoji': '🍫',
-                'color_emoji': '🟩',  # Green square
-                'header': '(っ ᐛ )っ **PA (Fast Track)**',
-                'labels': ['PA'],
-                'shifts': []
-            },
-            'Overflow': {
-                'emoji': '🟫',
-                'color_emoji': '🟫',  # Brown square
-                'header': '(っ ᐛ )っ **Overflow**',
-                'labels': ['PIT'],
-                'shifts': []
-            }
-        }
+        date_display = f"{date_obj.strftime('%A')} • {date_obj.strftime(DATE_FORMAT)}"
 
         embeds = []
 
-        if not shifts:
+        if not document['shift_count']:
             # Return a single embed if no shifts
             embed = discord.Embed(
                 title=f"Showing: {date_display}",
@@ -322,133 +252,18 @@ class DiscordFormatter:
             )
             return [embed]
 
-        # Process shifts
-        processed_indices = set()
-        total_shifts = 0
-
-        for i, shift in enumerate(shifts):
-            if shift['role'] == 'Scribe' and i not in processed_indices:
-                physician = None
-                mlp = None
-                is_pa_shift = shift['label'] == 'PA'
-
-                # Match up shifts
-                for j, other in enumerate(shifts):
-                    match_date = other['date'] == shift['date']
-
-                    if is_pa_shift and other['role'] == 'MLP':
-                        match_time = self._times_overlap_or_close(shift['time'], other['time'])
-                        if match_date and match_time:
-                            mlp = other['person']
-                    else:
-                        match_time = other['time'] == shift['time']
-                        match_label = other['label'] == shift['label']
-
-                        if match_date and match_time and match_label:
-                            if other['role'] == 'Physician':
-                                physician = other['person']
-
-                # Format time nicely
-                time_parts = shift['time'].split('-')
-                if len(time_parts) == 2:
-                    start, end = time_parts[0], time_parts[1]
-                    if len(start) == 4:
-                        start = f"{start[:2]}:{start[2:]}"
-                    elif len(start) == 3:
-                        start = f"0{start[0]}:{start[1:]}"
-                    if len(end) == 4:
-                        end = f"{end[:2]}:{end[2:]}"
-                    elif len(end) == 3:
-                        end = f"0{end[0]}:{end[1:]}"
-                    time_display = f"{start}-{end}"
-                else:
-                    time_display = shift['time']
-
-                # Build person string
-                if mlp:
-                    person_str = f"**{shift['person']}** with {mlp}"
-                elif physician:
-                    person_str = f"**{shift['person']}** with {physician}"
-                else:
-                    person_str = f"**{shift['person']}**"
-
-                # Add to appropriate zone group
-                label = shift['label']
-                for zone_name, zone_info in zone_groups.items():
-                    if label in zone_info['labels']:
-                        zone_info['shifts'].append({
-                            'label': label,
-                            'time': shift['time'],
-                            'time_display': time_display,
-                            'person': person_str,
-                            'scribe_name': shift['person']
-                        })
-                        total_shifts += 1
-                        break
-
-                processed_indices.add(i)
-
         # Create embeds for each zone with shifts
-        for zone_name, zone_info in zone_groups.items():
-            if zone_info['shifts']:
-                # Sort shifts by time within each zone
-                zone_info['shifts'].sort(key=lambda x: x['time'])
-
-                # Build shift lines
-                shift_lines = []
-                i = 0
-                while i < len(zone_info['shifts']):
-                    shift_data = zone_info['shifts'][i]
-                    current_label = shift_data['label']
-                    current_scribe = shift_data['scribe_name']
-                    current_person = shift_data['person']
-
-                    # Collect consecutive shifts with same label and scribe
-                    consecutive_times = [shift_data['time_display']]
-                    providers = [current_person]
-                    j = i + 1
-                    while j < len(zone_info['shifts']):
-                        next_shift = zone_info['shifts'][j]
-                        if next_shift['label'] == current_label and next_shift['scribe_name'] == current_scribe:
-                            consecutive_times.append(next_shift['time_display'])
-                            providers.append(next_shift['person'])
-                            j += 1
-                        else:
-                            break
-
-                    # Format the shift line
-                    if len(consecutive_times) == 1:
-                        shift_line = f"{current_label} {consecutive_times[0]} • {current_person}"
-                    else:
-                        unique_providers = list(dict.fromkeys(providers))
-                        if len(unique_providers) == 1:
-                            times_str = ", ".join(consecutive_times)
-                            shift_line = f"{current_label} {times_str} • {current_person}"
-                        else:
-                            for k, (time_display, provider) in enumerate(zip(consecutive_times, providers)):
-                                if k == 0:
-                                    shift_line = f"{current_label} {time_display} • {provider}"
-                                    shift_lines.append(shift_line)
-                                else:
-                                    shift_line = f"    {time_display} • {provider}"
-                                    shift_lines.append(shift_line)
-                            i = j
-                            continue
-
-                    shift_lines.append(shift_line)
-                    i = j
-
-                # Create embed for this zone
-                zone_description = "\n".join(shift_lines)
-
-                # Use a subtle color for each zone
-                zone_embed = discord.Embed(
-                    title=f"{zone_info['color_emoji']} {zone_info['header']} {zone_info['emoji']}",
-                    description=zone_description,
-                    color=0x2f3136  # Discord dark theme color for subtle separation
-                )
+        for zone in document['zones']:
+            shift_lines = self._build_zone_lines(zone['shifts'], label_sep=" ", indent="    ")
+
+            # Use a subtle color for each zone
+            zone_embed = discord.Embed(
+                title=f"{zone['color_emoji']} {zone['header']} {zone['emoji']}",
+                description="\n".join(shift_lines),
+                color=0x2f3136  # Discord dark theme color for subtle separation
+            )
 
-                embeds.append(zone_embed)
+            embeds.append(zone_embed)
 
         # Add header embed at the beginning if we have zones
         if embeds:
@@ -459,13 +274,110 @@ class DiscordFormatter:
             embeds.insert(0, header_embed)
 
             # Add footer to last embed
-            pst = pytz.timezone('America/Los_Angeles')
-            now = datetime.now(pst)
-            timestamp_str = now.strftime("%-m/%-d at %-I:%M %p")
-            embeds[-1].set_footer(text=f"Total Shifts: {total_shifts} • Last Updated: {timestamp_str}")
+            timestamp_str = self._format_last_updated()
+            embeds[-1].set_footer(text=f"Total Shifts: {document['total_shifts']} • Last Updated: {timestamp_str}")
 
         return embeds
 
+    def get_last_refresh_time(self):
+        """
+        Get the ISO timestamp of the last data refresh, or None.
+        Storage backends override this.
+        """
+        return None
+
+    def _format_last_updated(self) -> str:
+        """
+        Format the footer "Last Updated" time.
+
+        Shows when the schedule data was last refreshed rather than when the embed
+        was rendered, so re-rendering unchanged data gives an identical embed and
+        posted displays only need editing when something actually changed.
+        """
+        pst = pytz.timezone('America/Los_Angeles')
+        last_refresh = self.get_last_refresh_time()
+        if last_refresh:
+            # Refresh times are stored as naive server-local timestamps
+            updated_at = datetime.fromisoformat(last_refresh).astimezone(pst)
+        else:
+            updated_at = datetime.now(pst)
+        return updated_at.strftime(TIMESTAMP_FORMAT)
+
+    def _format_time_range(self, time_str: str) -> str:
+        """Format a HHMM-HHMM time string as HH:MM-HH:MM"""
+        time_parts = time_str.split('-')
+        if len(time_parts) != 2:
+            return time_str
+
+        start, end = time_parts[0], time_parts[1]
+        if len(start) == 4:
+            start = f"{start[:2]}:{start[2:]}"
+        elif len(start) == 3:
+            start = f"0{start[0]}:{start[1:]}"
+        if len(end) == 4:
+            end = f"{end[:2]}:{end[2:]}"
+        elif len(end) == 3:
+            end = f"0{end[0]}:{end[1:]}"
+        return f"{start}-{end}"
+
+    def _format_person(self, slot: Dict) -> str:
+        """Build the scribe/provider string for a document slot"""
+        if slot.get('mlp'):
+            return f"**{slot['scribe_name']}** with {slot['mlp']}"
+        elif slot.get('physician'):
+            return f"**{slot['scribe_name']}** with {slot['physician']}"
+        return f"**{slot['scribe_name']}**"
+
+    def _build_zone_lines(self, zone_shifts: List[Dict], label_sep: str, indent: str) -> List[str]:
+        """
+        Build the display lines for one zone.
+        Groups consecutive shifts by the same scribe in the same label.
+        """
+        shift_lines = []
+        i = 0
+        while i < len(zone_shifts):
+            shift_data = zone_shifts[i]
+            current_label = shift_data['label']
+            current_scribe = shift_data['scribe_name']
+            current_person = self._format_person(shift_data)
+
+            # Collect all consecutive shifts with same label and scribe
+            consecutive_times = [shift_data['time_display']]
+            providers = [current_person]  # Track different providers for split shifts
+            j = i + 1
+            while j < len(zone_shifts):
+                next_shift = zone_shifts[j]
+                if next_shift['label'] == current_label and next_shift['scribe_name'] == current_scribe:
+                    consecutive_times.append(next_shift['time_display'])
+                    providers.append(self._format_person(next_shift))
+                    j += 1
+                else:
+                    break
+
+            # Format the shift line
+            if len(consecutive_times) == 1:
+                # Single shift
+                shift_lines.append(f"{current_label}{label_sep}{consecutive_times[0]} • {current_person}")
+            else:
+                # Multiple shifts - check if same provider or different
+                unique_providers = list(dict.fromkeys(providers))
+                if len(unique_providers) == 1:
+                    # Same provider for all shifts - just show times
+                    times_str = ", ".join(consecutive_times)
+                    shift_lines.append(f"{current_label}{label_sep}{times_str} • {current_person}")
+                else:
+                    # Different providers - show each time with provider
+                    for k, (time_display, provider) in enumerate(zip(consecutive_times, providers)):
+                        if k == 0:
+                            shift_lines.append(f"{current_label}{label_sep}{time_display} • {provider}")
+                        else:
+                            # Indent continuation shifts slightly
+                            shift_lines.append(f"{indent}{time_display} • {provider}")
+
+            i = j
+
+        return shift_lines
+
     def format_daily_schedule(self, target_date: str) -> list:
         """
         Format the schedule for a specific date using zone grouping.
@@ -481,6 +393,82 @@ class DiscordFormatter:
         embed = self.format_daily_schedule_combined(target_date)
         return [embed]
 
+    def get_shifts_active_at(self, ts: datetime) -> List[Dict]:
+        """
+        Get the scribe shifts on duty at a moment, with their paired providers.
+
+        Checks the previous day as well so overnight shifts that started
+        yesterday are included. Storage backends with an interval index
+        override this with a single query.
+
+        Args:
+            ts: Timezone-aware moment to check
+
+        Returns:
+            List of scribe shift dictionaries with extra 'physician' and 'mlp' keys,
+            sorted by label and start time
+        """
+        pst = pytz.timezone('America/Los_Angeles')
+        local_now = ts.astimezone(pst).replace(tzinfo=None)
+
+        active = []
+        for day_offset in (1, 0):
+            shift_date = (local_now - timedelta(days=day_offset)).strftime("%Y-%m-%d")
+            shifts = self.get_shifts_for_date(shift_date)
+            providers = None
+
+            for shift in shifts:
+                if shift['role'] != 'Scribe':
+                    continue
+
+                period = self._get_shift_period(shift['date'], shift['time'])
+                if period is None:
+                    continue
+
+                start_at, end_at = period
+                if start_at <= local_now < end_at:
+                    if providers is None:
+                        providers = ProviderIndex(shifts)
+                    physician, mlp = providers.find_providers(shift)
+                    active.append({**shift, 'physician': physician, 'mlp': mlp, 'start_at': start_at})
+
+        active.sort(key=lambda x: (x['label'], x['start_at']))
+        for shift in active:
+            del shift['start_at']
+        return active
+
+    def get_next_shift_boundary(self, ts: datetime) -> Optional[datetime]:
+        """
+        Get the next moment after ts at which a scribe shift starts or ends,
+        i.e. the next time the set of on-duty scribes can change.
+
+        Args:
+            ts: Timezone-aware moment to search from
+
+        Returns:
+            Timezone-aware (PST) datetime of the next boundary, or None if no
+            scribe shift starts or ends between now and the end of tomorrow
+        """
+        pst = pytz.timezone('America/Los_Angeles')
+        local_now = ts.astimezone(pst).replace(tzinfo=None)
+
+        next_boundary = None
+        for day_offset in (-1, 0, 1):
+            shift_date = (local_now + timedelta(days=day_offset)).strftime("%Y-%m-%d")
+            for shift in self.get_shifts_for_date(shift_date):
+                if shift['role'] != 'Scribe':
+                    continue
+
+                period = self._get_shift_period(shift['date'], shift['time'])
+                if period is None:
+                    continue
+
+                for moment in period:
+                    if moment > local_now and (next_boundary is None or moment < next_boundary):
+                        next_boundary = moment
+
+        return pst.localize(next_boundary) if next_boundary else None
+
     def format_current_schedule(self) -> discord.Embed:
         """
         Format the current shifts happening right now as a Discord Embed.
@@ -488,176 +476,77 @@ class DiscordFormatter:
         Returns:
             discord.Embed object showing who's currently working
         """
-        import pytz
-
         # Get current time in PST (since shifts are in PST)
         pst = pytz.timezone('America/Los_Angeles')
         now = datetime.now(pst)
         current_date = now.strftime("%Y-%m-%d")
-        current_time_24hr = now.strftime("%H%M")
-        current_minutes = int(current_time_24hr[:2]) * 60 + int(current_time_24hr[2:])
-
-        shifts = self.get_shifts_for_date(current_date)
-
-        # Zone color indicators
-        zone_indicators = {
-            'A': '🟥 (Zone 2) →',
-            'E': '🟥 (Zone 2) →',
-            'I': '🟥 (Zone 2) →',
-            'B': '🟦 (Zone 1) →',
-            'F': '🟦 (Zone 1) →',
-            'X': '🟦 (Zone 1) →',
-            'C': '🟨 (Zone 3/4) →',
-            'G': '🟨 (Zone 3/4) →',
-            'D': '🟪 (Fast Track) →',
-            'H': '🟪 (Fast Track) →',
-            'PIT': '🟫 (Overflow) →',
-            'PA': '🟩 (Fast Track) →',
-        }
 
         embed = discord.Embed(
             title="😷 Currently Scribbling 😷",
-            description=f"🕐 {now.strftime('%I:%M %p PST')} • {now.strftime('%A, %B %d, %Y')}",
+            description=f"📅 {now.strftime('%A, %B %d, %Y')}",
             color=0xff0000,  # Red
         )
 
-        if not shifts:
+        active_shifts = self.get_shifts_active_at(now)
+
+        if not active_shifts and not self.get_daily_schedule_document(current_date)['shift_count']:
             embed.add_field(name="Status", value="No scheduled shifts today", inline=False)
             return embed
 
-        current_shifts = []
-        processed_indices = set()
-
-        for i, shift in enumerate(shifts):
-            if shift['role'] == 'Scribe' and i not in processed_indices:
-                # Parse shift time
-                time_parts = shift['time'].split('-')
-                if len(time_parts) != 2:
-                    continue
-
-                start_time = time_parts[0]
-                end_time = time_parts[1]
-
-                # Convert to minutes
-                def to_minutes(time_str):
-                    if len(time_str) == 4:
-                        h = int(time_str[:2])
-                        m = int(time_str[2:])
-                    elif len(time_str) == 3:
-                        h = int(time_str[0])
-                        m = int(time_str[1:])
-                    else:
-                        return None
-                    return h * 60 + m
-
-                start_minutes = to_minutes(start_time)
-                end_minutes = to_minutes(end_time)
-
-                if start_minutes is None or end_minutes is None:
-                    continue
-
-                # Handle overnight shifts (end time < start time)
-                if end_minutes < start_minutes:
-                    end_minutes += 24 * 60
-                    # If current time is before start, add 24 hours
-                    check_minutes = current_minutes if current_minutes >= start_minutes else current_minutes + 24 * 60
-                else:
-                    check_minutes = current_minutes
-
-                # Check if current time is within shift
-                if start_minutes <= check_minutes < end_minutes:
-                    # Find matching physician/MLP
-                    physician = None
-                    mlp = None
-                    is_pa_shift = shift['label'] == 'PA'
-
-                    for j, other in enumerate(shifts):
-                        if other['date'] == shift['date']:
-                            if is_pa_shift and other['role'] == 'MLP':
-                                match_time = self._times_overlap_or_close(shift['time'], other['time'])
-                                if match_time:
-                                    mlp = other['person']
-                            else:
-                                if other['time'] == shift['time'] and other['label'] == shift['label']:
-                                    if other['role'] == 'Physician':
-                                        physician = other['person']
-
-                    # Format time display
-                    if len(start_time) == 4:
-                        start_display = f"{start_time[:2]}:{start_time[2:]}"
-                    else:
-                        start_display = f"0{start_time[0]}:{start_time[1:]}"
-                    if len(end_time) == 4:
-                        end_display = f"{end_time[:2]}:{end_time[2:]}"
-                    else:
-                        end_display = f"0{end_time[0]}:{end_time[1:]}"
-                    time_display = f"{start_display}-{end_display}"
-
-                    # Build field value
-                    if mlp:
-                        value = f"**{shift['person']}** with {mlp}"
-                    elif physician:
-                        value = f"**{shift['person']}** with {physician}"
-                    else:
-                        value = f"**{shift['person']}**"
-
-                    current_shifts.append((shift['label'], time_display, value))
-                    processed_indices.add(i)
-
-        if not current_shifts:
+        if not active_shifts:
             embed.add_field(name="Status", value="No one is currently on shift", inline=False)
         else:
-            # Sort by label
-            current_shifts.sort(key=lambda x: x[0])
-
-            for label, time_display, value in current_shifts:
-                indicator = zone_indicators.get(label, '⬜')
+            for shift in active_shifts:
+                label = shift['label']
+                time_display = self._format_time_range(shift['time'])
+                value = self._format_person({**shift, 'scribe_name': shift['person']})
+                indicator = zone_indicator(label)
                 embed.add_field(
                     name=f"{indicator} {label} {time_display}",
                     value=value,
                     inline=False
                 )
 
-        pst = pytz.timezone('America/Los_Angeles')
-        now = datetime.now(pst)
-        timestamp_str = now.strftime("%-m/%-d at %-I:%M %p")
-        embed.set_footer(text=f"Active Shifts: {len(current_shifts)} • Auto 10m • Last Updated: {timestamp_str}")
+        timestamp_str = self._format_last_updated()
+        embed.set_footer(text=f"Active Shifts: {len(active_shifts)} • Updates at shift changes • Last Updated: {timestamp_str}")
 
         return embed
 
-    def _times_overlap_or_close(self, time1: str, time2: str, tolerance_minutes: int = 60) -> bool:
+    def _get_shift_period(self, date_str: str, time_str: str):
         """
-        Check if two shift times overlap or start within tolerance of each other.
-        For PA matching: scribe 1000-1830 should match MLP 1000-2000
-
-        Args:
-            time1: First time string (format: HHMM-HHMM)
-            time2: Second time string (format: HHMM-HHMM)
-            tolerance_minutes: Minutes of tolerance for start time matching
+        Convert a shift date and HHMM-HHMM time into local (start, end) datetimes.
+        Overnight shifts (end before start) end on the following day.
 
         Returns:
-            True if times are close enough to match
-        """
-        try:
-            # Parse times (format: HHMM-HHMM)
-            start1, end1 = time1.split('-')
-            start2, end2 = time2.split('-')
-
-            # Convert to minutes for comparison
-            def to_minutes(time_str):
-                # Handle both 3 and 4 digit times
-                if len(time_str) == 3:
-                    h = int(time_str[0])
-                    m = int(time_str[1:])
-                else:
-                    h = int(time_str[:2])
-                    m = int(time_str[2:])
-                return h * 60 + m
-
-            s1 = to_minutes(start1)
-            s2 = to_minutes(start2)
-
-            # Check if start times are within tolerance
-            return abs(s1 - s2) <= tolerance_minutes
-        except:
-            return False
+            Tuple of naive (start, end) datetimes, or None if the time can't be parsed
+        """
+        time_parts = time_str.split('-')
+        if len(time_parts) != 2:
+            return None
+
+        # Convert to minutes
+        def to_minutes(time_str):
+            if len(time_str) == 4:
+                h = int(time_str[:2])
+                m = int(time_str[2:])
+            elif len(time_str) == 3:
+                h = int(time_str[0])
+                m = int(time_str[1:])
+            else:
+                return None
+            return h * 60 + m
+
+        start_minutes = to_minutes(time_parts[0])
+        end_minutes = to_minutes(time_parts[1])
+        if start_minutes is None or end_minutes is None:
+            return None
+
+        # Handle overnight shifts (end time < start time)
+        if end_minutes < start_minutes:
+            end_minutes += 24 * 60
+
+        day_start = datetime.strptime(date_str, "%Y-%m-%d")
+        return (
+            day_start + timedelta(minutes=start_minutes),
+            day_start + timedelta(minutes=end_minutes)
+        )
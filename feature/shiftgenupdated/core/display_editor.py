@@ -0,0 +1,123 @@
+"""
+Concurrent, coalescing editor for posted Discord display messages
+"""
+import asyncio
+import hashlib
+import json
+from typing import Dict
+
+import discord
+
+
+def embed_hash(embed: discord.Embed) -> str:
+    """Content hash of an embed as Discord would receive it"""
+    return hashlib.sha256(json.dumps(embed.to_dict(), sort_keys=True).encode()).hexdigest()
+
+
+class DisplayEditor:
+    """
+    Edits posted display messages through partial message handles.
+
+    - No fetch_message: edits go straight to PATCH via channel.get_partial_message.
+    - Unchanged embeds (same content hash as the last one sent) are skipped.
+    - Edits to the same message are coalesced: while one is in flight, newer
+      requests replace the queued embed, so only the latest is sent next.
+    - Edits to different messages run concurrently. Edits in the same channel
+      share a Discord rate-limit route, so they are sent one at a time per
+      channel, and max_concurrent caps requests across channels.
+    """
+
+    def __init__(self, max_concurrent: int = 8):
+        """
+        Args:
+            max_concurrent: Maximum edit requests in flight across all channels
+        """
+        self.hashes: Dict[int, str] = {}  # message_id -> hash of the embed last sent
+        self.sent = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self._queued: Dict[int, Dict] = {}  # message_id -> edit waiting to be sent
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._channel_locks: Dict[int, asyncio.Lock] = {}
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    def remember(self, message_id: int, embed: discord.Embed) -> None:
+        """Record the embed a message was just posted with"""
+        self.hashes[message_id] = embed_hash(embed)
+
+    def forget(self, message_id: int) -> None:
+        """Drop state for a message that no longer exists"""
+        self.hashes.pop(message_id, None)
+
+    async def edit(self, channel, message_id: int, embed: discord.Embed) -> bool:
+        """
+        Show embed on a posted message, editing only if its content changed.
+
+        Args:
+            channel: Channel the message was posted in
+            message_id: ID of the posted message
+            embed: Embed the message should show
+
+        Returns:
+            True once the message shows embed (or a newer one) after an edit,
+            False if the edit was skipped because the message already shows it
+
+        Raises:
+            discord.NotFound: If the message was deleted
+        """
+        content_hash = embed_hash(embed)
+        entry = self._queued.get(message_id)
+
+        if entry is None:
+            if self.hashes.get(message_id) == content_hash and message_id not in self._workers:
+                self.skipped += 1
+                return False
+            entry = self._queued[message_id] = {'done': asyncio.get_running_loop().create_future()}
+        else:
+            # Replace the queued embed; both callers wait for the same edit
+            self.coalesced += 1
+
+        entry.update(channel=channel, embed=embed, hash=content_hash)
+
+        if message_id not in self._workers:
+            self._workers[message_id] = asyncio.create_task(self._send_queued(message_id))
+
+        return await asyncio.shield(entry['done'])
+
+    async def _send_queued(self, message_id: int) -> None:
+        """Send the latest queued edit for a message until none are left"""
+        try:
+            while message_id in self._queued:
+                entry = self._queued.pop(message_id)
+                channel = entry['channel']
+
+                if self.hashes.get(message_id) == entry['hash']:
+                    # Superseded by an embed identical to what's already shown
+                    self.skipped += 1
+                    entry['done'].set_result(False)
+                    continue
+
+                lock = self._channel_locks.setdefault(channel.id, asyncio.Lock())
+                try:
+                    async with lock, self._slots:
+                        await channel.get_partial_message(message_id).edit(embed=entry['embed'])
+                except Exception as e:
+                    if isinstance(e, discord.NotFound):
+                        self.forget(message_id)
+                    entry['done'].set_exception(e)
+                    continue
+
+                self.hashes[message_id] = entry['hash']
+                self.sent += 1
+                entry['done'].set_result(True)
+        finally:
+            del self._workers[message_id]
+
+    def get_stats(self) -> Dict:
+        """Return sent/skipped/coalesced counters for monitoring"""
+        return {
+            'sent': self.sent,
+            'skipped': self.skipped,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._workers)
+        }
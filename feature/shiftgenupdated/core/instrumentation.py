@@ -0,0 +1,217 @@
+"""
+Timing and row-count instrumentation for the storage layer
+"""
+import functools
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from .config import SLOW_QUERY_THRESHOLD_MS
+
+
+class LatencyHistogram:
+    """
+    Fixed-size latency histogram with log-spaced buckets.
+
+    Bucket upper bounds grow by 2**(1/4) (~19%) from 0.1 ms to about a minute,
+    so percentiles are accurate to within one bucket without keeping samples.
+    """
+
+    MIN_MS = 0.1
+    STEPS_PER_DOUBLING = 4
+    BUCKET_COUNT = 80
+
+    def __init__(self):
+        self.counts = [0] * (self.BUCKET_COUNT + 1)  # last bucket catches everything slower
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+
+    def _bucket(self, duration_ms: float) -> int:
+        if duration_ms <= self.MIN_MS:
+            return 0
+        index = math.ceil(math.log2(duration_ms / self.MIN_MS) * self.STEPS_PER_DOUBLING)
+        return min(index, self.BUCKET_COUNT)
+
+    def _upper_bound(self, index: int) -> float:
+        return self.MIN_MS * 2 ** (index / self.STEPS_PER_DOUBLING)
+
+    def record(self, duration_ms: float, rows: Optional[int] = None) -> None:
+        """Add one call to the histogram"""
+        self.counts[self._bucket(duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if rows:
+            self.rows += rows
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a latency percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Upper bound (ms) of the bucket containing the percentile, capped at the max seen
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(self._upper_bound(index), self.max_ms)
+        return self.max_ms
+
+
+class QueryMetrics:
+    """
+    Per-method latency histograms and a slow-call log for a storage backend.
+
+    Calls slower than slow_threshold_ms are passed to on_slow (if set) with the
+    method name and a redacted description of the arguments.
+    """
+
+    def __init__(self, slow_threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, slow_log_size: int = 50):
+        """
+        Args:
+            slow_threshold_ms: Calls at or above this duration are logged as slow
+            slow_log_size: Number of recent slow calls kept in memory
+        """
+        self.slow_threshold_ms = slow_threshold_ms
+        self.on_slow: Optional[Callable[[Dict], None]] = None
+        self.slow_calls = deque(maxlen=slow_log_size)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, duration_ms: float, rows: Optional[int] = None,
+               params: str = "", failed: bool = False) -> None:
+        """Record one storage call"""
+        with self._lock:
+            histogram = self._histograms.get(method)
+            if histogram is None:
+                histogram = self._histograms[method] = LatencyHistogram()
+            histogram.record(duration_ms, rows)
+
+        if duration_ms >= self.slow_threshold_ms:
+            entry = {
+                'method': method,
+                'duration_ms': duration_ms,
+                'rows': rows,
+                'params': params,
+                'failed': failed
+            }
+            self.slow_calls.append(entry)
+            if self.on_slow:
+                try:
+                    self.on_slow(entry)
+                except Exception as e:
+                    print(f"Warning: Failed to report slow query: {e}")
+
+    def get_stats(self) -> List[Dict]:
+        """
+        Return per-method latency statistics, slowest total time first.
+
+        Returns:
+            List of {'method', 'count', 'rows', 'total_ms', 'max_ms', 'p50', 'p95', 'p99'}
+        """
+        with self._lock:
+            stats = [
+                {
+                    'method': method,
+                    'count': histogram.count,
+                    'rows': histogram.rows,
+                    'total_ms': histogram.total_ms,
+                    'max_ms': histogram.max_ms,
+                    'p50': histogram.percentile(50),
+                    'p95': histogram.percentile(95),
+                    'p99': histogram.percentile(99)
+                }
+                for method, histogram in self._histograms.items()
+            ]
+        return sorted(stats, key=lambda s: s['total_ms'], reverse=True)
+
+    def reset(self) -> None:
+        """Clear all histograms and the slow-call log"""
+        with self._lock:
+            self._histograms.clear()
+            self.slow_calls.clear()
+
+
+def redact_params(args: tuple, kwargs: dict) -> str:
+    """
+    Describe call arguments without their values (shift data contains names).
+    Collections are shown with their size, everything else by type.
+    """
+    def describe(value) -> str:
+        if isinstance(value, (list, tuple, set, dict)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    parts = [describe(arg) for arg in args]
+    parts += [f"{key}={describe(value)}" for key, value in kwargs.items()]
+    return ", ".join(parts)
+
+
+def _count_rows(method_name: str, result) -> Optional[int]:
+    """
+    Derive a row count from a storage method's return value: list lengths,
+    the first element of tuple results, and integer results of write methods.
+    """
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, int) and not isinstance(result, bool) and not method_name.startswith('get_'):
+        return result
+    return None
+
+
+# Bookkeeping methods that don't touch the database
+UNINSTRUMENTED_METHODS = {'close', 'get_cache_stats', 'get_query_stats'}
+
+
+def instrument_storage(cls):
+    """
+    Class decorator wrapping every public method defined on a storage class
+    with timing and row-count instrumentation.
+
+    The instance must provide a query_metrics attribute (QueryMetrics); calls
+    made before it is set are not recorded.
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith('_') or name in UNINSTRUMENTED_METHODS:
+            continue
+        if not callable(attr) or isinstance(attr, (staticmethod, classmethod)):
+            continue
+        setattr(cls, name, _instrument_method(name, attr))
+    return cls
+
+
+def _instrument_method(name: str, method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = getattr(self, 'query_metrics', None)
+        if metrics is None:
+            return method(self, *args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception:
+            duration_ms = (time.perf_counter() - start) * 1000
+            metrics.record(name, duration_ms, params=redact_params(args, kwargs), failed=True)
+            raise
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        # Only describe the arguments when the call will be logged as slow
+        params = redact_params(args, kwargs) if duration_ms >= metrics.slow_threshold_ms else ""
+        metrics.record(name, duration_ms, _count_rows(name, result), params)
+        return result
+
+    return wrapper
@@ -0,0 +1,71 @@
+"""
+Schedule display layout, compiled once from config at import
+"""
+import hashlib
+import json
+import platform
+from typing import Dict, List
+
+from .config import ZONE_HEADER_TEMPLATE, ZONE_LAYOUT
+
+
+# Indicator for labels that aren't in any zone
+UNKNOWN_ZONE_INDICATOR = '⬜'
+
+
+def compile_zone_layout(layout: List[Dict], header_template: str) -> List[Dict]:
+    """
+    Compile the zone layout config into render-ready zones.
+
+    Args:
+        layout: Zone definitions (see ZONE_LAYOUT in config)
+        header_template: Format string for zone headers, with a {name} field
+
+    Returns:
+        List of zone dictionaries in display order, each with 'name', 'emoji',
+        'color_emoji', 'header', 'indicator' and 'labels'
+
+    Raises:
+        ValueError: If a label is assigned to more than one zone
+    """
+    zones = []
+    seen_labels = {}
+    for zone in layout:
+        for label in zone['labels']:
+            if label in seen_labels:
+                raise ValueError(
+                    f"Label {label} is in both {seen_labels[label]} and {zone['name']} zones"
+                )
+            seen_labels[label] = zone['name']
+
+        zones.append({
+            'name': zone['name'],
+            'emoji': zone['emoji'],
+            'color_emoji': zone['color_emoji'],
+            'header': header_template.format(name=zone['name']),
+            'indicator': f"{zone['color_emoji']} ({zone['short_name']}) →",
+            'labels': tuple(zone['labels'])
+        })
+    return zones
+
+
+ZONES = compile_zone_layout(ZONE_LAYOUT, ZONE_HEADER_TEMPLATE)
+
+# Label -> compiled zone, shared by the daily and current views
+LABEL_ZONES = {label: zone for zone in ZONES for label in zone['labels']}
+
+# Changes whenever the layout config does, so stored schedule documents get rebuilt
+LAYOUT_FINGERPRINT = hashlib.sha256(
+    json.dumps(ZONES, sort_keys=True, ensure_ascii=False).encode()
+).hexdigest()[:12]
+
+# strftime flag for unpadded numbers differs on Windows
+_NO_PAD = '#' if platform.system() == 'Windows' else '-'
+DATE_FORMAT = f"%{_NO_PAD}m/%{_NO_PAD}d/%Y"
+TIMESTAMP_FORMAT = f"%{_NO_PAD}m/%{_NO_PAD}d at %{_NO_PAD}I:%M %p"
+
+
+def zone_indicator(label: str) -> str:
+    """Get the color/zone prefix shown before a label in the current shifts view"""
+    zone = LABEL_ZONES.get(label)
+    return zone['indicator'] if zone else UNKNOWN_ZONE_INDICATOR
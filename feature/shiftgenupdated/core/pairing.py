@@ -0,0 +1,113 @@
+"""
+Scribe to provider pairing for schedule displays
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def parse_start_minutes(time_str: str) -> Optional[int]:
+    """
+    Get the start of an HHMM-HHMM (or HMM-HHMM) shift time as minutes after midnight.
+
+    Returns:
+        Minutes after midnight, or None if the time can't be parsed
+    """
+    try:
+        start, _end = time_str.split('-')
+        if len(start) == 3:
+            return int(start[0]) * 60 + int(start[1:])
+        return int(start[:2]) * 60 + int(start[2:])
+    except (ValueError, AttributeError):
+        return None
+
+
+class ProviderIndex:
+    """
+    Index of provider shifts used to pair scribes with their physician or MLP.
+
+    Physicians are keyed by their exact (date, time, label) slot. MLPs are grouped
+    into start-minute buckets one tolerance wide, so a PA scribe only compares
+    against MLPs in its own and the two neighbouring buckets. Building the index
+    and pairing every scribe is linear in the number of shifts.
+
+    When several providers match, the one with the highest (label, time, person)
+    wins, independent of input order. For input sorted by date, label and time
+    this is the same provider the original pairing loop picked (the last match).
+    """
+
+    def __init__(self, shifts: Iterable[Dict], tolerance_minutes: int = 60):
+        """
+        Args:
+            shifts: Shifts of any role, possibly spanning several dates
+            tolerance_minutes: Maximum start time difference for PA scribe/MLP pairs
+        """
+        self.tolerance_minutes = tolerance_minutes
+        self._physicians: Dict[tuple, tuple] = {}
+        self._mlp_buckets: Dict[tuple, List[tuple]] = {}
+
+        for shift in shifts:
+            role = shift['role']
+            if role == 'Physician':
+                key = (shift['date'], shift['time'], shift['label'])
+                candidate = (shift['label'], shift['time'], shift['person'])
+                current = self._physicians.get(key)
+                if current is None or candidate > current:
+                    self._physicians[key] = candidate
+            elif role == 'MLP':
+                start = parse_start_minutes(shift['time'])
+                if start is None:
+                    continue
+                bucket = (shift['date'], start // tolerance_minutes)
+                self._mlp_buckets.setdefault(bucket, []).append(
+                    (start, shift['label'], shift['time'], shift['person'])
+                )
+
+    def find_physician(self, shift: Dict) -> Optional[str]:
+        """Get the physician working the same (date, time, label) slot as a scribe shift"""
+        match = self._physicians.get((shift['date'], shift['time'], shift['label']))
+        return match[2] if match else None
+
+    def find_mlp(self, shift: Dict) -> Optional[str]:
+        """Get the MLP starting within tolerance of a PA scribe shift on the same date"""
+        start = parse_start_minutes(shift['time'])
+        if start is None:
+            return None
+
+        best = None
+        bucket = start // self.tolerance_minutes
+        for neighbour in (bucket - 1, bucket, bucket + 1):
+            for mlp_start, label, time, person in self._mlp_buckets.get((shift['date'], neighbour), ()):
+                if abs(mlp_start - start) <= self.tolerance_minutes:
+                    candidate = (label, time, person)
+                    if best is None or candidate > best:
+                        best = candidate
+        return best[2] if best else None
+
+    def find_providers(self, shift: Dict) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the providers paired with a scribe shift.
+        Only PA scribes are paired with MLPs.
+
+        Returns:
+            Tuple of (physician, mlp) names, either of which may be None
+        """
+        mlp = self.find_mlp(shift) if shift['label'] == 'PA' else None
+        return self.find_physician(shift), mlp
+
+
+def pair_scribe_shifts(shifts: List[Dict], tolerance_minutes: int = 60) -> List[Tuple[Dict, Optional[str], Optional[str]]]:
+    """
+    Pair every scribe shift with its physician and MLP.
+
+    Args:
+        shifts: Shifts of any role
+        tolerance_minutes: Maximum start time difference for PA scribe/MLP pairs
+
+    Returns:
+        List of (scribe_shift, physician, mlp) in input order
+    """
+    index = ProviderIndex(shifts, tolerance_minutes)
+    return [
+        (shift, *index.find_providers(shift))
+        for shift in shifts
+        if shift['role'] == 'Scribe'
+    ]
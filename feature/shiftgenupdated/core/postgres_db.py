@@ -1,19 +1,27 @@
 """
 PostgreSQL database manager for shift schedules
 """
+import io
 import os
-import hashlib
-from datetime import datetime
+import gzip
+from collections import Counter
+from datetime import date, datetime
 from typing import List, Dict, Optional
+import pytz
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor, Json, execute_values
 from dotenv import load_dotenv
 
 from .models import Shift, ParsedScheduleData
 from .name_mapper import NameMapper
-from .discord_formatter import DiscordFormatter
+from .discord_formatter import DiscordFormatter, SCHEDULE_DOCUMENT_VERSION
+from .cache import GenerationCache
+from .instrumentation import QueryMetrics, instrument_storage
+from .config import SHIFT_RETENTION_MONTHS, BACKUP_FULL_INTERVAL_DAYS
 
 
+@instrument_storage
 class PostgresDatabase(DiscordFormatter):
     """PostgreSQL database manager with connection pooling and error handling"""
 
@@ -31,12 +39,21 @@ class PostgresDatabase(DiscordFormatter):
         """
         load_dotenv()
         self.name_mapper = name_mapper or NameMapper()
+        # Per-method latency histograms and slow-call log (see instrument_storage)
+        self.query_metrics = QueryMetrics()
         self.connection = None
+        # Read-through cache for get_shifts_for_date, keyed by date and refresh generation
+        self.shift_cache = GenerationCache(max_size=32)
         self._connect()
         self._initialize_schema()
-
-    def _connect(self):
-        """Establish database connection"""
+        self.shift_cache.set_generation(self.get_refresh_generation())
+        self.last_changed_dates: List[str] = []
+        # Changed slots per date (YYYY-MM-DD) in the last update_data call
+        self.last_change_counts: Dict[str, int] = {}
+        self._sync_daily_schedules()
+
+    def _open_connection(self):
+        """Open a new database connection from the environment"""
         # Try DATABASE_URL first (Railway provides this)
         database_url = os.getenv('DATABASE_URL')
 
@@ -44,17 +61,20 @@ class PostgresDatabase(DiscordFormatter):
             # Railway sometimes provides postgres:// instead of postgresql://
             if database_url.startswith('postgres://'):
                 database_url = database_url.replace('postgres://', 'postgresql://', 1)
-            self.connection = psycopg2.connect(database_url)
-        else:
-            # Fall back to individual components
-            self.connection = psycopg2.connect(
-                host=os.getenv('POSTGRES_HOST', 'localhost'),
-                port=os.getenv('POSTGRES_PORT', '5432'),
-                database=os.getenv('POSTGRES_DB', 'shiftgen'),
-                user=os.getenv('POSTGRES_USER', 'postgres'),
-                password=os.getenv('POSTGRES_PASSWORD', '')
-            )
+            return psycopg2.connect(database_url)
+
+        # Fall back to individual components
+        return psycopg2.connect(
+            host=os.getenv('POSTGRES_HOST', 'localhost'),
+            port=os.getenv('POSTGRES_PORT', '5432'),
+            database=os.getenv('POSTGRES_DB', 'shiftgen'),
+            user=os.getenv('POSTGRES_USER', 'postgres'),
+            password=os.getenv('POSTGRES_PASSWORD', '')
+        )
 
+    def _connect(self):
+        """Establish database connection"""
+        self.connection = self._open_connection()
         self.connection.autocommit = False
 
     def _ensure_connection(self):
@@ -78,9 +98,24 @@ class PostgresDatabase(DiscordFormatter):
     def _initialize_schema(self):
         """Create database tables if they don't exist"""
         schema = """
-        -- Shifts table
+        -- Local start/end of a shift as a timestamp range (overnight shifts end the next day)
+        CREATE OR REPLACE FUNCTION shift_period(shift_date DATE, shift_time TEXT)
+        RETURNS TSTZRANGE AS $$
+            SELECT tstzrange(
+                (shift_date + make_time(t.s / 100, t.s % 100, 0))
+                    AT TIME ZONE 'America/Los_Angeles',
+                (shift_date + CASE WHEN t.e < t.s THEN 1 ELSE 0 END + make_time(t.e / 100, t.e % 100, 0))
+                    AT TIME ZONE 'America/Los_Angeles'
+            )
+            FROM (
+                SELECT split_part(shift_time, '-', 1)::int AS s,
+                       split_part(shift_time, '-', 2)::int AS e
+            ) t
+        $$ LANGUAGE SQL IMMUTABLE;
+
+        -- Shifts table, range-partitioned by month (see _ensure_partitions)
         CREATE TABLE IF NOT EXISTS shifts (
-            id SERIAL PRIMARY KEY,
+            id SERIAL,
             date DATE NOT NULL,
             label VARCHAR(50) NOT NULL,
             time VARCHAR(20) NOT NULL,
@@ -89,11 +124,27 @@ class PostgresDatabase(DiscordFormatter):
             site VARCHAR(255) NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(date, label, time, person, role)
+            period TSTZRANGE GENERATED ALWAYS AS (shift_period(date, time)) STORED,
+            PRIMARY KEY (id, date)
+        ) PARTITION BY RANGE (date);
+
+        -- One person per (date, label, time, role) slot, enforced at write time.
+        -- Also serves the daily query as a covering index (date lookup, ordered by slot).
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_shifts_slot
+            ON shifts(date, label, time, role) INCLUDE (person, site);
+
+        -- Interval index for "who is on now" lookups
+        CREATE INDEX IF NOT EXISTS idx_shifts_period ON shifts USING GIST (period);
+
+        -- Archived months detached from shifts, stored as gzip-compressed CSV
+        CREATE TABLE IF NOT EXISTS shift_archive (
+            month DATE PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            data BYTEA NOT NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
 
         -- Index for faster queries
-        CREATE INDEX IF NOT EXISTS idx_shifts_date ON shifts(date);
         CREATE INDEX IF NOT EXISTS idx_shifts_role ON shifts(role);
         CREATE INDEX IF NOT EXISTS idx_shifts_person ON shifts(person);
 
@@ -104,37 +155,297 @@ class PostgresDatabase(DiscordFormatter):
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
 
-        -- Table to track alerted changes to prevent duplicate alerts
-        CREATE TABLE IF NOT EXISTS alerted_changes (
-            id SERIAL PRIMARY KEY,
-            change_hash VARCHAR(255) UNIQUE NOT NULL,
+        -- Append-only log of slot changes written by each refresh. Alerts are
+        -- posted by reading entries after the alert_cursor stored in metadata.
+        CREATE TABLE IF NOT EXISTS shift_changes (
+            seq BIGSERIAL PRIMARY KEY,
+            generation BIGINT NOT NULL,
             change_type VARCHAR(20) NOT NULL,
             date DATE NOT NULL,
             label VARCHAR(50) NOT NULL,
             time VARCHAR(20) NOT NULL,
+            role VARCHAR(50) NOT NULL,
             old_person VARCHAR(255),
             new_person VARCHAR(255),
-            site VARCHAR(255) NOT NULL,
-            alerted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            old_site VARCHAR(255),
+            new_site VARCHAR(255),
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
 
         -- Index for cleanup queries
-        CREATE INDEX IF NOT EXISTS idx_alerted_changes_date ON alerted_changes(date);
+        CREATE INDEX IF NOT EXISTS idx_shift_changes_changed_at ON shift_changes(changed_at);
+
+        -- Replaced by shift_changes
+        DROP TABLE IF EXISTS alerted_changes;
+
+        -- NOTIFY listeners with the dates touched by any write to shifts, including
+        -- other processes. update_data() suppresses this and sends only dates whose
+        -- content actually changed.
+        CREATE OR REPLACE FUNCTION notify_shift_changes() RETURNS trigger AS $$
+        DECLARE
+            changed_dates TEXT;
+        BEGIN
+            IF current_setting('shiftgen.suppress_notify', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP = 'INSERT' THEN
+                SELECT string_agg(DISTINCT date::text, ',') INTO changed_dates FROM new_rows;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT string_agg(DISTINCT date::text, ',') INTO changed_dates FROM old_rows;
+            ELSE
+                SELECT string_agg(DISTINCT date::text, ',') INTO changed_dates
+                FROM (SELECT date FROM old_rows UNION SELECT date FROM new_rows) d;
+            END IF;
+
+            IF changed_dates IS NOT NULL THEN
+                -- NOTIFY payloads are limited to 8000 bytes
+                IF length(changed_dates) > 7900 THEN
+                    changed_dates := '*';
+                END IF;
+                PERFORM pg_notify('shift_updates', changed_dates);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS shifts_notify_insert ON shifts;
+        CREATE TRIGGER shifts_notify_insert AFTER INSERT ON shifts
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_shift_changes();
+        DROP TRIGGER IF EXISTS shifts_notify_update ON shifts;
+        CREATE TRIGGER shifts_notify_update AFTER UPDATE ON shifts
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_shift_changes();
+        DROP TRIGGER IF EXISTS shifts_notify_delete ON shifts;
+        CREATE TRIGGER shifts_notify_delete AFTER DELETE ON shifts
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_shift_changes();
+
+        -- Shift state as of the last uploaded backup (base for delta backups)
+        CREATE TABLE IF NOT EXISTS backup_state (
+            date DATE NOT NULL,
+            label VARCHAR(50) NOT NULL,
+            time VARCHAR(20) NOT NULL,
+            role VARCHAR(50) NOT NULL,
+            person VARCHAR(255) NOT NULL,
+            site VARCHAR(255) NOT NULL,
+            PRIMARY KEY (date, label, time, role)
+        );
+
+        -- Shift state captured by a backup that hasn't been confirmed yet
+        CREATE TABLE IF NOT EXISTS backup_pending (LIKE backup_state INCLUDING ALL);
+
+        -- Denormalized per-day schedule documents, rebuilt incrementally on refresh
+        CREATE TABLE IF NOT EXISTS daily_schedule (
+            date DATE PRIMARY KEY,
+            document JSONB NOT NULL,
+            content_hash VARCHAR(64) NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Single-row summary of shifts, rewritten by every transaction that changes
+        -- shifts so guards and health checks never have to scan the table
+        CREATE TABLE IF NOT EXISTS shift_stats (
+            id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+            record_count INTEGER NOT NULL DEFAULT 0,
+            min_date DATE,
+            max_date DATE,
+            role_counts JSONB NOT NULL DEFAULT '{}',
+            site_counts JSONB NOT NULL DEFAULT '{}',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
         """
 
         try:
             with self.connection.cursor() as cursor:
+                legacy_table = self._detach_unpartitioned_shifts(cursor)
                 cursor.execute(schema)
+
+                if legacy_table:
+                    self._copy_legacy_shifts(cursor, legacy_table)
+
+                # Keep the current and upcoming months ready for inserts
+                month_start = date.today().replace(day=1)
+                self._ensure_partitions(cursor, [
+                    month_start,
+                    self._add_months(month_start, 1),
+                    self._add_months(month_start, 2)
+                ])
+
+                # Start alerting from the current end of the change log
+                cursor.execute("""
+                    INSERT INTO metadata (key, value, updated_at)
+                    SELECT 'alert_cursor', COALESCE(MAX(seq), 0)::text, CURRENT_TIMESTAMP
+                    FROM shift_changes
+                    ON CONFLICT (key) DO NOTHING
+                """)
                 self.connection.commit()
         except Exception as e:
             self.connection.rollback()
             raise Exception(f"Failed to initialize database schema: {e}")
 
+    def _detach_unpartitioned_shifts(self, cursor) -> Optional[str]:
+        """
+        Move a pre-partitioning shifts table out of the way so the partitioned
+        table can be created under the same name.
+
+        Returns:
+            Name of the renamed legacy table, or None if no migration is needed
+        """
+        cursor.execute("""
+            SELECT c.relkind
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = 'shifts' AND n.nspname = current_schema()
+        """)
+        result = cursor.fetchone()
+        if not result or result[0] != 'r':
+            return None
+
+        # Index and constraint names are schema-wide, so drop them before the rename
+        cursor.execute("""
+            ALTER TABLE shifts DROP CONSTRAINT IF EXISTS shifts_pkey;
+            ALTER TABLE shifts DROP CONSTRAINT IF EXISTS shifts_date_label_time_person_role_key;
+            DROP INDEX IF EXISTS idx_shifts_slot;
+            DROP INDEX IF EXISTS idx_shifts_period;
+            DROP INDEX IF EXISTS idx_shifts_date;
+            DROP INDEX IF EXISTS idx_shifts_role;
+            DROP INDEX IF EXISTS idx_shifts_person;
+            ALTER TABLE shifts RENAME TO shifts_unpartitioned;
+        """)
+        return 'shifts_unpartitioned'
+
+    def _copy_legacy_shifts(self, cursor, legacy_table: str) -> None:
+        """Copy rows from the legacy table into the partitioned table and drop it"""
+        legacy = sql.Identifier(legacy_table)
+
+        cursor.execute(sql.SQL("""
+            SELECT DISTINCT date_trunc('month', date)::date FROM {}
+        """).format(legacy))
+        self._ensure_partitions(cursor, [row[0] for row in cursor.fetchall()])
+
+        # Keep the most recently updated person for each slot
+        cursor.execute(sql.SQL("""
+            INSERT INTO shifts (date, label, time, person, role, site, created_at, updated_at)
+            SELECT DISTINCT ON (date, label, time, role)
+                   date, label, time, person, role, site, created_at, updated_at
+            FROM {}
+            ORDER BY date, label, time, role, updated_at DESC, id DESC
+        """).format(legacy))
+        cursor.execute(sql.SQL("DROP TABLE {}").format(legacy))
+
+    @staticmethod
+    def _add_months(month_start: date, months: int) -> date:
+        """Return the first day of the month `months` after month_start (may be negative)"""
+        month_index = month_start.year * 12 + month_start.month - 1 + months
+        return date(month_index // 12, month_index % 12 + 1, 1)
+
+    def _retention_cutoff(self, months_to_keep: int = SHIFT_RETENTION_MONTHS) -> date:
+        """First day of the oldest month kept live; earlier months are archived"""
+        return self._add_months(date.today().replace(day=1), -months_to_keep)
+
+    def _ensure_partitions(self, cursor, months) -> None:
+        """
+        Create monthly shifts partitions if they don't exist yet.
+
+        Args:
+            cursor: Cursor inside the caller's transaction
+            months: Iterable of dates; each is truncated to its month
+        """
+        for month_start in sorted({m.replace(day=1) for m in months}):
+            cursor.execute(sql.SQL("""
+                CREATE TABLE IF NOT EXISTS {} PARTITION OF shifts
+                FOR VALUES FROM (%s) TO (%s)
+            """).format(sql.Identifier(f"shifts_{month_start:%Y_%m}")),
+                (month_start, self._add_months(month_start, 1)))
+
+    def archive_old_partitions(self, months_to_keep: int = SHIFT_RETENTION_MONTHS) -> int:
+        """
+        Detach monthly partitions older than the retention window and archive them.
+
+        Each detached month is stored in shift_archive as gzip-compressed CSV and
+        the partition is dropped, so hot queries only ever see recent months.
+
+        Args:
+            months_to_keep: Number of past months to keep in addition to the current one
+
+        Returns:
+            Number of partitions archived
+        """
+        cutoff = self._retention_cutoff(months_to_keep)
+
+        self._ensure_connection()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT child.relname
+                    FROM pg_inherits i
+                    JOIN pg_class parent ON parent.oid = i.inhparent
+                    JOIN pg_class child ON child.oid = i.inhrelid
+                    WHERE parent.relname = 'shifts'
+                """)
+                partitions = []
+                for (name,) in cursor.fetchall():
+                    try:
+                        month_start = datetime.strptime(name, "shifts_%Y_%m").date()
+                    except ValueError:
+                        continue
+                    if month_start < cutoff:
+                        partitions.append((month_start, name))
+
+                for month_start, name in sorted(partitions):
+                    partition = sql.Identifier(name)
+                    cursor.execute(sql.SQL("ALTER TABLE shifts DETACH PARTITION {}").format(partition))
+
+                    cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(partition))
+                    row_count = cursor.fetchone()[0]
+
+                    if row_count:
+                        buffer = io.BytesIO()
+                        with gzip.GzipFile(fileobj=buffer, mode='wb') as compressed:
+                            cursor.copy_expert(sql.SQL("""
+                                COPY (
+                                    SELECT date, label, time, person, role, site, created_at, updated_at
+                                    FROM {}
+                                    ORDER BY date, label, time, role
+                                ) TO STDOUT WITH CSV HEADER
+                            """).format(partition).as_string(cursor), compressed)
+
+                        cursor.execute("""
+                            INSERT INTO shift_archive (month, row_count, data)
+                            VALUES (%s, %s, %s)
+                            ON CONFLICT (month) DO UPDATE SET
+                                row_count = EXCLUDED.row_count,
+                                data = EXCLUDED.data,
+                                archived_at = CURRENT_TIMESTAMP
+                        """, (month_start, row_count, psycopg2.Binary(buffer.getvalue())))
+
+                    cursor.execute(sql.SQL("DROP TABLE {}").format(partition))
+
+                generation = None
+                if partitions:
+                    generation = self._bump_refresh_generation(cursor)
+                    self._rebuild_daily_schedules(cursor)
+                    self._refresh_shift_stats(cursor)
+                self.connection.commit()
+                if generation is not None:
+                    self.shift_cache.set_generation(generation)
+                return len(partitions)
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to archive old partitions: {e}")
+
     def update_data(self, new_data: List[Dict]) -> tuple[int, int, List[dict]]:
         """
         Replace all data with new data (full refresh strategy).
         Validates data using Pydantic models before insertion.
 
+        The new snapshot is merged into shifts in one transaction, and every
+        added, removed or modified slot is appended to the shift_changes log.
+        Dates before the retention cutoff are left alone, so archived months
+        are not re-inserted and logged as added.
+
         Args:
             new_data: List of raw shift dictionaries
 
@@ -154,30 +465,91 @@ class PostgresDatabase(DiscordFormatter):
         if not valid_shifts:
             return 0, len(invalid_records), invalid_records
 
+        # One row per slot; later records win, matching the slot unique index.
+        # Months past retention were archived; the scraper still returns them.
+        cutoff = self._retention_cutoff().strftime('%Y-%m-%d')
+        incoming = {}
+        for shift in valid_shifts:
+            if shift.date < cutoff:
+                continue
+            incoming[(shift.date, shift.label, shift.time, shift.role)] = (
+                shift.date, shift.label, shift.time, shift.role, shift.person, shift.site
+            )
+
         try:
             with self.connection.cursor() as cursor:
-                # Clear existing data
-                cursor.execute("DELETE FROM shifts")
+                # Make sure every month in the new data has a partition
+                self._ensure_partitions(cursor, {
+                    datetime.strptime(day, "%Y-%m-%d").date() for day, *_ in incoming.values()
+                })
+
+                # The merge touches every date; notify explicitly below instead
+                cursor.execute("SET LOCAL shiftgen.suppress_notify = 'on'")
+
+                cursor.execute("""
+                    CREATE TEMP TABLE incoming_shifts (
+                        date DATE NOT NULL,
+                        label VARCHAR(50) NOT NULL,
+                        time VARCHAR(20) NOT NULL,
+                        role VARCHAR(50) NOT NULL,
+                        person VARCHAR(255) NOT NULL,
+                        site VARCHAR(255) NOT NULL,
+                        PRIMARY KEY (date, label, time, role)
+                    ) ON COMMIT DROP
+                """)
+                execute_values(cursor, """
+                    INSERT INTO incoming_shifts (date, label, time, role, person, site)
+                    VALUES %s
+                """, list(incoming.values()), page_size=1000)
 
-                # Insert new data
-                insert_query = """
+                generation = self._bump_refresh_generation(cursor)
+
+                # Record every added, removed and modified slot before applying the merge
+                cursor.execute("""
+                    INSERT INTO shift_changes
+                    (generation, change_type, date, label, time, role,
+                     old_person, new_person, old_site, new_site)
+                    SELECT %s,
+                           CASE WHEN s.date IS NULL THEN 'added'
+                                WHEN i.date IS NULL THEN 'removed'
+                                ELSE 'modified' END,
+                           COALESCE(i.date, s.date), COALESCE(i.label, s.label),
+                           COALESCE(i.time, s.time), COALESCE(i.role, s.role),
+                           s.person, i.person, s.site, i.site
+                    FROM (SELECT * FROM shifts WHERE date >= %s) s
+                    FULL OUTER JOIN incoming_shifts i
+                        ON s.date = i.date AND s.label = i.label
+                       AND s.time = i.time AND s.role = i.role
+                    WHERE s.date IS NULL
+                       OR i.date IS NULL
+                       OR s.person IS DISTINCT FROM i.person
+                       OR s.site IS DISTINCT FROM i.site
+                    ORDER BY 3, 4, 5, 6
+                    RETURNING date
+                """, (generation, cutoff))
+                change_counts = Counter(row[0].strftime('%Y-%m-%d') for row in cursor.fetchall())
+
+                # Apply the merge: drop slots that disappeared, upsert the rest
+                cursor.execute("""
+                    DELETE FROM shifts s
+                    WHERE s.date >= %s
+                      AND NOT EXISTS (
+                        SELECT 1 FROM incoming_shifts i
+                        WHERE i.date = s.date AND i.label = s.label
+                          AND i.time = s.time AND i.role = s.role
+                    )
+                """, (cutoff,))
+                cursor.execute("""
                     INSERT INTO shifts (date, label, time, person, role, site)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (date, label, time, person, role)
+                    SELECT date, label, time, person, role, site FROM incoming_shifts
+                    ON CONFLICT (date, label, time, role)
                     DO UPDATE SET
+                        person = EXCLUDED.person,
                         site = EXCLUDED.site,
                         updated_at = CURRENT_TIMESTAMP
-                """
-
-                for shift in valid_shifts:
-                    cursor.execute(insert_query, (
-                        shift.date,
-                        shift.label,
-                        shift.time,
-                        shift.person,
-                        shift.role,
-                        shift.site
-                    ))
+                    WHERE shifts.person IS DISTINCT FROM EXCLUDED.person
+                       OR shifts.site IS DISTINCT FROM EXCLUDED.site
+                """)
 
                 # Update metadata
                 cursor.execute("""
@@ -188,7 +560,15 @@ class PostgresDatabase(DiscordFormatter):
                         updated_at = CURRENT_TIMESTAMP
                 """, (datetime.now().isoformat(),))
 
+                # Rebuild schedule documents for the dates this refresh changed
+                changed_dates = self._rebuild_daily_schedules(cursor, sorted(change_counts))
+                self._refresh_shift_stats(cursor)
+                self._notify_changed_dates(cursor, changed_dates)
+
                 self.connection.commit()
+                self.shift_cache.set_generation(generation)
+                self.last_changed_dates = changed_dates
+                self.last_change_counts = dict(change_counts)
                 return len(valid_shifts), len(invalid_records), invalid_records
 
         except Exception as e:
@@ -199,8 +579,9 @@ class PostgresDatabase(DiscordFormatter):
         """
         Get all shifts for a specific date.
 
-        Deduplicates results to ensure only one shift per (date, label, time, role) combination.
-        In case of duplicates, keeps the most recently updated record.
+        The slot unique index guarantees one shift per (date, label, time, role),
+        so this is a plain index range scan. Results are cached per refresh
+        generation, so repeat reads between refreshes don't touch the database.
 
         Args:
             target_date: Date in YYYY-MM-DD format
@@ -208,22 +589,22 @@ class PostgresDatabase(DiscordFormatter):
         Returns:
             List of shift dictionaries
         """
+        cached = self.shift_cache.get(target_date)
+        if cached is not None:
+            return [dict(row) for row in cached]
+
         self._ensure_connection()
         try:
             with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                # Use DISTINCT ON to deduplicate by (date, label, time, role)
-                # This ensures only ONE scribe per shift, even if multiple people are assigned
-                # Keep the most recently updated record in case of duplicates
                 cursor.execute("""
-                    SELECT DISTINCT ON (date, label, time, role)
-                           date, label, time, person, role, site
+                    SELECT date, label, time, person, role, site
                     FROM shifts
                     WHERE date = %s
-                    ORDER BY date, label, time, role, updated_at DESC
+                    ORDER BY date, label, time, role
                 """, (target_date,))
                 results = cursor.fetchall()
                 # Convert date objects to strings
-                return [
+                shifts = [
                     {
                         'date': row['date'].strftime('%Y-%m-%d'),
                         'label': row['label'],
@@ -237,25 +618,104 @@ class PostgresDatabase(DiscordFormatter):
         except Exception as e:
             raise Exception(f"Failed to fetch shifts for date {target_date}: {e}")
 
-    def get_all_shifts(self) -> List[Dict]:
+        self.shift_cache.put(target_date, shifts)
+        return [dict(row) for row in shifts]
+
+    def get_shifts_for_range(self, start_date: str, end_date: str) -> List[Dict]:
         """
-        Get all shifts from database.
+        Get all shifts between two dates (inclusive) with one index range scan.
 
-        Deduplicates results to ensure only one shift per (date, label, time, role) combination.
-        This prevents false shift change alerts when duplicates exist in the database.
+        The result is cached per refresh generation, and each date's slice is
+        also cached so later single-day reads in the range don't query again.
+
+        Args:
+            start_date: First date in YYYY-MM-DD format
+            end_date: Last date in YYYY-MM-DD format
+
+        Returns:
+            List of shift dictionaries ordered by date, label, time and role
         """
+        cache_key = ('range', start_date, end_date)
+        cached = self.shift_cache.get(cache_key)
+        if cached is not None:
+            return [dict(row) for row in cached]
+
         self._ensure_connection()
         try:
             with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                # Use DISTINCT ON to deduplicate by (date, label, time, role)
-                # This ensures only ONE person per shift, even if duplicates exist
-                # Keep the most recently updated record in case of duplicates
                 cursor.execute("""
-                    SELECT DISTINCT ON (date, label, time, role)
-                           date, label, time, person, role, site
+                    SELECT date, label, time, person, role, site
                     FROM shifts
-                    ORDER BY date, label, time, role, updated_at DESC
-                """)
+                    WHERE date BETWEEN %s AND %s
+                    ORDER BY date, label, time, role
+                """, (start_date, end_date))
+                shifts = [
+                    {
+                        'date': row['date'].strftime('%Y-%m-%d'),
+                        'label': row['label'],
+                        'time': row['time'],
+                        'person': row['person'],
+                        'role': row['role'],
+                        'site': row['site']
+                    }
+                    for row in cursor.fetchall()
+                ]
+        except Exception as e:
+            raise Exception(f"Failed to fetch shifts for {start_date} to {end_date}: {e}")
+
+        shifts_by_date = {day: [] for day in self._date_range(start_date, end_date)}
+        for shift in shifts:
+            shifts_by_date[shift['date']].append(shift)
+        for day, day_shifts in shifts_by_date.items():
+            self.shift_cache.put(day, day_shifts)
+
+        self.shift_cache.put(cache_key, shifts)
+        return [dict(row) for row in shifts]
+
+    def get_shifts_active_at(self, ts: datetime) -> List[Dict]:
+        """
+        Get the scribe shifts on duty at a moment, with their paired providers.
+
+        Uses the GiST index on shifts.period, so overnight shifts that started
+        the previous day are found by the same indexed query. The date bound
+        limits the scan to the current (and at month start, previous) partition.
+
+        Args:
+            ts: Timezone-aware moment to check
+
+        Returns:
+            List of scribe shift dictionaries with extra 'physician' and 'mlp' keys,
+            sorted by label and start time
+        """
+        self._ensure_connection()
+        try:
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                local_date = ts.astimezone(pytz.timezone('America/Los_Angeles')).date()
+
+                # Physicians pair on the exact slot; PA scribes pair with the MLP starting
+                # within an hour (last match by label/time wins, as in the formatter)
+                cursor.execute("""
+                    SELECT s.date, s.label, s.time, s.person, s.role, s.site,
+                           p.person AS physician, m.person AS mlp
+                    FROM shifts s
+                    LEFT JOIN shifts p
+                        ON p.date = s.date AND p.label = s.label AND p.time = s.time
+                       AND p.role = 'Physician'
+                    LEFT JOIN LATERAL (
+                        SELECT mlp.person
+                        FROM shifts mlp
+                        WHERE s.label = 'PA'
+                          AND mlp.date = s.date
+                          AND mlp.role = 'MLP'
+                          AND abs(extract(epoch FROM lower(mlp.period) - lower(s.period))) <= 3600
+                        ORDER BY mlp.label DESC, mlp.time DESC
+                        LIMIT 1
+                    ) m ON TRUE
+                    WHERE s.role = 'Scribe'
+                      AND s.date BETWEEN %s::date - 1 AND %s::date
+                      AND s.period @> %s::timestamptz
+                    ORDER BY s.label, lower(s.period)
+                """, (local_date, local_date, ts))
                 results = cursor.fetchall()
                 return [
                     {
@@ -264,176 +724,670 @@ class PostgresDatabase(DiscordFormatter):
                         'time': row['time'],
                         'person': row['person'],
                         'role': row['role'],
-                        'site': row['site']
+                        'site': row['site'],
+                        'physician': row['physician'],
+                        'mlp': row['mlp']
                     }
                     for row in results
                 ]
         except Exception as e:
-            raise Exception(f"Failed to fetch all shifts: {e}")
+            raise Exception(f"Failed to fetch active shifts: {e}")
 
-    def get_date_range(self) -> tuple[Optional[str], Optional[str]]:
+    def get_daily_schedule_document(self, target_date: str) -> Dict:
         """
-        Get the minimum and maximum dates in the database.
+        Get the precomputed schedule document for a date.
+
+        Reads a single row from daily_schedule (cached per refresh generation)
+        instead of re-pairing raw shifts on every render.
+
+        Args:
+            target_date: Date in YYYY-MM-DD format
 
         Returns:
-            Tuple of (min_date, max_date) in YYYY-MM-DD format, or (None, None) if empty
+            Document dictionary (see DiscordFormatter.build_daily_schedule_document)
         """
+        cache_key = ('document', target_date)
+        cached = self.shift_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         self._ensure_connection()
         try:
             with self.connection.cursor() as cursor:
-                cursor.execute("SELECT MIN(date), MAX(date) FROM shifts")
+                cursor.execute(
+                    "SELECT document FROM daily_schedule WHERE date = %s",
+                    (target_date,)
+                )
                 result = cursor.fetchone()
-                if result[0] and result[1]:
-                    return result[0].strftime('%Y-%m-%d'), result[1].strftime('%Y-%m-%d')
-                return None, None
         except Exception as e:
-            raise Exception(f"Failed to get date range: {e}")
+            raise Exception(f"Failed to fetch schedule document for date {target_date}: {e}")
+
+        # No document means no shifts on that date
+        document = result[0] if result else self.build_daily_schedule_document(target_date, [])
+        self.shift_cache.put(cache_key, document)
+        return document
+
+    def get_schedule_documents_for_range(self, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Get the precomputed schedule documents for every date in a range (inclusive).
+
+        One indexed read of daily_schedule replaces a query and pairing pass per
+        date. Documents are cached per refresh generation alongside the single-day ones.
+
+        Args:
+            start_date: First date in YYYY-MM-DD format
+            end_date: Last date in YYYY-MM-DD format
+
+        Returns:
+            List of documents in date order (see DiscordFormatter.build_daily_schedule_document)
+        """
+        dates = self._date_range(start_date, end_date)
+        cached = [self.shift_cache.get(('document', day)) for day in dates]
+        if all(document is not None for document in cached):
+            return cached
 
-    def get_record_count(self) -> int:
-        """Get total number of shifts in database"""
         self._ensure_connection()
         try:
             with self.connection.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM shifts")
-                return cursor.fetchone()[0]
+                cursor.execute(
+                    "SELECT date, document FROM daily_schedule WHERE date BETWEEN %s AND %s",
+                    (start_date, end_date)
+                )
+                stored = {row[0].strftime('%Y-%m-%d'): row[1] for row in cursor.fetchall()}
         except Exception as e:
-            raise Exception(f"Failed to get record count: {e}")
+            raise Exception(f"Failed to fetch schedule documents for {start_date} to {end_date}: {e}")
 
-    def get_last_refresh_time(self) -> Optional[str]:
-        """Get timestamp of last database refresh"""
-        try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT value FROM metadata WHERE key = 'last_refresh'")
-                result = cursor.fetchone()
-                return result[0] if result else None
-        except Exception:
-            return None
+        documents = []
+        for day in dates:
+            # No document means no shifts on that date
+            document = stored.get(day) or self.build_daily_schedule_document(day, [])
+            self.shift_cache.put(('document', day), document)
+            documents.append(document)
+        return documents
 
-    def _generate_change_hash(self, change_type: str, date: str, label: str, time: str,
-                              old_person: Optional[str], new_person: Optional[str]) -> str:
+    def _rebuild_daily_schedules(self, cursor, dates: Optional[List[str]] = None) -> List[str]:
         """
-        Generate a unique hash for a change to prevent duplicate alerts.
+        Incrementally rebuild daily_schedule inside the caller's transaction.
+
+        A per-date fingerprint of the shift rows is compared against the stored
+        content_hash, so only dates whose shifts changed are re-paired and written.
 
         Args:
-            change_type: 'added', 'removed', or 'modified'
-            date: Date in YYYY-MM-DD format
-            label: Shift label
-            time: Time string
-            old_person: Previous person (None for added)
-            new_person: New person (None for removed)
+            cursor: Cursor of the caller's transaction
+            dates: Only check these dates (YYYY-MM-DD); None checks every date
 
         Returns:
-            SHA256 hash string
+            Sorted list of dates (YYYY-MM-DD) whose document was written or removed
         """
-        hash_input = f"{change_type}|{date}|{label}|{time}|{old_person}|{new_person}"
-        return hashlib.sha256(hash_input.encode()).hexdigest()
+        if dates is not None and not dates:
+            return []
+
+        # Without a date list every date is fingerprinted (full sync)
+        date_filter = "" if dates is None else "AND date = ANY(%(dates)s::date[])"
+        params = {'version': str(SCHEDULE_DOCUMENT_VERSION), 'dates': dates}
+
+        # Drop documents for dates that no longer have shifts
+        cursor.execute(f"""
+            DELETE FROM daily_schedule d
+            WHERE NOT EXISTS (SELECT 1 FROM shifts s WHERE s.date = d.date)
+            {date_filter}
+            RETURNING d.date
+        """, params)
+        removed_dates = [row[0].strftime('%Y-%m-%d') for row in cursor.fetchall()]
+
+        # Find dates whose fingerprint differs from the stored document
+        cursor.execute(f"""
+            SELECT f.date, f.content_hash
+            FROM (
+                SELECT date,
+                       md5(%(version)s || string_agg(
+                           concat_ws('|', label, time, role, person, site),
+                           ',' ORDER BY label, time, role
+                       )) AS content_hash
+                FROM shifts
+                WHERE TRUE {date_filter}
+                GROUP BY date
+            ) f
+            LEFT JOIN daily_schedule d ON d.date = f.date
+            WHERE d.date IS NULL OR d.content_hash <> f.content_hash
+        """, params)
+        stale = {row[0].strftime('%Y-%m-%d'): row[1] for row in cursor.fetchall()}
+
+        if stale:
+            cursor.execute("""
+                SELECT date, label, time, person, role, site
+                FROM shifts
+                WHERE date = ANY(%s::date[])
+                ORDER BY date, label, time, role
+            """, (list(stale.keys()),))
+
+            stale_shifts = [
+                {
+                    'date': day.strftime('%Y-%m-%d'),
+                    'label': label,
+                    'time': time,
+                    'person': person,
+                    'role': role,
+                    'site': site
+                }
+                for day, label, time, person, role, site in cursor.fetchall()
+            ]
+            # One pairing pass over every stale date
+            documents = self.build_schedule_documents(list(stale.keys()), stale_shifts)
+
+            execute_values(cursor, """
+                INSERT INTO daily_schedule (date, document, content_hash)
+                VALUES %s
+                ON CONFLICT (date) DO UPDATE SET
+                    document = EXCLUDED.document,
+                    content_hash = EXCLUDED.content_hash,
+                    updated_at = CURRENT_TIMESTAMP
+            """, [
+                (
+                    day,
+                    Json(documents[day]),
+                    content_hash
+                )
+                for day, content_hash in stale.items()
+            ], page_size=100)
+
+        return sorted(set(removed_dates) | set(stale.keys()))
 
-    def _is_change_already_alerted(self, change_hash: str) -> bool:
-        """Check if a change has already been alerted"""
+    def _sync_daily_schedules(self) -> None:
+        """Bring daily_schedule and shift_stats up to date with the shifts table (used on startup)"""
         try:
             with self.connection.cursor() as cursor:
-                cursor.execute(
-                    "SELECT 1 FROM alerted_changes WHERE change_hash = %s",
-                    (change_hash,)
-                )
-                return cursor.fetchone() is not None
-        except Exception:
-            return False
+                self._rebuild_daily_schedules(cursor)
+                self._refresh_shift_stats(cursor)
+                self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            print(f"Warning: Failed to sync daily schedule documents: {e}")
+
+    def get_all_shifts(self) -> List[Dict]:
+        """
+        Get all shifts from database.
 
-    def _mark_change_as_alerted(self, change: Dict) -> None:
-        """Mark a change as alerted to prevent future duplicate alerts"""
+        The slot unique index guarantees one shift per (date, label, time, role) combination,
+        which prevents false shift change alerts.
+        """
+        self._ensure_connection()
         try:
-            change_hash = self._generate_change_hash(
-                change['type'],
-                change.get('new', change.get('old'))['date'],
-                change.get('new', change.get('old'))['label'],
-                change.get('new', change.get('old'))['time'],
-                change.get('old', {}).get('person') if change.get('old') else None,
-                change.get('new', {}).get('person') if change.get('new') else None
-            )
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT date, label, time, person, role, site
+                    FROM shifts
+                    ORDER BY date, label, time, role
+                """)
+                results = cursor.fetchall()
+                return [
+                    {
+                        'date': row['date'].strftime('%Y-%m-%d'),
+                        'label': row['label'],
+                        'time': row['time'],
+                        'person': row['person'],
+                        'role': row['role'],
+                        'site': row['site']
+                    }
+                    for row in results
+                ]
+        except Exception as e:
+            raise Exception(f"Failed to fetch all shifts: {e}")
+
+    def needs_full_backup(self, interval_days: int = BACKUP_FULL_INTERVAL_DAYS) -> bool:
+        """Check whether the next backup should be a full snapshot rather than a delta"""
+        self._ensure_connection()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT value FROM metadata WHERE key = 'last_full_backup'")
+                result = cursor.fetchone()
+            if not result:
+                return True
+            last_full = datetime.fromisoformat(result[0])
+            return (datetime.now() - last_full).days >= interval_days
+        except Exception:
+            self.connection.rollback()
+            return True
+
+    def write_backup(self, fileobj, full: bool = True) -> int:
+        """
+        Stream a backup as gzip-compressed CSV into a binary file object.
+
+        A full backup contains every shift. A delta backup contains only the
+        slots that changed since the last confirmed backup, as rows of
+        (op, date, label, time, role, person, site) with op 'upsert' or 'delete'.
+        Rows go straight from COPY TO STDOUT through the gzip compressor, so
+        memory use stays flat regardless of table size.
+
+        The captured state only becomes the base for the next delta once
+        commit_backup() is called after the upload succeeds.
 
-            old_record = change.get('old')
-            new_record = change.get('new')
-            record = new_record or old_record
+        Args:
+            fileobj: Writable binary file object (e.g. a temporary file)
+            full: Write a full snapshot instead of a delta
 
+        Returns:
+            Number of rows written
+        """
+        self._ensure_connection()
+        try:
             with self.connection.cursor() as cursor:
+                # Capture the current state server-side so the file and the
+                # next delta base agree exactly
                 cursor.execute("""
-                    INSERT INTO alerted_changes
-                    (change_hash, change_type, date, label, time, old_person, new_person, site)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (change_hash) DO NOTHING
-                """, (
-                    change_hash,
-                    change['type'],
-                    record['date'],
-                    record['label'],
-                    record['time'],
-                    old_record['person'] if old_record else None,
-                    new_record['person'] if new_record else None,
-                    record['site']
-                ))
+                    TRUNCATE backup_pending;
+                    INSERT INTO backup_pending (date, label, time, role, person, site)
+                    SELECT date, label, time, role, person, site FROM shifts;
+                """)
+
+                if full:
+                    copy_query = """
+                        COPY (
+                            SELECT date, label, time, person, role, site
+                            FROM backup_pending
+                            ORDER BY date, label, time, role
+                        ) TO STDOUT WITH CSV HEADER
+                    """
+                else:
+                    copy_query = """
+                        COPY (
+                            SELECT 'upsert' AS op, p.date, p.label, p.time, p.role, p.person, p.site
+                            FROM backup_pending p
+                            LEFT JOIN backup_state s
+                                ON s.date = p.date AND s.label = p.label
+                               AND s.time = p.time AND s.role = p.role
+                            WHERE s.date IS NULL
+                               OR s.person IS DISTINCT FROM p.person
+                               OR s.site IS DISTINCT FROM p.site
+                            UNION ALL
+                            SELECT 'delete' AS op, s.date, s.label, s.time, s.role, NULL, NULL
+                            FROM backup_state s
+                            LEFT JOIN backup_pending p
+                                ON p.date = s.date AND p.label = s.label
+                               AND p.time = s.time AND p.role = s.role
+                            WHERE p.date IS NULL
+                            ORDER BY 2, 3, 4, 5
+                        ) TO STDOUT WITH CSV HEADER
+                    """
+
+                with gzip.GzipFile(fileobj=fileobj, mode='wb') as compressed:
+                    cursor.copy_expert(copy_query, compressed)
+                row_count = cursor.rowcount
                 self.connection.commit()
+                return row_count
         except Exception as e:
             self.connection.rollback()
-            # Don't fail the whole process if we can't mark a change
-            print(f"Warning: Failed to mark change as alerted: {e}")
+            raise Exception(f"Failed to write backup: {e}")
 
-    def mark_changes_as_alerted(self, changes: List[Dict]) -> None:
+    def commit_backup(self, full: bool) -> None:
         """
-        Mark multiple changes as alerted.
-        Should be called after successfully posting alerts to Discord.
+        Confirm the last write_backup() after it was uploaded.
+        The captured state becomes the base for the next delta backup.
 
         Args:
-            changes: List of change dictionaries
+            full: Whether the confirmed backup was a full snapshot
         """
-        for change in changes:
-            self._mark_change_as_alerted(change)
+        self._ensure_connection()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    TRUNCATE backup_state;
+                    INSERT INTO backup_state SELECT * FROM backup_pending;
+                    TRUNCATE backup_pending;
+                """)
+                if full:
+                    cursor.execute("""
+                        INSERT INTO metadata (key, value, updated_at)
+                        VALUES ('last_full_backup', %s, CURRENT_TIMESTAMP)
+                        ON CONFLICT (key) DO UPDATE SET
+                            value = EXCLUDED.value,
+                            updated_at = CURRENT_TIMESTAMP
+                    """, (datetime.now().isoformat(),))
+                self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to commit backup: {e}")
 
-    def cleanup_old_alerted_changes(self, days_to_keep: int = 30) -> None:
+    def restore_backup(self, full_file, delta_files: List = None) -> int:
         """
-        Remove alerted changes older than specified days to prevent table bloat.
+        Rebuild the shifts table from a full backup plus any number of deltas.
+
+        Backups are bulk loaded with COPY into a staging table, deltas are
+        applied in the given order, and shifts is replaced in one transaction.
 
         Args:
-            days_to_keep: Number of days to keep alerted change records
+            full_file: Readable file object with an uncompressed full backup CSV
+            delta_files: Readable file objects with uncompressed delta CSVs, oldest first
+
+        Returns:
+            Number of shifts after the restore
         """
+        self._ensure_connection()
         try:
             with self.connection.cursor() as cursor:
                 cursor.execute("""
-                    DELETE FROM alerted_changes
-                    WHERE date < CURRENT_DATE - INTERVAL '%s days'
-                """, (days_to_keep,))
+                    CREATE TEMP TABLE restore_shifts (
+                        date DATE NOT NULL,
+                        label TEXT NOT NULL,
+                        time TEXT NOT NULL,
+                        person TEXT NOT NULL,
+                        role TEXT NOT NULL,
+                        site TEXT NOT NULL
+                    ) ON COMMIT DROP;
+                    CREATE TEMP TABLE restore_delta (
+                        op TEXT NOT NULL,
+                        date DATE NOT NULL,
+                        label TEXT NOT NULL,
+                        time TEXT NOT NULL,
+                        role TEXT NOT NULL,
+                        person TEXT,
+                        site TEXT
+                    ) ON COMMIT DROP;
+                """)
+                cursor.copy_expert("""
+                    COPY restore_shifts (date, label, time, person, role, site)
+                    FROM STDIN WITH CSV HEADER
+                """, full_file)
+
+                for delta_file in delta_files or []:
+                    cursor.execute("TRUNCATE restore_delta")
+                    cursor.copy_expert("""
+                        COPY restore_delta (op, date, label, time, role, person, site)
+                        FROM STDIN WITH CSV HEADER
+                    """, delta_file)
+                    cursor.execute("""
+                        DELETE FROM restore_shifts r
+                        USING restore_delta d
+                        WHERE r.date = d.date AND r.label = d.label
+                          AND r.time = d.time AND r.role = d.role;
+
+                        INSERT INTO restore_shifts (date, label, time, person, role, site)
+                        SELECT date, label, time, person, role, site
+                        FROM restore_delta
+                        WHERE op = 'upsert';
+                    """)
+
+                cursor.execute("SELECT DISTINCT date_trunc('month', date)::date FROM restore_shifts")
+                self._ensure_partitions(cursor, [row[0] for row in cursor.fetchall()])
+
+                cursor.execute("""
+                    DELETE FROM shifts;
+                    INSERT INTO shifts (date, label, time, person, role, site)
+                    SELECT date, label, time, person, role, site FROM restore_shifts;
+                """)
+                row_count = cursor.rowcount
+
+                # The restored state is the new delta base; force a full backup next
+                cursor.execute("""
+                    TRUNCATE backup_state;
+                    INSERT INTO backup_state (date, label, time, role, person, site)
+                    SELECT date, label, time, role, person, site FROM shifts;
+                    DELETE FROM metadata WHERE key = 'last_full_backup';
+                """)
+
+                generation = self._bump_refresh_generation(cursor)
+                self.last_changed_dates = self._rebuild_daily_schedules(cursor)
+                self._refresh_shift_stats(cursor)
                 self.connection.commit()
+                self.shift_cache.set_generation(generation)
+                return row_count
         except Exception as e:
             self.connection.rollback()
-            print(f"Warning: Failed to cleanup old alerted changes: {e}")
+            raise Exception(f"Failed to restore backup: {e}")
 
-    def compare_schedules(self, new_data: List[Dict]) -> List[Dict]:
+    def _refresh_shift_stats(self, cursor) -> None:
         """
-        Compare new schedule data with current data to find changes.
-        Only returns changes that haven't been alerted yet.
+        Recompute the shift_stats row inside the caller's transaction.
+        One scan of shifts produces the total, date range and per-role/per-site counts.
+        """
+        cursor.execute("""
+            WITH counts AS (
+                SELECT role, site, GROUPING(role, site) AS level, COUNT(*) AS n,
+                       MIN(date) AS min_date, MAX(date) AS max_date
+                FROM shifts
+                GROUP BY GROUPING SETS ((role), (site), ())
+            )
+            INSERT INTO shift_stats
+            (id, record_count, min_date, max_date, role_counts, site_counts, updated_at)
+            SELECT TRUE,
+                   COALESCE(SUM(n) FILTER (WHERE level = 3), 0),
+                   MIN(min_date) FILTER (WHERE level = 3),
+                   MAX(max_date) FILTER (WHERE level = 3),
+                   COALESCE(jsonb_object_agg(role, n) FILTER (WHERE level = 1), '{}'),
+                   COALESCE(jsonb_object_agg(site, n) FILTER (WHERE level = 2), '{}'),
+                   CURRENT_TIMESTAMP
+            FROM counts
+            ON CONFLICT (id) DO UPDATE SET
+                record_count = EXCLUDED.record_count,
+                min_date = EXCLUDED.min_date,
+                max_date = EXCLUDED.max_date,
+                role_counts = EXCLUDED.role_counts,
+                site_counts = EXCLUDED.site_counts,
+                updated_at = EXCLUDED.updated_at
+        """)
+
+    def get_shift_stats(self) -> Dict:
+        """
+        Get the shift summary maintained at refresh time.
+
+        Reads the shift_stats row and last refresh time in one query, cached
+        per refresh generation.
+
+        Returns:
+            Dictionary with record_count, min_date, max_date (YYYY-MM-DD or None),
+            last_refresh (ISO timestamp or None), role_counts and site_counts
+        """
+        cached = self.shift_cache.get('stats')
+        if cached is not None:
+            return dict(cached)
+
+        self._ensure_connection()
+        try:
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT s.record_count, s.min_date, s.max_date, s.role_counts, s.site_counts,
+                           (SELECT value FROM metadata WHERE key = 'last_refresh') AS last_refresh
+                    FROM (SELECT 1) one
+                    LEFT JOIN shift_stats s ON TRUE
+                """)
+                row = cursor.fetchone()
+        except Exception as e:
+            raise Exception(f"Failed to get shift stats: {e}")
+
+        stats = {
+            'record_count': row['record_count'] or 0,
+            'min_date': row['min_date'].strftime('%Y-%m-%d') if row['min_date'] else None,
+            'max_date': row['max_date'].strftime('%Y-%m-%d') if row['max_date'] else None,
+            'last_refresh': row['last_refresh'],
+            'role_counts': row['role_counts'] or {},
+            'site_counts': row['site_counts'] or {}
+        }
+        self.shift_cache.put('stats', stats)
+        return dict(stats)
+
+    def get_date_range(self) -> tuple[Optional[str], Optional[str]]:
+        """
+        Get the minimum and maximum dates in the database.
+
+        Returns:
+            Tuple of (min_date, max_date) in YYYY-MM-DD format, or (None, None) if empty
+        """
+        stats = self.get_shift_stats()
+        return stats['min_date'], stats['max_date']
+
+    def get_record_count(self) -> int:
+        """Get total number of shifts in database"""
+        return self.get_shift_stats()['record_count']
+
+    def get_last_refresh_time(self) -> Optional[str]:
+        """Get timestamp of last database refresh"""
+        return self.get_shift_stats()['last_refresh']
+
+    def get_last_change_counts(self) -> Dict[str, int]:
+        """Get changed slots per date (YYYY-MM-DD) from the last update_data call"""
+        return dict(self.last_change_counts)
+
+    def get_refresh_generation(self) -> int:
+        """Get the refresh generation, incremented every time shift data is rewritten"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT value FROM metadata WHERE key = 'refresh_generation'")
+                result = cursor.fetchone()
+                return int(result[0]) if result else 0
+        except Exception:
+            self.connection.rollback()
+            return 0
+
+    def _bump_refresh_generation(self, cursor) -> int:
+        """Increment the refresh generation inside the caller's transaction"""
+        cursor.execute("""
+            INSERT INTO metadata (key, value, updated_at)
+            VALUES ('refresh_generation', '1', CURRENT_TIMESTAMP)
+            ON CONFLICT (key) DO UPDATE SET
+                value = (metadata.value::int + 1)::text,
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING value
+        """)
+        return int(cursor.fetchone()[0])
+
+    def get_cache_stats(self) -> Dict:
+        """Get hit/miss counters for the shift read cache"""
+        return self.shift_cache.get_stats()
+
+    def get_query_stats(self) -> List[Dict]:
+        """Get per-method latency percentiles and row counts for this storage backend"""
+        return self.query_metrics.get_stats()
+
+    def get_alert_cursor(self) -> int:
+        """Get the sequence number of the last shift change that was alerted"""
+        self._ensure_connection()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT value FROM metadata WHERE key = 'alert_cursor'")
+                result = cursor.fetchone()
+                return int(result[0]) if result else 0
+        except Exception:
+            self.connection.rollback()
+            return 0
+
+    def get_unalerted_changes(self, role: Optional[str] = 'Scribe') -> tuple[List[Dict], int]:
+        """
+        Read shift changes logged after the alert cursor.
+
+        Site-only modifications are skipped since alerts only report who works
+        a slot. Pass the returned sequence number to advance_alert_cursor() once
+        the alerts have been posted.
 
         Args:
-            new_data: List of new shift dictionaries
+            role: Only return changes for this role (None for all roles)
 
         Returns:
-            List of changes in format: {
+            Tuple of (changes, last_seq) where changes are in format: {
+                'seq': int,
                 'type': 'added'|'removed'|'modified',
                 'old': {...}|None,
                 'new': {...}|None
-            }
+            } and last_seq is the newest sequence number that was read
         """
+        self._ensure_connection()
+        try:
+            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("""
+                    SELECT COALESCE((SELECT value::bigint FROM metadata
+                                     WHERE key = 'alert_cursor'), 0) AS cursor,
+                           COALESCE((SELECT MAX(seq) FROM shift_changes), 0) AS last_seq
+                """)
+                bounds = cursor.fetchone()
+                cursor.execute("""
+                    SELECT seq, change_type, to_char(date, 'YYYY-MM-DD') AS date,
+                           label, time, role, old_person, new_person, old_site, new_site
+                    FROM shift_changes
+                    WHERE seq > %s AND seq <= %s
+                      AND (%s::text IS NULL OR role = %s)
+                      AND (change_type <> 'modified' OR old_person IS DISTINCT FROM new_person)
+                    ORDER BY seq
+                """, (bounds['cursor'], bounds['last_seq'], role, role))
+                rows = cursor.fetchall()
+                self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to read shift changes: {e}")
+
         changes = []
+        for row in rows:
+            slot = {'date': row['date'], 'label': row['label'], 'time': row['time'], 'role': row['role']}
+            old_record = None
+            if row['change_type'] != 'added':
+                old_record = {**slot, 'person': row['old_person'], 'site': row['old_site']}
+            new_record = None
+            if row['change_type'] != 'removed':
+                new_record = {**slot, 'person': row['new_person'], 'site': row['new_site']}
+            changes.append({
+                'seq': row['seq'],
+                'type': row['change_type'],
+                'old': old_record,
+                'new': new_record
+            })
+
+        return changes, max(bounds['cursor'], bounds['last_seq'])
+
+    def advance_alert_cursor(self, seq: int) -> None:
+        """
+        Move the alert cursor forward after posting alerts.
+        The cursor never moves backwards, so replaying an older position is a no-op.
 
-        # Get current shifts from database
-        current_shifts = self.get_all_shifts()
+        Args:
+            seq: Sequence number of the last change that was alerted
+        """
+        self._ensure_connection()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO metadata (key, value, updated_at)
+                    VALUES ('alert_cursor', %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (key) DO UPDATE SET
+                        value = GREATEST(metadata.value::bigint, EXCLUDED.value::bigint)::text,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (str(seq),))
+                self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            # Worst case the same alerts are posted again on the next refresh
+            print(f"Warning: Failed to advance alert cursor: {e}")
 
-        # Create lookup dictionaries (only track scribe changes)
-        old_shifts = {}
-        for record in current_shifts:
-            if record.get('role') == 'Scribe':
-                key = (record.get('date'), record.get('label'), record.get('time'))
-                old_shifts[key] = record
+    def cleanup_old_changes(self, days_to_keep: int = 30) -> int:
+        """
+        Remove alerted change log entries older than specified days to prevent table bloat.
+        Entries after the alert cursor are always kept.
+
+        Args:
+            days_to_keep: Number of days to keep change log entries
 
+        Returns:
+            Number of log entries removed
+        """
+        self._ensure_connection()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    DELETE FROM shift_changes
+                    WHERE changed_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 day'
+                      AND seq <= COALESCE((SELECT value::bigint FROM metadata
+                                           WHERE key = 'alert_cursor'), 0)
+                """, (days_to_keep,))
+                deleted_count = cursor.rowcount
+                self.connection.commit()
+                return deleted_count
+        except Exception as e:
+            self.connection.rollback()
+            print(f"Warning: Failed to cleanup old shift changes: {e}")
+            return 0
+
+    def _get_incoming_scribe_shifts(self, new_data: List[Dict]) -> Dict[tuple, Dict]:
+        """
+        Build a (date, label, time) lookup of incoming scribe shifts with standardized names.
+        Later records win when the same slot appears more than once.
+        """
         new_shifts = {}
         for record in new_data:
             if record.get('role') == 'Scribe':
@@ -446,65 +1400,166 @@ class PostgresDatabase(DiscordFormatter):
 
                 key = (record.get('date'), record.get('label'), record.get('time'))
                 new_shifts[key] = record_copy
+        return new_shifts
+
+    def _diff_schedules_in_memory(self, new_shifts: Dict[tuple, Dict]) -> List[Dict]:
+        """Diff incoming scribe shifts against a full snapshot loaded from the database"""
+        candidates = []
+
+        # Get current shifts from database
+        current_shifts = self.get_all_shifts()
+
+        # Create lookup dictionary (only track scribe changes)
+        old_shifts = {}
+        for record in current_shifts:
+            if record.get('role') == 'Scribe':
+                key = (record.get('date'), record.get('label'), record.get('time'))
+                old_shifts[key] = record
 
         # Find removed shifts
         for key, old_record in old_shifts.items():
             if key not in new_shifts:
-                change = {
+                candidates.append({
                     'type': 'removed',
                     'old': old_record,
                     'new': None
-                }
-                # Only include if not already alerted
-                change_hash = self._generate_change_hash(
-                    'removed',
-                    old_record['date'],
-                    old_record['label'],
-                    old_record['time'],
-                    old_record['person'],
-                    None
-                )
-                if not self._is_change_already_alerted(change_hash):
-                    changes.append(change)
+                })
 
         # Find added or modified shifts
         for key, new_record in new_shifts.items():
             if key not in old_shifts:
-                change = {
+                candidates.append({
                     'type': 'added',
                     'old': None,
                     'new': new_record
-                }
-                # Only include if not already alerted
-                change_hash = self._generate_change_hash(
-                    'added',
-                    new_record['date'],
-                    new_record['label'],
-                    new_record['time'],
-                    None,
-                    new_record['person']
-                )
-                if not self._is_change_already_alerted(change_hash):
-                    changes.append(change)
+                })
             elif old_shifts[key].get('person') != new_record.get('person'):
-                change = {
+                candidates.append({
                     'type': 'modified',
                     'old': old_shifts[key],
                     'new': new_record
+                })
+
+        return candidates
+
+    def _diff_schedules_in_db(self, new_shifts: Dict[tuple, Dict]) -> List[Dict]:
+        """
+        Diff incoming scribe shifts against the database inside Postgres.
+
+        Loads the incoming shifts into a temporary staging table and computes
+        added, removed and modified slots with a single FULL OUTER JOIN, so only
+        changed rows are transferred back to the bot.
+        """
+        # Key the staged rows by their text form so result rows map back to records
+        staged = {
+            (str(day), str(label), str(time)): record
+            for (day, label, time), record in new_shifts.items()
+        }
+
+        self._ensure_connection()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TEMP TABLE incoming_scribe_shifts (
+                        date TEXT NOT NULL,
+                        label TEXT NOT NULL,
+                        time TEXT NOT NULL,
+                        person TEXT,
+                        site TEXT,
+                        PRIMARY KEY (date, label, time)
+                    ) ON COMMIT DROP
+                """)
+
+                if staged:
+                    execute_values(cursor, """
+                        INSERT INTO incoming_scribe_shifts (date, label, time, person, site)
+                        VALUES %s
+                    """, [
+                        (day, label, time, record.get('person'), record.get('site'))
+                        for (day, label, time), record in staged.items()
+                    ], page_size=1000)
+
+                cursor.execute("""
+                    WITH current_shifts AS (
+                        SELECT to_char(date, 'YYYY-MM-DD') AS date, label, time, person, site
+                        FROM shifts
+                        WHERE role = 'Scribe'
+                    )
+                    SELECT c.date AS old_date, c.label AS old_label, c.time AS old_time,
+                           c.person AS old_person, c.site AS old_site,
+                           i.date AS new_date, i.label AS new_label, i.time AS new_time,
+                           i.person AS new_person, i.site AS new_site
+                    FROM current_shifts c
+                    FULL OUTER JOIN incoming_scribe_shifts i
+                        ON c.date = i.date AND c.label = i.label AND c.time = i.time
+                    WHERE c.date IS NULL
+                       OR i.date IS NULL
+                       OR c.person IS DISTINCT FROM i.person
+                    ORDER BY COALESCE(c.date, i.date), COALESCE(c.label, i.label),
+                             COALESCE(c.time, i.time)
+                """)
+                rows = cursor.fetchall()
+                self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to compare schedules: {e}")
+
+        candidates = []
+        for row in rows:
+            old_date, old_label, old_time, old_person, old_site = row[:5]
+            new_date, new_label, new_time = row[5:8]
+            old_record = None
+            if old_date is not None:
+                old_record = {
+                    'date': old_date,
+                    'label': old_label,
+                    'time': old_time,
+                    'person': old_person,
+                    'role': 'Scribe',
+                    'site': old_site
                 }
-                # Only include if not already alerted
-                change_hash = self._generate_change_hash(
-                    'modified',
-                    new_record['date'],
-                    new_record['label'],
-                    new_record['time'],
-                    old_shifts[key]['person'],
-                    new_record['person']
-                )
-                if not self._is_change_already_alerted(change_hash):
-                    changes.append(change)
+            new_record = None
+            if new_date is not None:
+                new_record = staged[(new_date, new_label, new_time)]
+
+            if old_record is None:
+                change_type = 'added'
+            elif new_record is None:
+                change_type = 'removed'
+            else:
+                change_type = 'modified'
+
+            candidates.append({
+                'type': change_type,
+                'old': old_record,
+                'new': new_record
+            })
+
+        return candidates
+
+    def compare_schedules(self, new_data: List[Dict], server_side: bool = True) -> List[Dict]:
+        """
+        Compare new schedule data with current data to find changes.
+        This is a read-only preview; alerts are driven by the shift_changes log
+        that update_data() writes.
 
-        return changes
+        Args:
+            new_data: List of new shift dictionaries
+            server_side: Compute the diff inside Postgres (default). When False, the
+                full table is loaded and diffed in Python.
+
+        Returns:
+            List of changes in format: {
+                'type': 'added'|'removed'|'modified',
+                'old': {...}|None,
+                'new': {...}|None
+            }
+        """
+        new_shifts = self._get_incoming_scribe_shifts(new_data)
+
+        if server_side:
+            return self._diff_schedules_in_db(new_shifts)
+        return self._diff_schedules_in_memory(new_shifts)
 
     def is_empty(self) -> bool:
         """Check if database has any shifts"""
@@ -516,6 +1571,9 @@ class PostgresDatabase(DiscordFormatter):
         Keeps the most recently updated record for each (date, label, time, role) combination.
         This ensures only ONE person is assigned to each shift.
 
+        The slot unique index prevents new duplicates, so this is only needed
+        for manual cleanup of legacy data.
+
         Returns:
             Number of duplicate records removed
         """
@@ -532,7 +1590,7 @@ class PostgresDatabase(DiscordFormatter):
                             SELECT id,
                                    ROW_NUMBER() OVER (
                                        PARTITION BY date, label, time, role
-                                       ORDER BY updated_at DESC
+                                       ORDER BY updated_at DESC, id DESC
                                    ) AS row_num
                             FROM shifts
                         ) duplicates
@@ -540,7 +1598,14 @@ class PostgresDatabase(DiscordFormatter):
                     )
                 """)
                 deleted_count = cursor.rowcount
+                generation = None
+                if deleted_count:
+                    generation = self._bump_refresh_generation(cursor)
+                    self._rebuild_daily_schedules(cursor)
+                    self._refresh_shift_stats(cursor)
                 self.connection.commit()
+                if generation is not None:
+                    self.shift_cache.set_generation(generation)
                 return deleted_count
         except Exception as e:
             self.connection.rollback()
@@ -563,7 +1628,7 @@ class PostgresDatabase(DiscordFormatter):
                         SELECT id,
                                ROW_NUMBER() OVER (
                                    PARTITION BY date, label, time, role
-                                   ORDER BY updated_at DESC
+                                   ORDER BY updated_at DESC, id DESC
                                ) AS row_num
                         FROM shifts
                     ) duplicates
@@ -588,12 +1653,73 @@ class PostgresDatabase(DiscordFormatter):
                 count = cursor.fetchone()[0]
 
                 cursor.execute("DELETE FROM shifts")
+                cursor.execute("DELETE FROM daily_schedule")
+                self._refresh_shift_stats(cursor)
+                generation = self._bump_refresh_generation(cursor)
                 self.connection.commit()
+                self.shift_cache.set_generation(generation)
                 return count
         except Exception as e:
             self.connection.rollback()
             raise Exception(f"Failed to clear shifts: {e}")
 
+    def _notify_changed_dates(self, cursor, changed_dates: List[str]) -> None:
+        """Send a shift_updates notification (delivered on commit) for the given dates"""
+        if not changed_dates:
+            return
+        payload = ",".join(changed_dates)
+        # NOTIFY payloads are limited to 8000 bytes
+        if len(payload) > 7900:
+            payload = "*"
+        cursor.execute("SELECT pg_notify('shift_updates', %s)", (payload,))
+
+    def create_change_listener(self):
+        """
+        Open a dedicated autocommit connection listening on shift_updates.
+
+        The caller polls it (e.g. via the event loop's add_reader) and passes
+        each notification to handle_change_notification().
+
+        Returns:
+            psycopg2 connection with LISTEN shift_updates active
+        """
+        listener = self._open_connection()
+        listener.autocommit = True
+        with listener.cursor() as cursor:
+            cursor.execute("LISTEN shift_updates")
+        return listener
+
+    def handle_change_notification(self, pid: int, payload: str) -> Optional[set]:
+        """
+        Process a shift_updates notification.
+
+        Writes from other processes bypass update_data(), so the schedule documents
+        are resynced and the read cache is moved to a new generation.
+
+        Args:
+            pid: Backend PID of the notifying session
+            payload: Comma-separated YYYY-MM-DD dates, or '*' for all dates
+
+        Returns:
+            Set of affected dates, or None if every date may be affected
+        """
+        self._ensure_connection()
+        dates = None if payload == "*" else sorted({d for d in payload.split(",") if d})
+        if pid != self.connection.get_backend_pid():
+            try:
+                with self.connection.cursor() as cursor:
+                    generation = self._bump_refresh_generation(cursor)
+                    self._rebuild_daily_schedules(cursor, dates)
+                    self._refresh_shift_stats(cursor)
+                    self.connection.commit()
+                self.shift_cache.set_generation(generation)
+            except Exception as e:
+                self.connection.rollback()
+                print(f"Warning: Failed to sync after external change: {e}")
+                self.shift_cache.invalidate()
+
+        return None if dates is None else set(dates)
+
     def close(self):
         """Close database connection"""
         if self.connection:
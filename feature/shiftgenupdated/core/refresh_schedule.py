@@ -0,0 +1,136 @@
+"""
+Adaptive scheduling of ShiftGen refreshes based on how often schedules change
+"""
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+
+class AdaptiveRefreshScheduler:
+    """
+    Chooses the interval until the next automatic refresh.
+
+    After each refresh the interval adapts to what changed:
+    - changes in the upcoming week (schedules being published or swapped)
+      cut it to a quarter,
+    - changes further out halve it,
+    - no changes stretch it by half again,
+    always staying between min_interval and max_interval. A manual burst
+    uses burst_interval until it expires, regardless of the adapted interval.
+    """
+
+    def __init__(self, min_interval: timedelta, max_interval: timedelta,
+                 initial_interval: timedelta = None, burst_interval: timedelta = None,
+                 upcoming_days: int = 7, history_size: int = 24):
+        """
+        Args:
+            min_interval: Shortest interval between automatic refreshes
+            max_interval: Longest interval between automatic refreshes
+            initial_interval: Interval before any refresh has been recorded (default: max)
+            burst_interval: Interval while a manual burst is active (default: min)
+            upcoming_days: Changes to dates within this many days count as upcoming
+            history_size: Number of recent refreshes kept for monitoring
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.burst_interval = burst_interval or min_interval
+        self.upcoming_days = upcoming_days
+        self.interval = self._clamp(initial_interval or max_interval)
+
+        self.last_refresh_at: Optional[datetime] = None
+        self.retry_at: Optional[datetime] = None
+        self.burst_until: Optional[datetime] = None
+        self.history = deque(maxlen=history_size)
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def record_refresh(self, change_counts: Dict[str, int], at: datetime) -> timedelta:
+        """
+        Record a successful refresh and adapt the interval.
+
+        Args:
+            change_counts: Changed slots per date (YYYY-MM-DD) in this refresh;
+                dates before today are ignored
+            at: When the refresh finished (timezone-aware, PST)
+
+        Returns:
+            The new interval
+        """
+        today = at.date()
+        upcoming_changes = 0
+        total_changes = 0
+        for date_str, count in change_counts.items():
+            days_ahead = (datetime.strptime(date_str, "%Y-%m-%d").date() - today).days
+            # Past dates drop out of the published schedule; that isn't activity
+            if days_ahead < 0:
+                continue
+            total_changes += count
+            if days_ahead < self.upcoming_days:
+                upcoming_changes += count
+
+        if upcoming_changes:
+            self.interval = self._clamp(self.interval / 4)
+        elif total_changes:
+            self.interval = self._clamp(self.interval / 2)
+        else:
+            self.interval = self._clamp(self.interval * 1.5)
+
+        self.mark_refreshed(at)
+        self.history.append({
+            'at': at,
+            'changes': total_changes,
+            'upcoming_changes': upcoming_changes,
+            'interval': self.interval
+        })
+        return self.interval
+
+    def mark_refreshed(self, at: datetime) -> None:
+        """Record a successful refresh without adapting the interval (e.g. after a reset)"""
+        self.last_refresh_at = at
+        self.retry_at = None
+
+    def record_failure(self, at: datetime) -> None:
+        """Record a failed refresh; the next attempt waits at least min_interval"""
+        self.retry_at = at + self.min_interval
+
+    def start_burst(self, duration: timedelta, at: datetime) -> None:
+        """Refresh every burst_interval until duration has passed"""
+        self.burst_until = at + duration
+
+    def stop_burst(self) -> None:
+        """End a manual burst early"""
+        self.burst_until = None
+
+    def in_burst(self, at: datetime) -> bool:
+        """True while a manual burst is active"""
+        return self.burst_until is not None and at < self.burst_until
+
+    def current_interval(self, at: datetime) -> timedelta:
+        """Interval in effect at a moment (the burst interval during a burst)"""
+        if self.in_burst(at):
+            return min(self.burst_interval, self.interval)
+        return self.interval
+
+    def next_refresh_at(self, at: datetime) -> datetime:
+        """
+        Get when the next automatic refresh is due.
+
+        Returns:
+            Due time; at itself if no refresh has been recorded yet
+        """
+        due = at if self.last_refresh_at is None else self.last_refresh_at + self.current_interval(at)
+        if self.retry_at is not None and self.retry_at > due:
+            return self.retry_at
+        return due
+
+    def get_stats(self, at: datetime) -> Dict:
+        """Return the current schedule and recent change counts for monitoring"""
+        recent = list(self.history)[-6:]
+        return {
+            'interval_minutes': self.current_interval(at).total_seconds() / 60,
+            'next_refresh_at': self.next_refresh_at(at),
+            'burst_until': self.burst_until if self.in_burst(at) else None,
+            'recent_changes': [entry['changes'] for entry in recent],
+            'recent_upcoming_changes': [entry['upcoming_changes'] for entry in recent]
+        }
@@ -0,0 +1,87 @@
+"""
+Single-flight coordination for expensive async operations (schedule refreshes)
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """
+    Runs at most one instance of an operation at a time.
+
+    Callers that arrive while a run is in flight await that run's result instead
+    of starting their own. A successful result is reused for callers arriving
+    within freshness_seconds after it finished. force=True waits for any run in
+    flight and then always starts a new one (for callers that must see their
+    own run, e.g. after clearing the data it would otherwise race with).
+    """
+
+    def __init__(self, freshness_seconds: float = 0, is_success: Callable[[Any], bool] = bool):
+        """
+        Args:
+            freshness_seconds: How long a successful result is reused
+            is_success: Decides whether a result may be reused (failures never are)
+        """
+        self.freshness_seconds = freshness_seconds
+        self.is_success = is_success
+
+        self._task: Optional[asyncio.Task] = None
+        self._last_result: Any = None
+        self._last_finished: Optional[float] = None
+
+        self.started = 0
+        self.joined = 0
+        self.served_fresh = 0
+
+    @property
+    def in_flight(self) -> bool:
+        """True while a run is in progress"""
+        return self._task is not None and not self._task.done()
+
+    def fresh_result_age(self) -> Optional[float]:
+        """Seconds since the last successful run finished, if it's still fresh"""
+        if self._last_finished is None or not self.is_success(self._last_result):
+            return None
+        age = time.monotonic() - self._last_finished
+        return age if age < self.freshness_seconds else None
+
+    async def run(self, operation: Callable[[], Awaitable[Any]], force: bool = False) -> Any:
+        """
+        Run operation, join the run in flight, or reuse a fresh result.
+
+        Args:
+            operation: Zero-argument coroutine function to run
+            force: Never join or reuse; wait for the run in flight, then start a new one
+
+        Returns:
+            The operation's result (possibly from another caller's run)
+        """
+        while self.in_flight:
+            if not force:
+                self.joined += 1
+                return await asyncio.shield(self._task)
+            # Let the current run finish; its failure is its own caller's problem
+            await asyncio.wait([self._task])
+
+        if not force and self.fresh_result_age() is not None:
+            self.served_fresh += 1
+            return self._last_result
+
+        self.started += 1
+        self._task = asyncio.create_task(operation())
+        self._task.add_done_callback(self._record_result)
+        return await asyncio.shield(self._task)
+
+    def _record_result(self, task: asyncio.Task) -> None:
+        self._last_finished = time.monotonic()
+        self._last_result = None if task.cancelled() or task.exception() else task.result()
+
+    def get_stats(self) -> Dict:
+        """Return run/join/reuse counters for monitoring"""
+        return {
+            'in_flight': self.in_flight,
+            'started': self.started,
+            'joined': self.joined,
+            'served_fresh': self.served_fresh
+        }
@@ -0,0 +1,1018 @@
+"""
+SQLite database manager for shift schedules (local development and benchmarking)
+"""
+import csv
+import io
+import json
+import os
+import gzip
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+from dotenv import load_dotenv
+
+from .models import ParsedScheduleData
+from .name_mapper import NameMapper
+from .discord_formatter import DiscordFormatter
+from .cache import GenerationCache
+from .instrumentation import QueryMetrics, instrument_storage
+from .config import SHIFT_RETENTION_MONTHS, BACKUP_FULL_INTERVAL_DAYS
+
+
+@instrument_storage
+class SQLiteDatabase(DiscordFormatter):
+    """
+    SQLite database manager with the same interface as PostgresDatabase.
+
+    Needs no database server, so the whole refresh and display pipeline can run
+    on one machine. Postgres-only features (LISTEN/NOTIFY, partitions) are not
+    available: displays are refreshed by the bot after each scrape, and
+    archive_old_partitions() moves old months into shift_archive row by row.
+    """
+
+    def __init__(self, db_path: str = None, name_mapper: NameMapper = None):
+        """
+        Open (or create) the SQLite database file.
+
+        Args:
+            db_path: Path to the database file. Defaults to SQLITE_DB_PATH from the
+                environment, then schedule_outputs/shiftgen.db
+            name_mapper: NameMapper instance for standardizing names
+        """
+        load_dotenv()
+        self.db_path = db_path or os.getenv('SQLITE_DB_PATH', 'schedule_outputs/shiftgen.db')
+        self.name_mapper = name_mapper or NameMapper()
+        # Per-method latency histograms and slow-call log (see instrument_storage)
+        self.query_metrics = QueryMetrics()
+        self.connection = None
+        # Read-through cache for get_shifts_for_date, keyed by date and refresh generation
+        self.shift_cache = GenerationCache(max_size=32)
+        self._connect()
+        self._initialize_schema()
+        self.shift_cache.set_generation(self.get_refresh_generation())
+        self.last_changed_dates: List[str] = []
+        # Changed slots per date (YYYY-MM-DD) in the last update_data call
+        self.last_change_counts: Dict[str, int] = {}
+
+    def _connect(self):
+        """Establish database connection"""
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Created on the main thread, used from the bot's storage worker thread
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # WAL lets readers run alongside the refresh transaction
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+
+    def _ensure_connection(self):
+        """Ensure database connection is open"""
+        if self.connection is None:
+            self._connect()
+
+    def _initialize_schema(self):
+        """Create database tables if they don't exist"""
+        schema_sql = """
+        -- Main shifts table, one row per (date, label, time, role) slot
+        CREATE TABLE IF NOT EXISTS shifts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            label TEXT NOT NULL,
+            time TEXT NOT NULL,
+            person TEXT NOT NULL,
+            role TEXT NOT NULL,
+            site TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_shifts_slot ON shifts(date, label, time, role);
+        CREATE INDEX IF NOT EXISTS idx_shifts_role ON shifts(role);
+        CREATE INDEX IF NOT EXISTS idx_shifts_person ON shifts(person);
+
+        -- Gzip-compressed CSV of shifts older than the retention window, one row per month
+        CREATE TABLE IF NOT EXISTS shift_archive (
+            month TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Metadata table for tracking refreshes
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Append-only log of slot changes written by each refresh
+        CREATE TABLE IF NOT EXISTS shift_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            generation INTEGER NOT NULL,
+            change_type TEXT NOT NULL,
+            date TEXT NOT NULL,
+            label TEXT NOT NULL,
+            time TEXT NOT NULL,
+            role TEXT NOT NULL,
+            old_person TEXT,
+            new_person TEXT,
+            old_site TEXT,
+            new_site TEXT,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_shift_changes_changed_at ON shift_changes(changed_at);
+
+        -- Shift state as of the last confirmed backup (base for delta backups)
+        CREATE TABLE IF NOT EXISTS backup_state (
+            date TEXT NOT NULL,
+            label TEXT NOT NULL,
+            time TEXT NOT NULL,
+            role TEXT NOT NULL,
+            person TEXT NOT NULL,
+            site TEXT NOT NULL,
+            PRIMARY KEY (date, label, time, role)
+        );
+
+        CREATE TABLE IF NOT EXISTS backup_pending (
+            date TEXT NOT NULL,
+            label TEXT NOT NULL,
+            time TEXT NOT NULL,
+            role TEXT NOT NULL,
+            person TEXT NOT NULL,
+            site TEXT NOT NULL,
+            PRIMARY KEY (date, label, time, role)
+        );
+
+        -- Single-row summary of shifts, rewritten by every transaction that changes shifts
+        CREATE TABLE IF NOT EXISTS shift_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            record_count INTEGER NOT NULL DEFAULT 0,
+            min_date TEXT,
+            max_date TEXT,
+            role_counts TEXT NOT NULL DEFAULT '{}',
+            site_counts TEXT NOT NULL DEFAULT '{}',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Start alerting from the current end of the change log
+        INSERT OR IGNORE INTO metadata (key, value)
+        SELECT 'alert_cursor', CAST(COALESCE(MAX(seq), 0) AS TEXT) FROM shift_changes;
+        """
+
+        try:
+            self.connection.executescript(schema_sql)
+            self._refresh_shift_stats(self.connection.cursor())
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to initialize database schema: {e}")
+
+    def update_data(self, new_data: List[Dict]) -> tuple[int, int, List[dict]]:
+        """
+        Replace all data with new data (full refresh strategy).
+        Validates data using Pydantic models before insertion.
+
+        The new snapshot is merged into shifts in one transaction, and every
+        added, removed or modified slot is appended to the shift_changes log.
+        Dates before the retention cutoff are left alone, so archived months
+        are not re-inserted and logged as added.
+
+        Args:
+            new_data: List of raw shift dictionaries
+
+        Returns:
+            Tuple of (valid_count, invalid_count, invalid_records)
+        """
+        self._ensure_connection()
+        # Standardize names first
+        for record in new_data:
+            role = record.get('role', '')
+            raw_person = record.get('person', '')
+            record['person'] = self.name_mapper.standardize_name(raw_person, role)
+
+        # Validate using Pydantic
+        valid_shifts, invalid_records = ParsedScheduleData.validate_shifts(new_data)
+
+        if not valid_shifts:
+            return 0, len(invalid_records), invalid_records
+
+        # One row per slot; later records win, matching the slot unique index.
+        # Months past retention were archived; the scraper still returns them.
+        cutoff = self._retention_cutoff().strftime('%Y-%m-%d')
+        incoming = {}
+        for shift in valid_shifts:
+            if shift.date < cutoff:
+                continue
+            incoming[(shift.date, shift.label, shift.time, shift.role)] = (
+                shift.date, shift.label, shift.time, shift.role, shift.person, shift.site
+            )
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("DROP TABLE IF EXISTS temp.incoming_shifts")
+            cursor.execute("""
+                CREATE TEMP TABLE incoming_shifts (
+                    date TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    time TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    person TEXT NOT NULL,
+                    site TEXT NOT NULL,
+                    PRIMARY KEY (date, label, time, role)
+                )
+            """)
+            cursor.executemany("""
+                INSERT INTO incoming_shifts (date, label, time, role, person, site)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, list(incoming.values()))
+
+            generation = self._bump_refresh_generation(cursor)
+
+            # Record every added, removed and modified slot before applying the merge
+            cursor.execute("""
+                INSERT INTO shift_changes
+                (generation, change_type, date, label, time, role,
+                 old_person, new_person, old_site, new_site)
+                SELECT ?, change_type, date, label, time, role,
+                       old_person, new_person, old_site, new_site
+                FROM (
+                    SELECT CASE WHEN s.date IS NULL THEN 'added' ELSE 'modified' END AS change_type,
+                           i.date, i.label, i.time, i.role,
+                           s.person AS old_person, i.person AS new_person,
+                           s.site AS old_site, i.site AS new_site
+                    FROM incoming_shifts i
+                    LEFT JOIN shifts s
+                        ON s.date = i.date AND s.label = i.label
+                       AND s.time = i.time AND s.role = i.role
+                    WHERE s.date IS NULL
+                       OR s.person IS NOT i.person
+                       OR s.site IS NOT i.site
+                    UNION ALL
+                    SELECT 'removed', s.date, s.label, s.time, s.role,
+                           s.person, NULL, s.site, NULL
+                    FROM shifts s
+                    LEFT JOIN incoming_shifts i
+                        ON i.date = s.date AND i.label = s.label
+                       AND i.time = s.time AND i.role = s.role
+                    WHERE i.date IS NULL AND s.date >= ?
+                )
+                ORDER BY date, label, time, role
+            """, (generation, cutoff))
+
+            # Apply the merge: drop slots that disappeared, upsert the rest
+            cursor.execute("""
+                DELETE FROM shifts
+                WHERE date >= ?
+                  AND NOT EXISTS (
+                    SELECT 1 FROM incoming_shifts i
+                    WHERE i.date = shifts.date AND i.label = shifts.label
+                      AND i.time = shifts.time AND i.role = shifts.role
+                )
+            """, (cutoff,))
+            cursor.execute("""
+                INSERT INTO shifts (date, label, time, person, role, site)
+                SELECT date, label, time, person, role, site FROM incoming_shifts WHERE true
+                ON CONFLICT (date, label, time, role)
+                DO UPDATE SET
+                    person = excluded.person,
+                    site = excluded.site,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE shifts.person IS NOT excluded.person
+                   OR shifts.site IS NOT excluded.site
+            """)
+            cursor.execute("DROP TABLE temp.incoming_shifts")
+            self._refresh_shift_stats(cursor)
+
+            # Update metadata
+            cursor.execute("""
+                INSERT INTO metadata (key, value, updated_at)
+                VALUES ('last_refresh', ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (key) DO UPDATE SET
+                    value = excluded.value,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (datetime.now().isoformat(),))
+
+            cursor.execute(
+                "SELECT date, COUNT(*) FROM shift_changes WHERE generation = ? GROUP BY date ORDER BY date",
+                (generation,)
+            )
+            change_counts = {row[0]: row[1] for row in cursor.fetchall()}
+
+            self.connection.commit()
+            self.shift_cache.set_generation(generation)
+            self.last_changed_dates = list(change_counts)
+            self.last_change_counts = change_counts
+            return len(valid_shifts), len(invalid_records), invalid_records
+
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to update database: {e}")
+
+    def _rows_to_shifts(self, rows) -> List[Dict]:
+        """Convert shift rows to plain dictionaries"""
+        return [
+            {
+                'date': row['date'],
+                'label': row['label'],
+                'time': row['time'],
+                'person': row['person'],
+                'role': row['role'],
+                'site': row['site']
+            }
+            for row in rows
+        ]
+
+    def get_shifts_for_date(self, target_date: str) -> List[Dict]:
+        """
+        Get all shifts for a specific date.
+        Results are cached per refresh generation.
+
+        Args:
+            target_date: Date in YYYY-MM-DD format
+
+        Returns:
+            List of shift dictionaries
+        """
+        cached = self.shift_cache.get(target_date)
+        if cached is not None:
+            return [dict(row) for row in cached]
+
+        self._ensure_connection()
+        try:
+            rows = self.connection.execute("""
+                SELECT date, label, time, person, role, site
+                FROM shifts
+                WHERE date = ?
+                ORDER BY date, label, time, role
+            """, (target_date,)).fetchall()
+            shifts = self._rows_to_shifts(rows)
+        except Exception as e:
+            raise Exception(f"Failed to fetch shifts for date {target_date}: {e}")
+
+        self.shift_cache.put(target_date, shifts)
+        return [dict(row) for row in shifts]
+
+    def get_shifts_for_range(self, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Get all shifts between two dates (inclusive) with one range query.
+        Results are cached per refresh generation, per range and per date.
+
+        Args:
+            start_date: First date in YYYY-MM-DD format
+            end_date: Last date in YYYY-MM-DD format
+
+        Returns:
+            List of shift dictionaries ordered by date, label, time and role
+        """
+        cache_key = ('range', start_date, end_date)
+        cached = self.shift_cache.get(cache_key)
+        if cached is not None:
+            return [dict(row) for row in cached]
+
+        self._ensure_connection()
+        try:
+            rows = self.connection.execute("""
+                SELECT date, label, time, person, role, site
+                FROM shifts
+                WHERE date BETWEEN ? AND ?
+                ORDER BY date, label, time, role
+            """, (start_date, end_date)).fetchall()
+            shifts = self._rows_to_shifts(rows)
+        except Exception as e:
+            raise Exception(f"Failed to fetch shifts for {start_date} to {end_date}: {e}")
+
+        shifts_by_date = {day: [] for day in self._date_range(start_date, end_date)}
+        for shift in shifts:
+            shifts_by_date[shift['date']].append(shift)
+        for day, day_shifts in shifts_by_date.items():
+            self.shift_cache.put(day, day_shifts)
+
+        self.shift_cache.put(cache_key, shifts)
+        return [dict(row) for row in shifts]
+
+    def get_daily_schedule_document(self, target_date: str) -> Dict:
+        """
+        Get the schedule document for a date, cached per refresh generation.
+
+        Args:
+            target_date: Date in YYYY-MM-DD format
+
+        Returns:
+            Document dictionary (see DiscordFormatter.build_daily_schedule_document)
+        """
+        cache_key = ('document', target_date)
+        cached = self.shift_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        document = self.build_daily_schedule_document(target_date, self.get_shifts_for_date(target_date))
+        self.shift_cache.put(cache_key, document)
+        return document
+
+    def get_all_shifts(self) -> List[Dict]:
+        """Get all shifts from database"""
+        self._ensure_connection()
+        try:
+            rows = self.connection.execute("""
+                SELECT date, label, time, person, role, site
+                FROM shifts
+                ORDER BY date, label, time, role
+            """).fetchall()
+            return self._rows_to_shifts(rows)
+        except Exception as e:
+            raise Exception(f"Failed to fetch all shifts: {e}")
+
+    @staticmethod
+    def _add_months(month_start: date, months: int) -> date:
+        """Return the first day of the month `months` after month_start (may be negative)"""
+        month_index = month_start.year * 12 + month_start.month - 1 + months
+        return date(month_index // 12, month_index % 12 + 1, 1)
+
+    def _retention_cutoff(self, months_to_keep: int = SHIFT_RETENTION_MONTHS) -> date:
+        """First day of the oldest month kept live; earlier months are archived"""
+        return self._add_months(date.today().replace(day=1), -months_to_keep)
+
+    def archive_old_partitions(self, months_to_keep: int = SHIFT_RETENTION_MONTHS) -> int:
+        """
+        Move shifts from months before the retention window into shift_archive.
+        SQLite has no partitions, so each month's rows are exported and deleted.
+
+        Args:
+            months_to_keep: Number of past months to keep in addition to the current one
+
+        Returns:
+            Number of months archived
+        """
+        cutoff = self._retention_cutoff(months_to_keep).strftime('%Y-%m-%d')
+
+        self._ensure_connection()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                "SELECT DISTINCT substr(date, 1, 7) FROM shifts WHERE date < ? ORDER BY 1",
+                (cutoff,)
+            )
+            months = [row[0] for row in cursor.fetchall()]
+
+            for month in months:
+                rows = cursor.execute("""
+                    SELECT date, label, time, person, role, site
+                    FROM shifts
+                    WHERE substr(date, 1, 7) = ?
+                    ORDER BY date, label, time, role
+                """, (month,)).fetchall()
+
+                buffer = io.BytesIO()
+                with gzip.GzipFile(fileobj=buffer, mode='wb') as compressed:
+                    text = io.TextIOWrapper(compressed, encoding='utf-8', newline='')
+                    writer = csv.writer(text)
+                    writer.writerow(['date', 'label', 'time', 'person', 'role', 'site'])
+                    writer.writerows(tuple(row) for row in rows)
+                    text.flush()
+                    text.detach()
+
+                cursor.execute("""
+                    INSERT INTO shift_archive (month, row_count, data)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (month) DO UPDATE SET
+                        row_count = excluded.row_count,
+                        data = excluded.data,
+                        archived_at = CURRENT_TIMESTAMP
+                """, (f"{month}-01", len(rows), buffer.getvalue()))
+                cursor.execute("DELETE FROM shifts WHERE substr(date, 1, 7) = ?", (month,))
+
+            generation = None
+            if months:
+                generation = self._bump_refresh_generation(cursor)
+                self._refresh_shift_stats(cursor)
+            self.connection.commit()
+            if generation is not None:
+                self.shift_cache.set_generation(generation)
+            return len(months)
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to archive old partitions: {e}")
+
+    def needs_full_backup(self, interval_days: int = BACKUP_FULL_INTERVAL_DAYS) -> bool:
+        """Check whether the next backup should be a full snapshot rather than a delta"""
+        self._ensure_connection()
+        try:
+            result = self.connection.execute(
+                "SELECT value FROM metadata WHERE key = 'last_full_backup'"
+            ).fetchone()
+            if not result:
+                return True
+            last_full = datetime.fromisoformat(result[0])
+            return (datetime.now() - last_full).days >= interval_days
+        except Exception:
+            return True
+
+    def write_backup(self, fileobj, full: bool = True) -> int:
+        """
+        Write a backup as gzip-compressed CSV into a binary file object.
+        Same file format as PostgresDatabase.write_backup(), so backups from
+        either backend can be restored into the other.
+
+        Args:
+            fileobj: Writable binary file object (e.g. a temporary file)
+            full: Write a full snapshot instead of a delta
+
+        Returns:
+            Number of rows written
+        """
+        self._ensure_connection()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("DELETE FROM backup_pending")
+            cursor.execute("""
+                INSERT INTO backup_pending (date, label, time, role, person, site)
+                SELECT date, label, time, role, person, site FROM shifts
+            """)
+
+            if full:
+                header = ['date', 'label', 'time', 'person', 'role', 'site']
+                cursor.execute("""
+                    SELECT date, label, time, person, role, site
+                    FROM backup_pending
+                    ORDER BY date, label, time, role
+                """)
+            else:
+                header = ['op', 'date', 'label', 'time', 'role', 'person', 'site']
+                cursor.execute("""
+                    SELECT 'upsert' AS op, p.date, p.label, p.time, p.role, p.person, p.site
+                    FROM backup_pending p
+                    LEFT JOIN backup_state s
+                        ON s.date = p.date AND s.label = p.label
+                       AND s.time = p.time AND s.role = p.role
+                    WHERE s.date IS NULL
+                       OR s.person IS NOT p.person
+                       OR s.site IS NOT p.site
+                    UNION ALL
+                    SELECT 'delete' AS op, s.date, s.label, s.time, s.role, NULL, NULL
+                    FROM backup_state s
+                    LEFT JOIN backup_pending p
+                        ON p.date = s.date AND p.label = s.label
+                       AND p.time = s.time AND p.role = s.role
+                    WHERE p.date IS NULL
+                    ORDER BY 2, 3, 4, 5
+                """)
+
+            row_count = 0
+            with gzip.GzipFile(fileobj=fileobj, mode='wb') as compressed:
+                text = io.TextIOWrapper(compressed, encoding='utf-8', newline='')
+                writer = csv.writer(text)
+                writer.writerow(header)
+                for row in cursor:
+                    writer.writerow(tuple(row))
+                    row_count += 1
+                text.flush()
+                text.detach()
+
+            self.connection.commit()
+            return row_count
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to write backup: {e}")
+
+    def commit_backup(self, full: bool) -> None:
+        """
+        Confirm the last write_backup() after it was uploaded.
+        The captured state becomes the base for the next delta backup.
+
+        Args:
+            full: Whether the confirmed backup was a full snapshot
+        """
+        self._ensure_connection()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("DELETE FROM backup_state")
+            cursor.execute("INSERT INTO backup_state SELECT * FROM backup_pending")
+            cursor.execute("DELETE FROM backup_pending")
+            if full:
+                cursor.execute("""
+                    INSERT INTO metadata (key, value, updated_at)
+                    VALUES ('last_full_backup', ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT (key) DO UPDATE SET
+                        value = excluded.value,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (datetime.now().isoformat(),))
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to commit backup: {e}")
+
+    def restore_backup(self, full_file, delta_files: List = None) -> int:
+        """
+        Rebuild the shifts table from a full backup plus any number of deltas.
+
+        Args:
+            full_file: Readable file object with an uncompressed full backup CSV
+            delta_files: Readable file objects with uncompressed delta CSVs, oldest first
+
+        Returns:
+            Number of shifts after the restore
+        """
+        def read_rows(fileobj):
+            if isinstance(fileobj.read(0), bytes):
+                fileobj = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+            return csv.DictReader(fileobj)
+
+        restored = {}
+        for row in read_rows(full_file):
+            restored[(row['date'], row['label'], row['time'], row['role'])] = row
+        for delta_file in delta_files or []:
+            for row in read_rows(delta_file):
+                key = (row['date'], row['label'], row['time'], row['role'])
+                if row['op'] == 'upsert':
+                    restored[key] = row
+                else:
+                    restored.pop(key, None)
+
+        self._ensure_connection()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("DELETE FROM shifts")
+            cursor.executemany("""
+                INSERT INTO shifts (date, label, time, person, role, site)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (row['date'], row['label'], row['time'], row['person'], row['role'], row['site'])
+                for row in restored.values()
+            ])
+
+            # The restored state is the new delta base; force a full backup next
+            cursor.execute("DELETE FROM backup_state")
+            cursor.execute("""
+                INSERT INTO backup_state (date, label, time, role, person, site)
+                SELECT date, label, time, role, person, site FROM shifts
+            """)
+            cursor.execute("DELETE FROM metadata WHERE key = 'last_full_backup'")
+
+            self._refresh_shift_stats(cursor)
+            generation = self._bump_refresh_generation(cursor)
+            self.connection.commit()
+            self.shift_cache.set_generation(generation)
+            return len(restored)
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to restore backup: {e}")
+
+    def _refresh_shift_stats(self, cursor) -> None:
+        """Recompute the shift_stats row inside the caller's transaction"""
+        cursor.execute("""
+            INSERT INTO shift_stats
+            (id, record_count, min_date, max_date, role_counts, site_counts, updated_at)
+            SELECT 1, COUNT(*), MIN(date), MAX(date),
+                   (SELECT json_group_object(role, n)
+                    FROM (SELECT role, COUNT(*) AS n FROM shifts GROUP BY role)),
+                   (SELECT json_group_object(site, n)
+                    FROM (SELECT site, COUNT(*) AS n FROM shifts GROUP BY site)),
+                   CURRENT_TIMESTAMP
+            FROM shifts
+            WHERE true
+            ON CONFLICT (id) DO UPDATE SET
+                record_count = excluded.record_count,
+                min_date = excluded.min_date,
+                max_date = excluded.max_date,
+                role_counts = excluded.role_counts,
+                site_counts = excluded.site_counts,
+                updated_at = excluded.updated_at
+        """)
+
+    def get_shift_stats(self) -> Dict:
+        """
+        Get the shift summary maintained at refresh time, cached per refresh generation.
+
+        Returns:
+            Dictionary with record_count, min_date, max_date (YYYY-MM-DD or None),
+            last_refresh (ISO timestamp or None), role_counts and site_counts
+        """
+        cached = self.shift_cache.get('stats')
+        if cached is not None:
+            return dict(cached)
+
+        self._ensure_connection()
+        try:
+            row = self.connection.execute("""
+                SELECT s.record_count, s.min_date, s.max_date, s.role_counts, s.site_counts,
+                       (SELECT value FROM metadata WHERE key = 'last_refresh') AS last_refresh
+                FROM (SELECT 1) one
+                LEFT JOIN shift_stats s ON s.id = 1
+            """).fetchone()
+        except Exception as e:
+            raise Exception(f"Failed to get shift stats: {e}")
+
+        stats = {
+            'record_count': row['record_count'] or 0,
+            'min_date': row['min_date'],
+            'max_date': row['max_date'],
+            'last_refresh': row['last_refresh'],
+            'role_counts': json.loads(row['role_counts'] or '{}'),
+            'site_counts': json.loads(row['site_counts'] or '{}')
+        }
+        self.shift_cache.put('stats', stats)
+        return dict(stats)
+
+    def get_date_range(self) -> tuple[Optional[str], Optional[str]]:
+        """
+        Get the minimum and maximum dates in the database.
+
+        Returns:
+            Tuple of (min_date, max_date) in YYYY-MM-DD format, or (None, None) if empty
+        """
+        stats = self.get_shift_stats()
+        return stats['min_date'], stats['max_date']
+
+    def get_record_count(self) -> int:
+        """Get total number of shifts in database"""
+        return self.get_shift_stats()['record_count']
+
+    def get_last_refresh_time(self) -> Optional[str]:
+        """Get timestamp of last database refresh"""
+        return self.get_shift_stats()['last_refresh']
+
+    def get_last_change_counts(self) -> Dict[str, int]:
+        """Get changed slots per date (YYYY-MM-DD) from the last update_data call"""
+        return dict(self.last_change_counts)
+
+    def get_refresh_generation(self) -> int:
+        """Get the refresh generation, incremented every time shift data is rewritten"""
+        try:
+            result = self.connection.execute(
+                "SELECT value FROM metadata WHERE key = 'refresh_generation'"
+            ).fetchone()
+            return int(result[0]) if result else 0
+        except Exception:
+            return 0
+
+    def _bump_refresh_generation(self, cursor) -> int:
+        """Increment the refresh generation inside the caller's transaction"""
+        cursor.execute("""
+            INSERT INTO metadata (key, value, updated_at)
+            VALUES ('refresh_generation', '1', CURRENT_TIMESTAMP)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CAST(CAST(metadata.value AS INTEGER) + 1 AS TEXT),
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING value
+        """)
+        return int(cursor.fetchone()[0])
+
+    def get_cache_stats(self) -> Dict:
+        """Get hit/miss counters for the shift read cache"""
+        return self.shift_cache.get_stats()
+
+    def get_query_stats(self) -> List[Dict]:
+        """Get per-method latency percentiles and row counts for this storage backend"""
+        return self.query_metrics.get_stats()
+
+    def get_alert_cursor(self) -> int:
+        """Get the sequence number of the last shift change that was alerted"""
+        try:
+            result = self.connection.execute(
+                "SELECT value FROM metadata WHERE key = 'alert_cursor'"
+            ).fetchone()
+            return int(result[0]) if result else 0
+        except Exception:
+            return 0
+
+    def get_unalerted_changes(self, role: Optional[str] = 'Scribe') -> tuple[List[Dict], int]:
+        """
+        Read shift changes logged after the alert cursor.
+        See PostgresDatabase.get_unalerted_changes().
+
+        Args:
+            role: Only return changes for this role (None for all roles)
+
+        Returns:
+            Tuple of (changes, last_seq)
+        """
+        self._ensure_connection()
+        try:
+            alert_cursor = self.get_alert_cursor()
+            last_seq = self.connection.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM shift_changes"
+            ).fetchone()[0]
+            rows = self.connection.execute("""
+                SELECT seq, change_type, date, label, time, role,
+                       old_person, new_person, old_site, new_site
+                FROM shift_changes
+                WHERE seq > ? AND seq <= ?
+                  AND (? IS NULL OR role = ?)
+                  AND (change_type <> 'modified' OR old_person IS NOT new_person)
+                ORDER BY seq
+            """, (alert_cursor, last_seq, role, role)).fetchall()
+        except Exception as e:
+            raise Exception(f"Failed to read shift changes: {e}")
+
+        changes = []
+        for row in rows:
+            slot = {'date': row['date'], 'label': row['label'], 'time': row['time'], 'role': row['role']}
+            old_record = None
+            if row['change_type'] != 'added':
+                old_record = {**slot, 'person': row['old_person'], 'site': row['old_site']}
+            new_record = None
+            if row['change_type'] != 'removed':
+                new_record = {**slot, 'person': row['new_person'], 'site': row['new_site']}
+            changes.append({
+                'seq': row['seq'],
+                'type': row['change_type'],
+                'old': old_record,
+                'new': new_record
+            })
+
+        return changes, max(alert_cursor, last_seq)
+
+    def advance_alert_cursor(self, seq: int) -> None:
+        """
+        Move the alert cursor forward after posting alerts.
+
+        Args:
+            seq: Sequence number of the last change that was alerted
+        """
+        self._ensure_connection()
+        try:
+            self.connection.execute("""
+                INSERT INTO metadata (key, value, updated_at)
+                VALUES ('alert_cursor', ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (key) DO UPDATE SET
+                    value = CAST(MAX(CAST(metadata.value AS INTEGER),
+                                     CAST(excluded.value AS INTEGER)) AS TEXT),
+                    updated_at = CURRENT_TIMESTAMP
+            """, (str(seq),))
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            print(f"Warning: Failed to advance alert cursor: {e}")
+
+    def cleanup_old_changes(self, days_to_keep: int = 30) -> int:
+        """
+        Remove alerted change log entries older than specified days.
+        Entries after the alert cursor are always kept.
+
+        Args:
+            days_to_keep: Number of days to keep change log entries
+
+        Returns:
+            Number of log entries removed
+        """
+        self._ensure_connection()
+        try:
+            cursor = self.connection.execute("""
+                DELETE FROM shift_changes
+                WHERE changed_at < datetime('now', ?)
+                  AND seq <= COALESCE((SELECT CAST(value AS INTEGER) FROM metadata
+                                       WHERE key = 'alert_cursor'), 0)
+            """, (f"-{int(days_to_keep)} days",))
+            deleted_count = cursor.rowcount
+            self.connection.commit()
+            return deleted_count
+        except Exception as e:
+            self.connection.rollback()
+            print(f"Warning: Failed to cleanup old shift changes: {e}")
+            return 0
+
+    def compare_schedules(self, new_data: List[Dict], server_side: bool = True) -> List[Dict]:
+        """
+        Compare new schedule data with current data to find scribe changes.
+        This is a read-only preview; alerts are driven by the shift_changes log.
+
+        Args:
+            new_data: List of new shift dictionaries
+            server_side: Accepted for interface parity with PostgresDatabase;
+                the diff is always computed in Python
+
+        Returns:
+            List of changes in format: {
+                'type': 'added'|'removed'|'modified',
+                'old': {...}|None,
+                'new': {...}|None
+            }
+        """
+        new_shifts = {}
+        for record in new_data:
+            if record.get('role') == 'Scribe':
+                record_copy = record.copy()
+                record_copy['person'] = self.name_mapper.standardize_name(record.get('person', ''), 'Scribe')
+                new_shifts[(record.get('date'), record.get('label'), record.get('time'))] = record_copy
+
+        self._ensure_connection()
+        rows = self.connection.execute("""
+            SELECT date, label, time, person, role, site
+            FROM shifts
+            WHERE role = 'Scribe'
+        """).fetchall()
+        old_shifts = {
+            (shift['date'], shift['label'], shift['time']): shift
+            for shift in self._rows_to_shifts(rows)
+        }
+
+        changes = []
+        for key, old_record in old_shifts.items():
+            if key not in new_shifts:
+                changes.append({'type': 'removed', 'old': old_record, 'new': None})
+
+        for key, new_record in new_shifts.items():
+            if key not in old_shifts:
+                changes.append({'type': 'added', 'old': None, 'new': new_record})
+            elif old_shifts[key]['person'] != new_record.get('person'):
+                changes.append({'type': 'modified', 'old': old_shifts[key], 'new': new_record})
+
+        return changes
+
+    def is_empty(self) -> bool:
+        """Check if database has any shifts"""
+        return self.get_record_count() == 0
+
+    def remove_duplicate_shifts(self) -> int:
+        """
+        Remove duplicate shift entries from the database.
+        Keeps the most recently updated record for each (date, label, time, role) combination.
+
+        The slot unique index prevents duplicates, so this only matters for
+        databases created before the index existed.
+
+        Returns:
+            Number of duplicate records removed
+        """
+        self._ensure_connection()
+        try:
+            cursor = self.connection.execute("""
+                DELETE FROM shifts
+                WHERE id IN (
+                    SELECT id
+                    FROM (
+                        SELECT id,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY date, label, time, role
+                                   ORDER BY updated_at DESC, id DESC
+                               ) AS row_num
+                        FROM shifts
+                    )
+                    WHERE row_num > 1
+                )
+            """)
+            deleted_count = cursor.rowcount
+            generation = None
+            if deleted_count:
+                generation = self._bump_refresh_generation(cursor)
+                self._refresh_shift_stats(cursor)
+            self.connection.commit()
+            if generation is not None:
+                self.shift_cache.set_generation(generation)
+            return deleted_count
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to remove duplicate shifts: {e}")
+
+    def get_duplicate_count(self) -> int:
+        """
+        Count the number of duplicate shift entries in the database.
+
+        Returns:
+            Number of duplicate records that would be removed
+        """
+        self._ensure_connection()
+        try:
+            return self.connection.execute("""
+                SELECT COALESCE(SUM(slot_count - 1), 0)
+                FROM (
+                    SELECT COUNT(*) AS slot_count
+                    FROM shifts
+                    GROUP BY date, label, time, role
+                )
+            """).fetchone()[0]
+        except Exception as e:
+            raise Exception(f"Failed to count duplicates: {e}")
+
+    def clear_all_shifts(self) -> int:
+        """
+        Clear all shift entries from the database.
+        Use this for a complete database reset before repopulating with fresh data.
+
+        Returns:
+            Number of records deleted
+        """
+        self._ensure_connection()
+        try:
+            cursor = self.connection.execute("DELETE FROM shifts")
+            count = cursor.rowcount
+            self._refresh_shift_stats(cursor)
+            generation = self._bump_refresh_generation(cursor)
+            self.connection.commit()
+            self.shift_cache.set_generation(generation)
+            return count
+        except Exception as e:
+            self.connection.rollback()
+            raise Exception(f"Failed to clear shifts: {e}")
+
+    def close(self):
+        """Close database connection"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def __del__(self):
+        """Cleanup on deletion"""
+        self.close()
@@ -0,0 +1,138 @@
+"""
+Worker pools that keep blocking storage, formatting and scraping calls off the event loop
+"""
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from .instrumentation import LatencyHistogram
+
+
+class WorkerPool:
+    """
+    Bounded thread pool for blocking calls made from coroutines.
+
+    At most max_workers calls run at once and at most max_pending are queued or
+    running; further callers wait on the event loop (without blocking it) until
+    a slot frees up. Queue depth, queue wait and run time are tracked so the
+    health check can show that the loop is never the one doing the waiting.
+    """
+
+    def __init__(self, name: str, max_workers: int = 1, max_pending: int = 64):
+        """
+        Args:
+            name: Pool name, used for worker thread names and stats
+            max_workers: Number of worker threads
+            max_pending: Maximum calls queued or running before callers wait
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = asyncio.Semaphore(max_pending)
+        self._lock = threading.Lock()
+
+        self.queued = 0  # submitted, not yet started
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_latency = LatencyHistogram()
+        self.run_latency = LatencyHistogram()
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the pool and await its result.
+        Exceptions raised by func propagate to the caller.
+        """
+        async with self._slots:
+            with self._lock:
+                self.queued += 1
+                self.max_queued = max(self.max_queued, self.queued)
+            call = functools.partial(self._run_timed, time.perf_counter(), func, args, kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def _run_timed(self, submitted: float, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """Worker thread side of run(): record queue wait and run time around the call"""
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_latency.record((started - submitted) * 1000)
+
+        failed = False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.run_latency.record((time.perf_counter() - started) * 1000)
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+
+    def get_stats(self) -> Dict:
+        """
+        Get queue depth and latency statistics.
+
+        Returns:
+            Dictionary with 'name', 'workers', 'queued', 'running', 'max_queued',
+            'completed', 'failed', and wait/run percentiles in milliseconds
+        """
+        with self._lock:
+            return {
+                'name': self.name,
+                'workers': self.max_workers,
+                'queued': self.queued,
+                'running': self.running,
+                'max_queued': self.max_queued,
+                'completed': self.completed,
+                'failed': self.failed,
+                'wait_p50': self.wait_latency.percentile(50),
+                'wait_p99': self.wait_latency.percentile(99),
+                'run_p50': self.run_latency.percentile(50),
+                'run_p99': self.run_latency.percentile(99),
+                'run_max': self.run_latency.max_ms
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running calls to finish"""
+        self._executor.shutdown(wait=True)
+
+
+class AsyncStorage:
+    """
+    Async facade over a storage backend.
+
+    Every method call is run on the worker pool and returns an awaitable, e.g.
+    ``await storage.format_daily_schedule_combined(date)``. Plain attributes are
+    passed through unchanged. With a single worker, all storage access happens
+    on one thread, so the backend's connection is never used concurrently.
+    """
+
+    def __init__(self, backend, pool: WorkerPool):
+        """
+        Args:
+            backend: Storage backend (PostgresDatabase or SQLiteDatabase)
+            pool: Worker pool the calls run on
+        """
+        self._backend = backend
+        self._pool = pool
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._backend, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self._pool.run(attr, *args, **kwargs)
+
+        return call
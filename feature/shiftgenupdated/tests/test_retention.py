@@ -0,0 +1,79 @@
+"""
+Archived months must not come back as new shifts on the next refresh
+"""
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from core.name_mapper import NameMapper
+from core.sqlite_db import SQLiteDatabase
+
+
+def make_shift(day: date, label: str = "A", person: str = "Jane Doe") -> dict:
+    return {
+        'date': day.strftime('%Y-%m-%d'),
+        'label': label,
+        'time': '0600-1400',
+        'person': person,
+        'role': 'Scribe',
+        'site': 'Main'
+    }
+
+
+class RetentionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        mapper = NameMapper(os.path.join(self.tmp.name, "name_legend.json"))
+        self.db = SQLiteDatabase(os.path.join(self.tmp.name, "shiftgen.db"), name_mapper=mapper)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def snapshot(self):
+        today = date.today()
+        return [
+            make_shift(today - timedelta(days=150)),
+            make_shift(today + timedelta(days=1))
+        ]
+
+    def test_refresh_after_archive_logs_no_changes(self):
+        # Seed the old month directly, as if it had been stored before retention applied
+        old_day = (date.today() - timedelta(days=150)).strftime('%Y-%m-%d')
+        self.db.connection.execute("""
+            INSERT INTO shifts (date, label, time, person, role, site)
+            VALUES (?, 'A', '0600-1400', 'Jane Doe', 'Scribe', 'Main')
+        """, (old_day,))
+        self.db.connection.commit()
+
+        self.db.update_data(self.snapshot())
+        _, last_seq = self.db.get_unalerted_changes(role=None)
+        self.db.advance_alert_cursor(last_seq)
+
+        self.assertEqual(self.db.archive_old_partitions(), 1)
+
+        self.db.update_data(self.snapshot())
+
+        changes, _ = self.db.get_unalerted_changes(role=None)
+        self.assertEqual(changes, [])
+        self.assertEqual(self.db.get_last_change_counts(), {})
+        self.assertEqual(self.db.get_shifts_for_date(old_day), [])
+
+    def test_refresh_keeps_unarchived_old_months(self):
+        old_day = (date.today() - timedelta(days=150)).strftime('%Y-%m-%d')
+        self.db.connection.execute("""
+            INSERT INTO shifts (date, label, time, person, role, site)
+            VALUES (?, 'A', '0600-1400', 'Jane Doe', 'Scribe', 'Main')
+        """, (old_day,))
+        self.db.connection.commit()
+
+        # The scraper no longer returns the old date; it stays until archived
+        self.db.update_data([make_shift(date.today() + timedelta(days=1))])
+
+        self.assertNotIn(old_day, self.db.get_last_change_counts())
+        self.assertEqual(len(self.db.get_shifts_for_date(old_day)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()